@@ -3,11 +3,25 @@ import pandas as pd
 import numpy as np
 import os
 import pydeck as pdk
-import shapely.wkt
-import shapely.geometry
 import ee
+import gdown
 import altair as alt
 from datetime import datetime, timedelta
+from functools import partial
+from urllib.parse import urlsplit
+from extraction_cache import DEFAULT_CACHE_DIR, ExtractionCache, file_fingerprint
+from hotspot_join import HotspotIndex, read_firms_csv
+from instrumentation import TRACER
+from map_layers import GeoJsonLayerCache, tier_for_zoom
+from risk_engine import SCORE_SOURCES, SOURCE_MODEL, classify_level, load_risk_model
+from risk_history import RiskHistory
+from satellite_engine import WindowResolver
+from satellite_snapshot import (DEFAULT_HOURS, SAMPLING_CENTROID, SAMPLING_MODES, SnapshotScheduler, SnapshotStore,
+                                build_snapshot, prepare_zonal)
+from scored_snapshot import build_scored_snapshot, score_snapshot, scored_version
+from table_view import SORT_KEYS, TableView
+from vector_tiles import TileServer, mvt_available, risk_attributes
+from village_layer import build_village_store, read_village_store
 
 # ==============================================================================
 # 1. KONFIGURASI SISTEM
@@ -47,9 +61,65 @@ st.markdown("""
 # ==============================================================================
 # 2. LOAD DATA LOKAL
 # ==============================================================================
+def _setting(name, default=None):
+    """Konfigurasi deployment: environment dulu, lalu st.secrets (tanpa secrets.toml -> default)"""
+    value = os.environ.get(name)
+    if value:
+        return value
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+
 # GANTI PATH SESUAI LOKASI ANDA
 DATA_URL = "https://drive.google.com/uc?id=1jmBB6Dv36aRnbDkj-cuZ154M0E3tzhOQ"
 LOCAL_FILE = "desa1_riau.csv"
+# Store biner hasil build_village_store.py (GeoParquet: WKB + centroid + bbox)
+VILLAGE_STORE = "desa1_riau.parquet"
+# Mode MVT (opsional): MBTiles hasil build_vector_tiles.py & endpoint tile lokal
+VECTOR_TILES = "desa1_riau.mbtiles"
+VECTOR_TILES_MINZOOM = 6
+VECTOR_TILES_MAXZOOM = 12
+TILE_SERVER_PORT = 8765
+# Alamat bind server tile & URL dasar tile yang dijangkau browser (reverse proxy, lihat vector_tiles.py).
+# Tanpa RFCC_TILE_URL tile diambil dari http://127.0.0.1:8765 -> hanya untuk browser di mesin yang sama
+TILE_SERVER_HOST = _setting("RFCC_TILE_HOST", "127.0.0.1")
+TILE_PUBLIC_URL = _setting("RFCC_TILE_URL")
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Batas waktu (detik) resolusi jendela per dataset satelit
+SATELLITE_TIMEOUT = 60
+# Ekstraksi reduceRegions: jumlah desa per request & request paralel
+EXTRACT_CHUNK_SIZE = 500
+EXTRACT_WORKERS = 4
+# Mode zonal: poligon per request & batas vertex per request (di bawah batas payload GEE)
+ZONAL_CHUNK_SIZE = 100
+ZONAL_MAX_VERTICES = 50_000
+SAMPLING_LABELS = {
+    SAMPLING_CENTROID: "Titik centroid (cepat)",
+    'zonal_mean': "Zonal poligon - rata-rata",
+    'zonal_max': "Zonal poligon - maksimum",
+    'zonal_p90': "Zonal poligon - persentil 90",
+}
+# Jam (waktu server) penjadwal latar belakang mengecek akuisisi baru MOD11A1/CHIRPS
+SCHEDULE_HOURS = DEFAULT_HOURS
+# Snapshot terakhir per layer desa & mode; direktori sendiri agar tidak ikut dievict/clear ExtractionCache
+SNAPSHOT_DIR = os.path.join(DEFAULT_CACHE_DIR, "snapshots")
+# Riwayat harian LST/NDVI/Rain/skor per desa (risk_history.py)
+RISK_HISTORY = os.path.join("data", "riwayat_risiko")
+# Titik api FIRMS (opsional): CSV MODIS/VIIRS dari firms.modaps.eosdis.nasa.gov, disimpan manual
+HOTSPOT_CSV = os.path.join("data", "hotspot_firms.csv")
+# Instrumentasi waktu per tahap (instrumentation.py): aktif sejak start jika RFCC_TRACE=1,
+# keluaran spans.jsonl & rfcc.prom (textfile collector Prometheus) di TRACE_DIR
+TRACE_DIR = os.path.join("data", "telemetri")
+TRACE_PANEL_RERUNS = 10
+
+# Model KNN terlatih (models/MODEL.py) & batas waktu inferensi per rerun (detik)
+RISK_MODEL = os.path.join("models", "initial_model.pkl")
+# Indeks tetangga hasil build_knn_index.py (.npz), dipakai jika ada
+RISK_MODEL_INDEX = os.path.join("models", "initial_model.npz")
+INFERENCE_BUDGET = 1.0
 
 
 
@@ -79,44 +149,94 @@ def init_ee():
         return False
 
 
+@st.cache_resource
+def get_tracer():
+    """Tracer proses dikonfigurasi sekali; nonaktif kecuali RFCC_TRACE=1 atau dinyalakan dari sidebar"""
+    return TRACER.configure(enabled=os.environ.get("RFCC_TRACE") == "1", directory=TRACE_DIR)
+
+
+def _toggle_tracer():
+    get_tracer().enabled = st.session_state.trace_enabled
+
+
+@st.cache_resource
+def get_window_resolver():
+    """Resolver jendela data dibagi antar sesi (cache per dataset, TTL 1 jam)"""
+    return WindowResolver(ee, ttl_seconds=3600)
+
+
+@st.cache_resource
+def get_extraction_cache():
+    """Cache Parquet hasil ekstraksi, dibagi ke semua sesi (TTL 6 jam, maks. 256 MB)"""
+    return ExtractionCache(ttl_seconds=6 * 3600, max_bytes=256 * 2**20)
+
+
+@st.cache_resource
+def get_layer_cache(_df_base, store_hash):
+    """Geometri GeoJSON desa diserialisasi sekali per versi store geometri"""
+    return GeoJsonLayerCache(_df_base['geometry'].to_numpy(), _df_base.index)
+
+
+@st.cache_resource(show_spinner="🧠 Memuat model KNN...")
+def get_risk_model():
+    """Model KNN dimuat sekali per proses dan dibagi ke semua sesi (indeks .npz didahulukan)"""
+    path = RISK_MODEL_INDEX if os.path.exists(RISK_MODEL_INDEX) else RISK_MODEL
+    if not os.path.exists(path):
+        return None
+    try:
+        return load_risk_model(path)
+    except Exception as e:
+        st.sidebar.warning(f"Model KNN tidak bisa dimuat: {e}")
+        return None
+
+
+@st.cache_resource
+def get_hotspot_index(_df_base, store_hash):
+    """STRtree poligon desa untuk join titik api, dibangun sekali per versi store geometri"""
+    return HotspotIndex(_df_base['geometry'].to_numpy(), _df_base.index)
+
+
+@st.cache_resource(max_entries=4, show_spinner="🔥 Menghitung titik api per desa...")
+def get_hotspot_counts(_index, hotspot_hash, store_hash):
+    """Jumlah titik api FIRMS per desa, sekali per versi CSV & layer desa (dibagi antar sesi)"""
+    points = read_firms_csv(HOTSPOT_CSV)
+    return _index.count(points['lon'], points['lat'])
+
+
+@st.cache_resource
+def get_tile_server(mbtiles_path, host, port, public_url):
+    """Endpoint tile lokal (thread daemon), satu per proses & port; OSError jika port sudah dipakai"""
+    return TileServer(mbtiles_path, host=host, port=port, public_url=public_url).start()
+
+
+def tiles_reachable():
+    """Browser sesi ini bisa memuat tile: RFCC_TILE_URL diisi, atau dashboard dibuka dari mesin yang sama"""
+    if TILE_PUBLIC_URL:
+        return True
+    context = getattr(st, "context", None)   # st.context tersedia sejak Streamlit 1.37
+    host = context.headers.get("Host") if context is not None else None
+    if not host:
+        return True
+    return urlsplit(f"//{host}").hostname in LOCAL_HOSTS
+
+
 @st.cache_data
 def load_data():
-    """Load dan preprocessing data desa dari Google Drive"""
+    """Load layer desa dari store biner; CSV Google Drive hanya dipakai untuk build pertama"""
     
-    # Download jika belum ada
-    if not os.path.exists(LOCAL_FILE):
+    # Download jika store maupun CSV belum ada
+    if not os.path.exists(VILLAGE_STORE) and not os.path.exists(LOCAL_FILE):
         with st.spinner("⬇️ Mengunduh layer desa dari Google Drive..."):
             gdown.download(DATA_URL, LOCAL_FILE, quiet=False, fuzzy=True)
 
     try:
-        # Load CSV
-        df = pd.read_csv(LOCAL_FILE)
-        df.columns = [c.strip().upper() for c in df.columns]
-
-        # Standarisasi nama kolom
-        col_map = {
-            'WADMKD': 'nama_desa',
-            'NAMOBJ': 'nama_desa',
-            'DESA': 'nama_desa',
-            'WADMKK': 'kabupaten',
-            'KABUPATEN': 'kabupaten'
-        }
-        df = df.rename(columns=col_map)
-        df = df.loc[:, ~df.columns.duplicated()]
-
-        # Pastikan kolom nama_desa ada
-        if 'nama_desa' not in df.columns:
-            df['nama_desa'] = "Desa Tanpa Nama"
-
-        # Konversi WKT ke geometry
-        df['geometry'] = df['WKT'].apply(
-            lambda x: shapely.wkt.loads(str(x)) if pd.notnull(x) else None
-        )
-        df = df.dropna(subset=['geometry']).reset_index(drop=True)
+        # Build sekali: parsing WKT -> GeoParquet (setara `python build_village_store.py`)
+        if not os.path.exists(VILLAGE_STORE):
+            with st.spinner("🛠️ Membangun store geometri desa (sekali saja)..."):
+                build_village_store(LOCAL_FILE, VILLAGE_STORE)
 
-        # Hitung centroid untuk setiap desa
-        df['lat'] = df['geometry'].apply(lambda g: g.centroid.y)
-        df['lon'] = df['geometry'].apply(lambda g: g.centroid.x)
+        # Load store biner: geometri WKB, centroid & bbox sudah dihitung
+        df = read_village_store(VILLAGE_STORE)
 
         return df
 
@@ -128,219 +248,111 @@ def load_data():
 # ==============================================================================
 # 3. ENGINE SATELIT - DATA REAL DENGAN AUTO MUNDUR SAMPAI KETEMU
 # ==============================================================================
-def get_satellite_data_robust(df):
+# Ekstraksi (resolusi jendela -> cache per dataset -> konversi satuan) ada di
+# satellite_snapshot.py. Penjadwal latar belakang menyiapkan snapshot sebelum
+# sesi dibuka; sesi hanya membaca snapshot terbaru dan menampilkan umurnya.
+def _status_writer(status):
+    """Adaptor callback status(level, pesan) -> placeholder Streamlit"""
+    return lambda level, message: getattr(status, level)(message)
+
+
+@st.cache_resource
+def get_risk_history():
+    """Store riwayat harian per desa (Parquet per tanggal), dibagi ke semua sesi"""
+    return RiskHistory(RISK_HISTORY)
+
+
+def record_history(history, df_base, risk_model, snapshot):
+    """Tulis snapshot baru ke riwayat (satu partisi per tanggal snapshot, refresh terakhir di hari itu menang)"""
+    df_sat, _ = score_snapshot(df_base, snapshot, risk_model)
+    history.append(snapshot.created_at.date(), df_sat)
+
+
+@st.cache_resource(show_spinner="📐 Menyederhanakan poligon desa untuk mode zonal...")
+def get_zonal_geometry(_df_base, store_hash):
+    """Poligon desa disederhanakan sekali per versi store geometri"""
+    return prepare_zonal(_df_base['geometry'].to_numpy())
+
+
+def _snapshot_scheduler(df_base, store_hash, mode, on_publish=None):
+    """Penjadwal snapshot satu mode sampling; snapshot terakhir dimuat dari disk"""
+    zonal = get_zonal_geometry(df_base, store_hash) if mode != SAMPLING_CENTROID else None
+    build = partial(
+        build_snapshot, ee, get_window_resolver(), get_extraction_cache(),
+        df_base[['lon', 'lat']], store_hash,
+        timeout=SATELLITE_TIMEOUT, chunk_size=EXTRACT_CHUNK_SIZE, max_workers=EXTRACT_WORKERS,
+        mode=mode, zonal=zonal, zonal_chunk_size=ZONAL_CHUNK_SIZE, max_vertices=ZONAL_MAX_VERTICES
+    )
+    suffix = "" if mode == SAMPLING_CENTROID else f"_{mode}"
+    store = SnapshotStore(os.path.join(SNAPSHOT_DIR, f"snapshot_{store_hash[:16]}{suffix}.parquet"))
+    return SnapshotScheduler(build, store=store, hours=SCHEDULE_HOURS, on_publish=on_publish)
+
+
+@st.cache_resource
+def get_scheduler(_df_base, store_hash, _risk_model):
+    """Satu penjadwal latar belakang per proses & versi layer desa, hanya untuk mode centroid (default)"""
+    # Riwayat hanya dari mode default agar deret waktu tidak bercampur antar mode sampling
+    on_publish = partial(record_history, get_risk_history(), _df_base, _risk_model)
+    return _snapshot_scheduler(_df_base, store_hash, SAMPLING_CENTROID, on_publish).start()
+
+
+@st.cache_resource
+def get_on_demand_scheduler(_df_base, store_hash, mode):
+    """Mode zonal tanpa thread: diekstrak hanya saat ada sesi yang memakainya dan jadwal sudah lewat"""
+    return _snapshot_scheduler(_df_base, store_hash, mode)
+
+
+def get_satellite_snapshot(scheduler, refresh):
+    """Snapshot terbaru; hanya menunggu ekstraksi jika belum ada snapshot, refresh manual atau jadwal on-demand lewat"""
+    snapshot = scheduler.latest()
+    if snapshot is not None and not refresh and not scheduler.due():
+        return snapshot
+
     status = st.empty()
     status.info("📡 MENGHUBUNGI SATELIT... MENARIK DATA METEROLOGI TERBARU...")
-    
     try:
-        # Buat Feature Collection dari titik centroid desa
-        features = []
-        for i, row in df.iterrows():
-            f = ee.Feature(ee.Geometry.Point([row['lon'], row['lat']]), {'idx': i})
-            features.append(f)
-        fc = ee.FeatureCollection(features)
-
-        now = datetime.now()
-        
-        # ========== 1. SUHU (LST) - MODIS Terra MOD11A1 ==========
-        # Update: Harian, tapi kadang ada gap karena awan
-        # Strategi: Ambil data 8 hari terakhir (composite)
-        lst_data = None
-        lst_date = None
-        
-        for days_back in range(0, 30):  # Coba mundur sampai 30 hari
-            try:
-                search_date = now - timedelta(days=days_back)
-                start = search_date - timedelta(days=8)  # Window 8 hari
-                end = search_date
-                
-                lst_collection = ee.ImageCollection('MODIS/061/MOD11A1') \
-                    .filterDate(start, end) \
-                    .select('LST_Day_1km')
-                
-                # Cek apakah ada data
-                count = lst_collection.size().getInfo()
-                if count > 0:
-                    lst_data = lst_collection.mean().rename('LST_RAW')
-                    lst_date = search_date.strftime("%d-%B-%Y")
-                    status.info(f"✅ SUHU (LST): Data ditemukan dari {start.strftime('%d-%b-%Y')} s/d {end.strftime('%d-%b-%Y')}")
-                    break
-            except:
-                continue
-        
-        if lst_data is None:
-            raise Exception("LST data tidak ditemukan dalam 30 hari terakhir")
-
-        # ========== 2. VEGETASI (NDVI) - MODIS MOD13Q1 ==========
-        # Update: 16 hari sekali
-        # Strategi: Ambil data terbaru dalam 32 hari terakhir
-        ndvi_data = None
-        ndvi_date = None
-        
-        for days_back in range(0, 60):  # Coba mundur sampai 60 hari
-            try:
-                search_date = now - timedelta(days=days_back)
-                start = search_date - timedelta(days=16)
-                end = search_date
-                
-                ndvi_collection = ee.ImageCollection('MODIS/061/MOD13Q1') \
-                    .filterDate(start, end) \
-                    .select('NDVI')
-                
-                count = ndvi_collection.size().getInfo()
-                if count > 0:
-                    ndvi_data = ndvi_collection.mean().rename('NDVI_RAW')
-                    ndvi_date = search_date.strftime("%d-%B-%Y")
-                    status.info(f"✅ VEGETASI (NDVI): Data ditemukan dari {start.strftime('%d-%b-%Y')} s/d {end.strftime('%d-%b-%Y')}")
-                    break
-            except:
-                continue
-        
-        if ndvi_data is None:
-            raise Exception("NDVI data tidak ditemukan dalam 60 hari terakhir")
-
-        # ========== 3. HUJAN (CHIRPS) - Daily Precipitation ==========
-        # Update: Harian (biasanya delay 2-3 hari)
-        # Strategi: Ambil total 30 hari dari data terbaru yang ada
-        rain_data = None
-        rain_date = None
-        
-        for days_back in range(0, 15):  # CHIRPS biasanya delay 2-7 hari
-            try:
-                search_end = now - timedelta(days=days_back)
-                search_start = search_end - timedelta(days=30)  # Total 30 hari
-                
-                rain_collection = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
-                    .filterDate(search_start, search_end) \
-                    .select('precipitation')
-                
-                count = rain_collection.size().getInfo()
-                if count > 0:
-                    rain_data = rain_collection.sum().rename('Rain_RAW')
-                    rain_date = f"{search_start.strftime('%d-%b-%Y')} s/d {search_end.strftime('%d-%b-%Y')}"
-                    status.info(f"✅ HUJAN (CHIRPS): Data 30 hari dari {rain_date}")
-                    break
-            except:
-                continue
-        
-        if rain_data is None:
-            raise Exception("CHIRPS data tidak ditemukan dalam 15 hari terakhir")
-
-        # ========== GABUNGKAN SEMUA DATA ==========
-        combined = lst_data.addBands(ndvi_data).addBands(rain_data).unmask(-9999)
-        
-        # Ekstrak data per desa
-        data = combined.reduceRegions(
-            collection=fc, 
-            reducer=ee.Reducer.first(), 
-            scale=1000, 
-            tileScale=4
-        ).getInfo()
-
-        results = []
-        for f in data['features']:
-            p = f['properties']
-            
-            # Konversi Unit LST: Kelvin -> Celcius
-            l_val = p.get('LST_RAW')
-            if l_val and l_val > 0 and l_val != -9999:
-                lst_c = (l_val * 0.02) - 273.15
-            else:
-                lst_c = None  # Data tidak valid
-            
-            # Konversi Unit NDVI: Scale 0.0001
-            n_val = p.get('NDVI_RAW')
-            if n_val and n_val != -9999:
-                ndvi_idx = n_val * 0.0001
-                # Clip ke range valid NDVI (-1 sampai 1)
-                ndvi_idx = max(-1, min(1, ndvi_idx))
-            else:
-                ndvi_idx = None
-            
-            # Hujan: mm (sudah dalam satuan yang benar)
-            r_val = p.get('Rain_RAW')
-            if r_val is not None and r_val != -9999:
-                rain_mm = float(r_val)
-            else:
-                rain_mm = None
-
-            results.append({
-                'idx': p.get('idx'),
-                'LST': lst_c,
-                'NDVI': ndvi_idx,
-                'Rain': rain_mm,
-                'LST_Date': lst_date,
-                'NDVI_Date': ndvi_date,
-                'Rain_Date': rain_date
-            })
-        
-        status.success("✅ SEMUA DATA SATELIT REAL BERHASIL DITARIK!")
-        
-        df_sat = pd.DataFrame(results)
-        df_final = df.merge(df_sat, left_index=True, right_on='idx').drop(columns=['idx'])
-        
-        # Isi nilai None dengan median (untuk desa yang mungkin tertutup awan)
-        if df_final['LST'].isna().any():
-            df_final['LST'].fillna(df_final['LST'].median(), inplace=True)
-        if df_final['NDVI'].isna().any():
-            df_final['NDVI'].fillna(df_final['NDVI'].median(), inplace=True)
-        if df_final['Rain'].isna().any():
-            df_final['Rain'].fillna(df_final['Rain'].median(), inplace=True)
-        
-        return df_final
-
+        # SUHU (LST)      : MOD11A1 harian (gap awan)  -> komposit 8 hari, mundur maks. 30 hari
+        # VEGETASI (NDVI) : MOD13Q1 16 hari sekali     -> komposit 16 hari, mundur maks. 60 hari
+        # HUJAN (CHIRPS)  : harian, delay 2-7 hari     -> total 30 hari, mundur maks. 15 hari
+        return scheduler.run_once(status=_status_writer(status))
     except Exception as e:
         status.error(f"❌ GAGAL MENARIK DATA SATELIT: {e}")
+        if snapshot is not None:
+            st.warning("⚠️ Memakai snapshot data satelit terakhir.")
+            return snapshot
         st.error("Sistem tidak dapat terhubung ke Google Earth Engine. Pastikan koneksi internet stabil dan token GEE valid.")
         st.stop()
 
+
+@st.cache_resource(max_entries=2, show_spinner="🧮 Menghitung skor risiko snapshot baru...")
+def get_satellite_scores(_df_base, _snapshot, _risk_model, snapshot_version):
+    """Join snapshot + inferensi model KNN sekali per versi snapshot (dibagi antar sesi)"""
+    return score_snapshot(_df_base, _snapshot, _risk_model)
+
+
+@st.cache_resource(max_entries=6)
+def get_scored_snapshot(_df_base, _snapshot, _risk_model, _hotspots, snapshot_version, score_source, hotspot_version):
+    """Frame terskor read-only per (snapshot, sumber skor, CSV titik api); sesi hanya mereferensikan versinya"""
+    df_sat, inference = get_satellite_scores(_df_base, _snapshot, _risk_model, snapshot_version)
+    return build_scored_snapshot(df_sat, inference, score_source, _hotspots,
+                                 scored_version(snapshot_version, score_source, hotspot_version))
+
+
+def format_age(age):
+    minutes = int(age.total_seconds() // 60)
+    if minutes < 60:
+        return f"{minutes} menit"
+    if minutes < 24 * 60:
+        return f"{minutes // 60} jam {minutes % 60} menit"
+    return f"{minutes // (24 * 60)} hari {minutes // 60 % 24} jam"
+
+
 # ==============================================================================
 # 4. LOGIKA RISIKO FISIKA
 # ==============================================================================
-def calculate_risk(df):
-    if df is None: return None
-    
-    # 1. Normalisasi Suhu (Makin panas = makin bahaya)
-    # Range 25C - 40C
-    norm_lst = (df['LST'] - 25) / (40 - 25)
-    norm_lst = norm_lst.clip(0, 1)
-    
-    # 2. Normalisasi Hujan (Makin banyak hujan = makin aman)
-    # Hujan 30 hari: 0mm - 300mm
-    norm_rain = 1 - (df['Rain'] / 300) 
-    norm_rain = norm_rain.clip(0, 1)
-
-    # 3. Normalisasi Vegetasi (Makin rendah/kering = makin bahaya)
-    # NDVI range -1 sampai 1, tapi untuk vegetasi biasa 0.2 - 0.8
-    norm_dry = 1 - df['NDVI']
-    norm_dry = norm_dry.clip(0, 1)
-
-    # RUMUS: Risk = 40% Hujan + 40% Suhu + 20% Kekeringan
-    risk_score = (0.4 * norm_rain) + (0.4 * norm_lst) + (0.2 * norm_dry)
-    
-    df['prob_pct'] = (risk_score * 100).round(1)
-
-    def get_level(p):
-        if p > 60: return "TINGGI", [255, 0, 0] # Merah
-        elif p > 50: return "SEDANG", [255, 165, 0] # Oranye
-        return "RENDAH", [0, 128, 0] # Hijau
+# calculate_risk ada di risk_engine.py: skor & klasifikasi vektor NumPy,
+# level/status_kekeringan sebagai Categorical, warna dari tabel uint8 per level
 
-    res = df['prob_pct'].apply(get_level)
-    df['level'] = [x[0] for x in res]
-    df['color'] = [x[1] for x in res]
-    
-    # --- PERUBAHAN: KLASIFIKASI KEKERINGAN PAKAI HUJAN (BUKAN NDVI) ---
-    def get_dry_status(rain):
-        # Klasifikasi BMKG/Standar Umum (Bulanan)
-        if pd.isna(rain): return "DATA TIDAK ADA"
-        if rain < 10: return "SANGAT KERING"      # < 10mm (Ekstrem)
-        elif rain < 50: return "KERING"           # 10-50mm (Waspada)
-        elif rain < 100: return "NORMAL"          # 50-100mm (Normal)
-        return "BASAH"                            # > 100mm (Aman)
-    
-    df['status_kekeringan'] = df['Rain'].apply(get_dry_status)
-    
-    return df
 
 # ==============================================================================
 # 5. DASHBOARD UTAMA
@@ -359,8 +371,54 @@ def main():
             st.stop()
             
         if st.button("🔄 TARIK DATA BARU"):
-            st.cache_data.clear()
-            st.rerun()
+            # Layer desa & cache geometri tetap hidup; hanya jendela data yang dicek ulang
+            get_window_resolver().clear()
+            st.session_state.refresh_requested = True
+
+        # Mode peta vector tile (butuh desa1_riau.mbtiles dari build_vector_tiles.py)
+        use_mvt = st.checkbox(
+            "🧩 Mode Vector Tile (MVT)",
+            value=False,
+            disabled=not (os.path.exists(VECTOR_TILES) and mvt_available() and tiles_reachable()),
+            help="Untuk layer multi-provinsi: peta memuat tile yang terlihat saja. "
+                 "Bangun dulu dengan `python build_vector_tiles.py`. Jika dashboard dibuka dari mesin lain, "
+                 "sajikan tile lewat reverse proxy dan isi `RFCC_TILE_URL` (lihat vector_tiles.py)."
+        )
+
+        # Sumber skor risiko: rumus berbobot atau model KNN terlatih
+        risk_model = get_risk_model()
+        score_source = st.radio(
+            "🧮 Sumber Skor Risiko",
+            SCORE_SOURCES,
+            disabled=risk_model is None,
+            help="Model KNN memakai fitur X1/X2/X3 dari LST, NDVI & Rain (models/initial_model.pkl)."
+        )
+
+        # Sampling satelit: titik centroid atau statistik zonal poligon (lebih akurat, lebih mahal)
+        sampling_mode = st.selectbox(
+            "📐 Mode Sampling Satelit",
+            SAMPLING_MODES,
+            format_func=SAMPLING_LABELS.get,
+            help="Zonal mereduksi seluruh piksel di dalam poligon desa (disederhanakan), "
+                 "sehingga hotspot di desa luas tidak terlewat. Biaya request ditampilkan di bawah tanggal data."
+        )
+
+        # Panel waktu eksekusi: rincian rerun terakhir (berlaku untuk seluruh proses dashboard)
+        tracer = get_tracer()
+        st.checkbox(
+            "⏱️ Instrumentasi Waktu Eksekusi",
+            value=tracer.enabled,
+            key="trace_enabled",
+            on_change=_toggle_tracer,
+            help=f"Mengukur load data, panggilan GEE, skor risiko, GeoJSON & render peta. "
+                 f"Log JSON lines & metrik Prometheus ditulis ke `{TRACE_DIR}`."
+        )
+        if tracer.enabled:
+            rows = tracer.breakdown(TRACE_PANEL_RERUNS)
+            if rows:
+                st.dataframe(pd.DataFrame(rows).set_index('rerun'), use_container_width=True)
+            else:
+                st.caption("⏱️ Belum ada rerun yang terukur.")
             
         st.markdown("---")
         st.markdown("### ℹ️ Info Sumber Data")
@@ -391,14 +449,46 @@ def main():
     st.markdown("Sistem Pemantauan Kebakaran Hutan & Lahan Terintegrasi Berbasis Satelit Real-time.")
     
     # LOAD DATA
-    df_base = load_data()
+    with TRACER.span("load_data"):
+        df_base = load_data()
     if df_base is None: st.stop()
     
-    if 'data_monitor' not in st.session_state:
-        df_sat = get_satellite_data_robust(df_base)
-        st.session_state.data_monitor = calculate_risk(df_sat)
-            
-    df = st.session_state.data_monitor
+    refresh = st.session_state.pop('refresh_requested', False)
+    store_hash = file_fingerprint(VILLAGE_STORE)
+    if sampling_mode == SAMPLING_CENTROID:
+        scheduler = get_scheduler(df_base, store_hash, risk_model)
+    else:
+        scheduler = get_on_demand_scheduler(df_base, store_hash, sampling_mode)
+    with TRACER.span("satellite_snapshot"):
+        snapshot = get_satellite_snapshot(scheduler, refresh)
+
+    # Sesi hanya mencatat versi snapshot terakhir yang dilihat (untuk notifikasi refresh)
+    if st.session_state.get('data_version') != snapshot.version:
+        st.session_state.data_version = snapshot.version
+        if refresh and snapshot.plan is not None:
+            st.toast(f"🔄 Refresh: {snapshot.plan.describe()}")
+    elif refresh:
+        st.toast("🔄 Refresh: semua dataset belum berubah")
+
+    # TITIK API FIRMS: join STRtree sekali per versi CSV, hasilnya kolom di samping prob_pct
+    hotspots = None
+    hotspot_version = "0"
+    if os.path.exists(HOTSPOT_CSV):
+        hotspot_version = file_fingerprint(HOTSPOT_CSV)
+        try:
+            with TRACER.span("hotspot_counts"):
+                hotspots = get_hotspot_counts(get_hotspot_index(df_base, store_hash), hotspot_version, store_hash)
+        except Exception as e:
+            st.warning(f"⚠️ CSV titik api FIRMS tidak bisa dibaca: {e}")
+            hotspot_version = "0"
+
+    # Frame terskor dibagi semua sesi: layer peta, tile, skor & urutan tabel tidak dibangun ulang per sesi
+    with TRACER.span("scored_snapshot"):
+        shared = get_scored_snapshot(df_base, snapshot, risk_model, hotspots,
+                                     snapshot.version, score_source, hotspot_version)
+    df = shared.frame
+    data_version = shared.version
+    sort_index = shared.sort_index
     
     # TANGGAL DATA - Tampilkan per Variabel
     st.markdown(f"""
@@ -409,6 +499,15 @@ def main():
     
     📍 **Total Wilayah Dipantau:** {len(df)} Desa
     """)
+    next_run = f" · cek berikutnya {scheduler.next_run.strftime('%d-%b %H:%M')}" if scheduler.next_run else ""
+    st.caption(f"🕒 Snapshot satelit dibuat {snapshot.created_at.strftime('%d-%b-%Y %H:%M')} "
+               f"({format_age(snapshot.age(datetime.now()))} lalu){next_run}")
+    if snapshot.cost and snapshot.cost['requests']:
+        vertices = f", {snapshot.cost['vertices']:,} vertex" if snapshot.cost['vertices'] else ""
+        st.caption(f"💸 Biaya ekstraksi ({SAMPLING_LABELS[snapshot.mode]}): {snapshot.cost['requests']} request, "
+                   f"{snapshot.cost['retries']} retry{vertices}, {snapshot.cost['seconds']:.1f} dtk")
+    if scheduler.last_error is not None:
+        st.caption(f"⚠️ Penjadwal gagal memperbarui snapshot: {scheduler.last_error}")
 
     # --- BAGIAN 1: PETA & INTERAKSI ---
     col_map, col_stat = st.columns([2, 1])
@@ -416,59 +515,76 @@ def main():
     # Logika Highlight (Interaksi Tabel ke Peta)
     view_state = pdk.ViewState(latitude=0.5, longitude=101.5, zoom=7.5, pitch=0)
     selected_desa_name = None
+    selected_label = None
 
+    table_view = st.session_state.get('table_view')
     if 'selection' in st.session_state and st.session_state.selection.get("selection", {}).get("rows"):
-        # Kita perlu tahu baris mana yang diklik berdasarkan hasil sort terakhir
-        if 'df_sorted_display' in st.session_state:
-            idx = st.session_state.selection['selection']['rows'][0]
-            if idx < len(st.session_state.df_sorted_display):
-                sel_row = st.session_state.df_sorted_display.iloc[idx]
+        # Baris yang diklik -> ID desa lewat permutasi urutan tabel saat diklik (versi data harus sama)
+        if table_view is not None and table_view.version == data_version:
+            row = st.session_state.selection['selection']['rows'][0]
+            village_id = sort_index.village_at(table_view.column, table_view.ascending, row)
+            if village_id is not None:
+                sel_row = df.loc[village_id]
                 selected_desa_name = sel_row['nama_desa']
+                selected_label = village_id
                 view_state = pdk.ViewState(latitude=sel_row['lat'], longitude=sel_row['lon'], zoom=11.5, pitch=0)
                 st.toast(f"📍 Menyorot Desa: {selected_desa_name}")
 
-    # PREPARE GEOJSON
-    geojson_base = {
-        "type": "FeatureCollection",
-        "features": []
-    }
-    geojson_highlight = {
-        "type": "FeatureCollection",
-        "features": []
-    }
-
-    for _, row in df.iterrows():
-        props = {
-            "nama": row['nama_desa'],
-            "kab": row['kabupaten'],
-            "level": row['level'],
-            "prob": row['prob_pct'],
-            "color": row['color'],
-            "kering": row['status_kekeringan']
-        }
-        geom = shapely.geometry.mapping(row['geometry'])
-        
-        feature = {"type": "Feature", "geometry": geom, "properties": props}
-        geojson_base["features"].append(feature)
-        
-        if selected_desa_name and row['nama_desa'] == selected_desa_name:
-            geojson_highlight["features"].append(feature)
+    # PREPARE GEOJSON - geometri diserialisasi sekali (cache), properti per versi data
+    layer_cache = get_layer_cache(df_base, file_fingerprint(VILLAGE_STORE))
+    geojson_highlight = {"type": "FeatureCollection", "features": []}
+    if selected_label is not None:
+        geojson_highlight = layer_cache.highlight(df, selected_label)
 
     # LAYERS - GARIS BATAS TEBAL DAN TEGAS
     layers = []
-    layers.append(pdk.Layer(
-        "GeoJsonLayer",
-        data=geojson_base,
-        pickable=True,
-        stroked=True,
-        filled=True,
-        get_fill_color="properties.color",
-        get_line_color=[0, 0, 0],
-        get_line_width=100,
-        line_width_min_pixels=3,
-        opacity=0.6,
-        auto_highlight=True
-    ))
+    if use_mvt:
+        try:
+            tile_server = get_tile_server(VECTOR_TILES, TILE_SERVER_HOST, TILE_SERVER_PORT, TILE_PUBLIC_URL)
+        except OSError as e:
+            st.warning(f"⚠️ Server tile lokal tidak bisa dijalankan di port {TILE_SERVER_PORT} ({e}); "
+                       f"memakai layer GeoJSON.")
+            use_mvt = False
+    if use_mvt:
+        # Mode MVT: browser hanya mengunduh tile yang terlihat, atribut risiko digabung per ID desa.
+        # MBTiles dibangun ulang saat app berjalan -> server yang sama membuka ulang file-nya
+        tiles_hash = file_fingerprint(VECTOR_TILES)
+        tile_server.reload(tiles_hash)
+        if tile_server.version != data_version:
+            with TRACER.span("mvt_publish"):
+                tile_server.publish(data_version, risk_attributes(df))
+        layers.append(pdk.Layer(
+            "MVTLayer",
+            data=f"{tile_server.url_template}?v={data_version}-{tiles_hash[:8]}",
+            min_zoom=VECTOR_TILES_MINZOOM,
+            max_zoom=VECTOR_TILES_MAXZOOM,
+            pickable=True,
+            stroked=True,
+            filled=True,
+            get_fill_color="[properties.r, properties.g, properties.b]",
+            get_line_color=[0, 0, 0],
+            get_line_width=100,
+            line_width_min_pixels=3,
+            opacity=0.6,
+            auto_highlight=True
+        ))
+    else:
+        # Tier LOD dipilih dari zoom: ringan untuk overview provinsi, penuh saat menyorot desa
+        with TRACER.span("geojson", tier=tier_for_zoom(view_state.zoom)):
+            geojson_base = layer_cache.collection(df, data_version, tier_for_zoom(view_state.zoom))
+        layers.append(pdk.Layer(
+            "GeoJsonLayer",
+            data=geojson_base,
+            pickable=True,
+            stroked=True,
+            filled=True,
+            get_fill_color="properties.color",
+            get_line_color=[0, 0, 0],
+            get_line_width=100,
+            line_width_min_pixels=3,
+            opacity=0.6,
+            auto_highlight=True
+        ))
     
     if len(geojson_highlight["features"]) > 0:
         layers.append(pdk.Layer(
@@ -481,7 +597,8 @@ def main():
             line_width_min_pixels=5,
         ))
 
-    with col_map:
+    # Serialisasi Deck ke JSON & pengiriman ke frontend (render WebGL di browser tidak terukur di sini)
+    with col_map, TRACER.span("pydeck_chart"):
         st.pydeck_chart(pdk.Deck(
             layers=layers,
             initial_view_state=view_state,
@@ -494,7 +611,8 @@ def main():
         st.subheader("📊 Analisis Risiko")
         
         # Pie Chart Proporsi Risiko
-        risk_counts = df['level'].value_counts().reset_index()
+        risk_counts = df['level'].value_counts()
+        risk_counts = risk_counts[risk_counts > 0].reset_index()
         risk_counts.columns = ['Status', 'Jumlah']
         
         color_scale = alt.Scale(
@@ -509,7 +627,31 @@ def main():
             order=alt.Order("Status", sort="descending")
         ).properties(height=250)
         
-        st.altair_chart(donut, use_container_width=True)
+        col_donut, col_trend = st.columns(2)
+        with col_donut:
+            st.altair_chart(donut, use_container_width=True)
+
+        # Tren Risiko Harian: desa terpilih, atau rata-rata semua desa (risk_history.py)
+        with col_trend:
+            history = get_risk_history()
+            prob_col = 'prob_model' if score_source == SOURCE_MODEL else 'prob_pct'
+            if selected_label is not None:
+                trend = history.village(selected_label)[[prob_col]].rename(columns={prob_col: 'Risiko (%)'})
+                trend_title = f"Tren {selected_desa_name}"
+            else:
+                trend = history.daily_summary(prob_col)[['mean']].rename(columns={'mean': 'Risiko (%)'})
+                trend_title = "Tren rata-rata semua desa"
+
+            trend = trend.dropna().reset_index().rename(columns={'date': 'Tanggal'})
+            if len(trend):
+                line = alt.Chart(trend).mark_line(color='#FF4B2B', point=len(trend) < 60).encode(
+                    x=alt.X("Tanggal:T", title=None),
+                    y=alt.Y("Risiko (%):Q", scale=alt.Scale(domain=[0, 100])),
+                    tooltip=[alt.Tooltip("Tanggal:T", format="%d-%b-%Y"), alt.Tooltip("Risiko (%):Q", format=".1f")]
+                ).properties(height=250, title=trend_title)
+                st.altair_chart(line, use_container_width=True)
+            else:
+                st.caption("📈 Riwayat risiko belum tersedia (terisi tiap snapshot satelit baru).")
         
         # Metrik Risiko Kebakaran
         high_count = len(df[df['level'] == 'TINGGI'])
@@ -522,11 +664,38 @@ def main():
         # Distribusi Kekeringan
         st.markdown("**Distribusi Kekeringan:**")
         dry_dist = df['status_kekeringan'].value_counts()
+        dry_dist = dry_dist[dry_dist > 0]
         for status, count in dry_dist.items():
             pct = (count/len(df)*100)
             emoji = "🔴" if "SANGAT" in status else "🟠" if status == "KERING" else "🟢" if status == "NORMAL" else "🔵"
             st.caption(f"{emoji} {status}: {count} desa ({pct:.1f}%)")
 
+        # Titik api FIRMS per desa & kabupaten (hotspot_join.py)
+        if hotspots is not None:
+            st.metric("🛰️ Titik Api FIRMS", f"{hotspots.matched:,}",
+                      f"{int((df['hotspot'] > 0).sum())} desa terdeteksi", delta_color="off")
+            for kab, count in hotspots.by_kabupaten(df_base['kabupaten']).head(5).items():
+                if count:
+                    st.caption(f"🔥 {kab}: {count:,} titik")
+            st.caption(f"Join STRtree: {hotspots.total:,} titik dalam {hotspots.seconds:.2f} dtk "
+                       f"({hotspots.unmatched:,} di luar desa)")
+        else:
+            st.caption(f"🛰️ Titik api FIRMS: simpan CSV unduhan FIRMS di `{HOTSPOT_CSV}`.")
+
+        # Perbandingan skor rumus vs model KNN
+        scored = shared.inference
+        if scored is not None:
+            st.markdown("**⚖️ Rumus vs Model KNN:**")
+            same_level = (classify_level(df['prob_rumus']) == classify_level(df['prob_model'])).mean()
+            st.caption(f"Level sama: {same_level*100:.1f}% desa · "
+                       f"Korelasi skor: {df['prob_rumus'].corr(df['prob_model']):.2f}")
+            st.caption(f"Inferensi batch: {scored.seconds*1000:.0f} ms untuk {len(df)} desa "
+                       f"({scored.batches} batch, {scored.per_village_ms:.3f} ms/desa)")
+            if scored.seconds > INFERENCE_BUDGET:
+                st.warning(f"⏱️ Inferensi melebihi anggaran {INFERENCE_BUDGET:.1f} s per rerun.")
+            if scored.out_of_range:
+                st.caption(f"⚠️ {scored.out_of_range} desa punya fitur di luar sebaran data latih model.")
+
     # ================= SORT CONTROL (FITUR BARU) =================
     st.markdown("### 🔃 Filter & Urutan Data")
     
@@ -535,7 +704,7 @@ def main():
     with col_sort_1:
         sort_by = st.selectbox(
             "Urutkan Berdasarkan:",
-            ["Nama Desa", "Tingkat Risiko (Probabilitas)", "Curah Hujan (Rain)"]
+            [label for label, column in SORT_KEYS.items() if column in sort_index.columns]
         )
         
     with col_sort_2:
@@ -545,26 +714,17 @@ def main():
             horizontal=True
         )
 
-    # Logika Sorting
-    df_sorted = df.copy()
+    # Logika Sorting: permutasi sudah dihitung per versi data, tanpa salinan frame
     is_ascending = True if "Ascending" in sort_order else False
-    
-    if sort_by == "Nama Desa":
-        df_sorted = df_sorted.sort_values(by="nama_desa", ascending=is_ascending)
-    elif sort_by == "Tingkat Risiko (Probabilitas)":
-        df_sorted = df_sorted.sort_values(by="prob_pct", ascending=is_ascending)
-    elif sort_by == "Curah Hujan (Rain)":
-        df_sorted = df_sorted.sort_values(by="Rain", ascending=is_ascending)
-    
-    df_sorted = df_sorted.reset_index(drop=True)
-    
-    # Simpan state untuk highlight peta
-    st.session_state.df_sorted_display = df_sorted
+    sort_column = SORT_KEYS[sort_by]
+
+    # Simpan state kecil untuk highlight peta (baris tabel -> ID desa pada rerun berikutnya)
+    st.session_state.table_view = TableView(data_version, sort_column, is_ascending)
 
     # --- BAGIAN 3: TABEL DATA ---
     st.subheader("📂 Data Desa")
     
-    df_table = df_sorted[['nama_desa', 'kabupaten', 'level', 'prob_pct', 'LST', 'Rain', 'NDVI', 'status_kekeringan']]
+    df_table = sort_index.rows(sort_column, is_ascending)
     
     st.dataframe(
         df_table,
@@ -573,12 +733,14 @@ def main():
             "kabupaten": "Kabupaten",
             "level": "Status Risiko",
             "prob_pct": st.column_config.ProgressColumn("Tingkat Risiko", format="%.1f%%", min_value=0, max_value=100),
+            "hotspot": st.column_config.NumberColumn("Titik Api", format="%d"),
             "LST": st.column_config.NumberColumn("Suhu (°C)", format="%.1f"),
             "Rain": st.column_config.NumberColumn("Hujan 30 Hari (mm)", format="%.1f"),
             "NDVI": st.column_config.NumberColumn("NDVI", format="%.3f"),
             "status_kekeringan": "Status Kekeringan"
         },
         use_container_width=True,
+        hide_index=True,
         selection_mode="single-row",
         on_select="rerun",
         key="selection",
@@ -634,4 +796,6 @@ def main():
             """)
 
 if __name__ == "__main__":
-    main()
+    # Satu rerun Streamlit = satu ringkasan instrumentasi (no-op jika nonaktif)
+    with get_tracer().rerun():
+        main()
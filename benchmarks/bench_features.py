@@ -0,0 +1,92 @@
+"""
+Benchmark fitur training: jalur lama (regex clean_numeric via .apply per sel
++ fitur pandas) vs fire_features (pd.to_numeric + string Arrow + NumPy).
+
+Data sintetis meniru CSV training mentah: kolom LST/Rain/NDVI sebagai teks,
+sebagian sel "kotor" (satuan, spasi, koma, kosong).
+
+Jalankan:  python benchmarks/bench_features.py --rows 10000000 --dirty 0.05
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fire_features import FEATURES, FORMULA_MULTIPLY, RAW_COLUMNS, feature_frame
+
+
+def legacy_features(df):
+    """Replika models/MODEL.py sebelum modul fitur bersama."""
+    def clean_numeric(x):
+        if pd.isna(x):
+            return 0.0
+        x = str(x).strip()
+        x = re.sub(r'[^0-9.]', '', x)
+        try:
+            return float(x)
+        except:
+            return 0.0
+
+    for col in RAW_COLUMNS:
+        df[col] = df[col].apply(clean_numeric)
+
+    LST = df['LST_Max_2024_C']
+    NDVI = df['NDVI_Max_2024']
+    Rain_Log = np.log1p(df['Rain_Max_2024_mm'])
+    EPS = 0.01
+    df['X1_Fuel_Dryness'] = (LST * (1 - NDVI)) * (Rain_Log + EPS)
+    df['X2_Thermal_Kinetic'] = LST ** 2
+    df['X3_Hydro_Stress'] = LST * (Rain_Log + EPS)
+    df = df.replace([np.inf, -np.inf], 0).fillna(0)
+    return df[FEATURES]
+
+
+def synthetic_raw(n, dirty, seed=0):
+    rng = np.random.default_rng(seed)
+    values = {
+        'LST_Max_2024_C': (rng.normal(33, 3, n), ' C'),
+        'Rain_Max_2024_mm': (rng.gamma(1.2, 80, n), 'mm'),
+        'NDVI_Max_2024': (rng.uniform(0.1, 0.95, n), ''),
+    }
+    df = {}
+    for col, (v, unit) in values.items():
+        text = pd.Series(np.round(v, 4)).astype(str).to_numpy(dtype=object)
+        mask = rng.random(n) < dirty
+        text[mask] = [f" {t}{unit} " for t in text[mask]]
+        text[rng.random(n) < dirty / 10] = None
+        df[col] = text
+    return pd.DataFrame(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--dirty', type=float, default=0.05, help="fraksi sel kotor per kolom")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    raw = synthetic_raw(args.rows, args.dirty)
+    print(f"{args.rows:,} baris sintetis ({args.dirty:.0%} sel kotor) dibuat dalam {time.perf_counter() - t0:.1f}s")
+    print(f"{'jalur':<8} {'waktu':>9} {'baris/detik':>14}")
+
+    results = {}
+    for label, fn in (('lama', lambda df: legacy_features(df)),
+                      ('vektor', lambda df: feature_frame(df, FORMULA_MULTIPLY))):
+        df = raw.copy()
+        t0 = time.perf_counter()
+        results[label] = fn(df).to_numpy()
+        elapsed = time.perf_counter() - t0
+        print(f"{label:<8} {elapsed:>8.2f}s {args.rows / elapsed:>14,.0f}")
+
+    same = np.allclose(results['lama'], results['vektor'])
+    print(f"fitur identik: {'YA' if same else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
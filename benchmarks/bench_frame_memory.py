@@ -0,0 +1,152 @@
+"""
+Benchmark memori frame desa terskor: skema lama vs skema ringkas.
+
+    lama    - WKT mentah ikut disimpan, nama/kabupaten/level/status sebagai
+              string objek Python, ukuran & skor float64, warna list per baris
+    ringkas - read_village_store (WKT dibuang, teks -> Categorical dari kamus
+              Parquet) + scored_snapshot (ukuran float32, label tanggal
+              Categorical); warna diambil dari tabel uint8 per level saat render
+
+Memori diukur dengan DataFrame.memory_usage(deep=True) per kelompok kolom.
+Objek GEOS di balik kolom geometri tidak terlihat oleh pandas dan sama untuk
+kedua skema, jadi hanya pointer array geometri yang dihitung.
+
+Jalankan:  python benchmarks/bench_frame_memory.py --national 84000
+           (layer Riau dipakai jika desa1_riau.csv ada di root repo)
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import shapely
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from risk_engine import calculate_risk, level_colors
+from scored_snapshot import build_scored_snapshot, score_snapshot, scored_version
+from village_layer import build_village_store, prepare_village_frame, read_village_store
+
+GROUPS = {
+    'geometri': ['geometry'],
+    'WKT': ['WKT'],
+    'teks': ['nama_desa', 'kabupaten', 'level', 'status_kekeringan', 'LST_Date', 'NDVI_Date', 'Rain_Date'],
+    'ukuran': ['LST', 'NDVI', 'Rain', 'prob_rumus', 'prob_pct'],
+    'warna': ['color'],
+    'bbox': ['xmin', 'ymin', 'xmax', 'ymax'],
+}
+PREFIXES = ["SUNGAI", "BUKIT", "TANJUNG", "PULAU", "TELUK", "LUBUK", "KOTA", "SUKA", "MEKAR", "KAMPUNG"]
+
+
+def synthetic_layer(n, path, vertices=48, seed=0):
+    """CSV WKT tiruan skala nasional: nama desa berulang antar kabupaten, ~1 kabupaten per 165 desa."""
+    rng = np.random.default_rng(seed)
+    cx, cy = rng.uniform(95, 141, n), rng.uniform(-11, 6, n)
+    theta = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radius = rng.uniform(0.005, 0.03, (n, 1)) * rng.uniform(0.6, 1.0, (n, vertices))
+    rings = np.stack([cx[:, None] + radius * np.cos(theta), cy[:, None] + radius * np.sin(theta)], axis=-1)
+    geoms = shapely.polygons(np.concatenate([rings, rings[:, :1]], axis=1))
+    names = [f"{PREFIXES[p]} {w}" for p, w in zip(rng.integers(0, len(PREFIXES), n), rng.integers(0, n // 4, n))]
+    pd.DataFrame({
+        'WADMKD': names,
+        'WADMKK': [f"KABUPATEN {k:03d}" for k in rng.integers(0, max(n // 165, 1), n)],
+        'WKT': shapely.to_wkt(geoms, rounding_precision=6),
+    }).to_csv(path, index=False)
+
+
+def satellite_snapshot(index, seed=1):
+    rng = np.random.default_rng(seed)
+    n = len(index)
+    frame = pd.DataFrame({
+        'LST': rng.normal(33, 3, n), 'NDVI': rng.uniform(0.1, 0.9, n), 'Rain': rng.gamma(1.2, 80, n),
+        'LST_Date': "2024-08-01", 'NDVI_Date': "2024-07-27", 'Rain_Date': "2024-07-30",
+    }, index=index)
+    return SimpleNamespace(frame=frame, version="snap-1")
+
+
+def legacy_frame(csv_path, snapshot):
+    """Replika frame data_monitor sebelum skema ringkas."""
+    raw = pd.read_csv(csv_path)
+    df = prepare_village_frame(raw.copy())
+    df['WKT'] = raw['WKT'].to_numpy()
+    df = df.join(snapshot.frame.astype({c: object for c in ('LST_Date', 'NDVI_Date', 'Rain_Date')}))
+    df = calculate_risk(df)
+    for col in ('LST', 'NDVI', 'Rain', 'prob_rumus', 'prob_pct'):
+        df[col] = df[col].astype(np.float64)
+    for col in ('level', 'status_kekeringan'):
+        df[col] = df[col].astype(str).astype(object)
+    df['color'] = level_colors(df['level']).tolist()
+    return df
+
+
+def compact_frame(store_path, snapshot):
+    df_sat, inference = score_snapshot(read_village_store(store_path), snapshot, None)
+    return build_scored_snapshot(df_sat, inference, "Rumus Fisika", None, scored_version("snap-1", "-", "0")).frame
+
+
+def group_usage(df):
+    usage = df.memory_usage(deep=True, index=False)
+    usage['geometry'] = 8 * len(df)   # pointer saja; objek GEOS identik di kedua skema
+    out = {group: int(sum(usage.get(c, 0) for c in cols)) for group, cols in GROUPS.items()}
+    out['lainnya'] = int(usage.sum()) - sum(out.values())
+    out['total'] = int(usage.sum())
+    return out
+
+
+def compare(label, csv_path):
+    store = os.path.splitext(csv_path)[0] + ".bench.parquet"
+    build_village_store(csv_path, store)
+    snapshot = satellite_snapshot(read_village_store(store).index)
+
+    t0 = time.perf_counter()
+    old = legacy_frame(csv_path, snapshot)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = compact_frame(store, snapshot)
+    t_new = time.perf_counter() - t0
+    os.remove(store)
+
+    level_diff = int((old['level'].to_numpy() != np.asarray(new['level'], dtype=object)).sum())
+    prob_diff = float((old['prob_pct'] - new['prob_pct'].astype(np.float64)).abs().max())
+    u_old, u_new = group_usage(old), group_usage(new)
+    print(f"\n{label}: {len(new):,} desa, {new['kabupaten'].nunique()} kabupaten, "
+          f"{new['nama_desa'].nunique():,} nama unik")
+    print(f"{'kolom':<10} {'lama':>11} {'ringkas':>11} {'hemat':>7}")
+    for group in list(GROUPS) + ['lainnya', 'total']:
+        a, b = u_old[group], u_new[group]
+        saving = f"{(1 - b / a) * 100:>6.0f}%" if a else f"{'-':>7}"
+        print(f"{group:<10} {a / 2**20:>8.2f}MiB {b / 2**20:>8.2f}MiB {saving}")
+    print(f"waktu bangun frame: lama {t_old:.2f}s (parse CSV), ringkas {t_new:.2f}s (store)")
+    # Skor & level dihitung dari float64 sebelum ukuran diringkas -> harus identik dengan skema lama
+    print(f"level berbeda: {level_diff} desa, |Δ prob_pct| maks {prob_diff:.2f}")
+    assert level_diff == 0 and prob_diff == 0, "skor skema ringkas berbeda dari skema lama"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--riau', default=os.path.join(ROOT, 'desa1_riau.csv'))
+    parser.add_argument('--national', type=int, default=84_000)
+    args = parser.parse_args()
+
+    if os.path.exists(args.riau):
+        compare("Layer Riau", args.riau)
+    else:
+        print(f"(lewati layer Riau: {args.riau} tidak ditemukan; memakai sintetis seukuran Riau)")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'riau.csv')
+            synthetic_layer(1_900, path)
+            compare("Sintetis seukuran Riau", path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'nasional.csv')
+        synthetic_layer(args.national, path)
+        compare("Sintetis skala nasional", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark & cek kebenaran map_layers.geojson_geometries.
+
+1. Kebenaran: hasil harus sama dengan mapping() per baris (jalur lama) untuk
+   layer Polygon, MultiPolygon, Polygon + MultiPolygon, dan layer campuran
+   yang tidak didukung to_ragged_array (Polygon + GeometryCollection /
+   LineString / Point) yang memakai jalur to_geojson. GeoJsonLayerCache dan
+   prepare_zonal juga dijalankan pada layer campuran.
+2. Waktu: ragged array vs mapping() per baris untuk n poligon.
+
+Jalankan:  python benchmarks/bench_geojson.py --villages 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import mapping
+
+from map_layers import GeoJsonLayerCache, geojson_geometries
+from satellite_snapshot import prepare_zonal
+
+SQUARE = "POLYGON((101 0, 101.1 0, 101.1 0.1, 101 0.1, 101 0))"
+CASES = {
+    'Polygon': [SQUARE, "POLYGON((102 1, 102.2 1, 102.1 1.2, 102 1))"],
+    'MultiPolygon': ["MULTIPOLYGON(((101 0, 101.1 0, 101.1 0.1, 101 0)), ((103 0, 103.1 0, 103 0.1, 103 0)))"],
+    'Polygon + MultiPolygon': [SQUARE, "MULTIPOLYGON(((103 0, 103.1 0, 103 0.1, 103 0)))"],
+    'Polygon + GeometryCollection': [SQUARE, "GEOMETRYCOLLECTION(POINT(0 0))"],
+    'Polygon + LineString': [SQUARE, "LINESTRING(101 0, 101.1 0.1)"],
+    'Polygon + Point': [SQUARE, "POINT(101 0)"],
+}
+
+
+def legacy_geometries(geometries):
+    """Jalur lama: mapping() per baris, dinormalisasi lewat JSON (tuple -> list)."""
+    return [json.loads(json.dumps(mapping(g))) for g in geometries]
+
+
+def normalized(geometry):
+    # to_ragged_array menaikkan Polygon ke MultiPolygon pada layer campuran keduanya
+    if geometry["type"] == "MultiPolygon" and len(geometry["coordinates"]) == 1:
+        return {"type": "Polygon", "coordinates": geometry["coordinates"][0]}
+    return geometry
+
+
+def check_cases():
+    for label, wkt in CASES.items():
+        geometries = shapely.from_wkt(wkt)
+        got = [normalized(g) for g in geojson_geometries(geometries)]
+        expected = [normalized(g) for g in legacy_geometries(geometries)]
+        assert got == expected, f"{label}: {got} != {expected}"
+
+        # Konsumen: cache layer peta & simplifikasi zonal tidak boleh gagal pada layer campuran
+        index = pd.RangeIndex(len(geometries))
+        df = pd.DataFrame({'nama_desa': "DESA", 'kabupaten': "KAB", 'level': "RENDAH",
+                           'prob_pct': 10.0, 'status_kekeringan': "Normal"}, index=index)
+        cache = GeoJsonLayerCache(geometries, index)
+        assert len(cache.collection(df, "v1")["features"]) == len(geometries)
+        assert len(cache.highlight(df, len(geometries) - 1)["features"]) == 1
+        prepare_zonal(geometries)
+        print(f"  OK  {label:<30} {sorted({g['type'] for g in got})}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=20_000)
+    args = parser.parse_args()
+
+    print("Kebenaran vs mapping() per baris:")
+    check_cases()
+
+    rng = np.random.default_rng(0)
+    lon, lat = rng.uniform(95, 141, args.villages), rng.uniform(-11, 6, args.villages)
+    geometries = shapely.buffer(shapely.points(lon, lat), rng.uniform(0.005, 0.03, args.villages), quad_segs=16)
+    t0 = time.perf_counter()
+    legacy_geometries(geometries)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    geojson_geometries(geometries)
+    t_new = time.perf_counter() - t0
+    mixed = np.concatenate([geometries, shapely.from_wkt(["GEOMETRYCOLLECTION(POINT(0 0))"])])
+    t0 = time.perf_counter()
+    geojson_geometries(mixed)
+    t_mixed = time.perf_counter() - t0
+    print(f"\n{args.villages:,} poligon: mapping() {t_old:.2f}s, ragged array {t_new:.2f}s, "
+          f"campuran (to_geojson) {t_mixed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
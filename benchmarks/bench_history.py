@@ -0,0 +1,74 @@
+"""
+Benchmark query riwayat risiko (risk_history.RiskHistory).
+
+Mengisi store dengan data harian sintetis (default 365 hari x 2.000 desa,
+kurang lebih seluruh desa/kelurahan Riau), lalu mengukur latensi query yang
+dipakai grafik tren dashboard: satu desa sepanjang tahun, semua desa pada satu
+hari, dan ringkasan harian semua desa.
+
+Jalankan:  python benchmarks/bench_history.py --villages 2000 --days 365
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_history import RiskHistory
+
+
+def timed(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return out, np.median(times) * 1000, np.max(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    idx = np.arange(args.villages)
+    start = date(2024, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = RiskHistory(tmp)
+        t0 = time.perf_counter()
+        for d in range(args.days):
+            history.append(start + timedelta(days=d), pd.DataFrame({
+                'LST': rng.normal(33, 3, args.villages),
+                'NDVI': rng.uniform(0.1, 0.9, args.villages),
+                'Rain': rng.gamma(1.2, 80, args.villages),
+                'prob_pct': rng.uniform(0, 100, args.villages),
+            }, index=idx))
+        fill = time.perf_counter() - t0
+        size = sum(os.path.getsize(os.path.join(r, f)) for r, _, files in os.walk(tmp) for f in files)
+        print(f"Store {args.days} hari x {args.villages:,} desa: {size / 2**20:.1f} MiB, "
+              f"diisi dalam {fill:.1f}s ({fill / args.days * 1000:.1f} ms/hari termasuk pemadatan)")
+
+        last = start + timedelta(days=args.days - 1)
+        village = int(rng.integers(0, args.villages))
+        print(f"{'query':<34} {'baris':>8} {'median':>10} {'maks':>10}")
+        for label, fn in [
+            (f"village({village}) sepanjang tahun", lambda: history.village(village)),
+            (f"day({last})", lambda: history.day(last)),
+            ("daily_summary() semua desa", lambda: history.daily_summary()),
+        ]:
+            out, median, worst = timed(fn, args.repeat)
+            print(f"{label:<34} {len(out):>8,} {median:>8.1f}ms {worst:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
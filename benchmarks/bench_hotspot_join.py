@@ -0,0 +1,107 @@
+"""
+Benchmark join titik api -> desa: hotspot_join.HotspotIndex vs loop titik-dalam-poligon.
+
+Layer desa sintetis: poligon Voronoi menutup bbox Riau (batas bersama seperti
+layer BIG), tepi dipadatkan hingga ~170 vertex per desa. Titik api: campuran
+klaster (kebakaran besar) dan titik acak, sebagian di luar bbox provinsi
+seperti unduhan FIRMS nasional. Loop naif (tiap titik x tiap poligon dengan
+cek bbox dulu) hanya dijalankan pada sampel --naive-points lalu diekstrapolasi;
+jumlah per desa pada sampel harus identik dengan hasil STRtree.
+
+Jalankan:  python benchmarks/bench_hotspot_join.py --villages 2000 --points 2000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotspot_join import HotspotIndex
+
+RIAU_BBOX = (100.0, -1.0, 104.0, 2.5)
+
+
+def synthetic_villages(n, seed=0):
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = RIAU_BBOX
+    box = shapely.box(*RIAU_BBOX)
+    seeds = shapely.multipoints(np.c_[rng.uniform(xmin, xmax, n), rng.uniform(ymin, ymax, n)])
+    cells = shapely.intersection(shapely.get_parts(shapely.voronoi_polygons(seeds, extend_to=box)), box)
+    cells = shapely.segmentize(cells, 0.002)
+    return pd.DataFrame({
+        'kabupaten': rng.choice(["KAMPAR", "SIAK", "PELALAWAN", "BENGKALIS", "ROKAN HILIR", "INDRAGIRI HULU"], n),
+        'geometry': cells,
+    }, index=pd.RangeIndex(n) * 3)
+
+
+def synthetic_hotspots(n, seed=1):
+    rng = np.random.default_rng(seed)
+    n_cluster = n // 2
+    centers = np.c_[rng.uniform(100.5, 103.5, 40), rng.uniform(-0.5, 2.0, 40)]
+    which = rng.integers(0, len(centers), n_cluster)
+    cluster = centers[which] + rng.normal(0, 0.05, (n_cluster, 2))
+    scatter = np.c_[rng.uniform(99.0, 105.0, n - n_cluster), rng.uniform(-2.0, 3.5, n - n_cluster)]
+    points = np.vstack([cluster, scatter])
+    return points[:, 0], points[:, 1]
+
+
+def naive_counts(geometries, lon, lat):
+    """Loop per titik x per poligon (cek bbox lalu contains), tanpa indeks spasial."""
+    bounds = shapely.bounds(geometries)
+    counts = np.zeros(len(geometries), dtype=np.int64)
+    for x, y in zip(lon, lat):
+        point = shapely.Point(x, y)
+        for i, geom in enumerate(geometries):
+            b = bounds[i]
+            if b[0] <= x <= b[2] and b[1] <= y <= b[3] and geom.intersects(point):
+                counts[i] += 1
+                break
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--points', type=int, default=2_000_000)
+    parser.add_argument('--naive-points', type=int, default=2000)
+    args = parser.parse_args()
+
+    villages = synthetic_villages(args.villages)
+    lon, lat = synthetic_hotspots(args.points)
+    geometries = villages['geometry'].to_numpy()
+    print(f"{args.villages:,} desa ({shapely.get_num_coordinates(geometries).mean():.0f} vertex/desa), "
+          f"{args.points:,} titik api")
+
+    t0 = time.perf_counter()
+    index = HotspotIndex(geometries, villages.index)
+    print(f"STRtree + prepare poligon: {(time.perf_counter() - t0) * 1000:.0f} ms (sekali per versi layer desa)")
+
+    result = index.count(lon, lat)
+    rate = result.total / result.seconds
+    print(f"STRtree  : {result.seconds:.2f}s untuk {result.total:,} titik ({rate / 1e6:.2f} juta titik/detik), "
+          f"{result.matched:,} di dalam desa, {result.unmatched:,} di luar")
+
+    sample = slice(0, args.naive_points)
+    geoms_copy = shapely.from_wkb(shapely.to_wkb(geometries))   # tanpa prepare, seperti kode naif
+    t0 = time.perf_counter()
+    naive = naive_counts(geoms_copy, lon[sample], lat[sample])
+    naive_seconds = time.perf_counter() - t0
+    per_point = naive_seconds / args.naive_points
+    print(f"Loop naif: {naive_seconds:.2f}s untuk {args.naive_points:,} titik "
+          f"-> perkiraan {per_point * args.points / 60:.1f} menit untuk {args.points:,} titik "
+          f"({per_point * rate:.0f}x lebih lambat)")
+
+    sample_counts = index.count(lon[sample], lat[sample]).village.to_numpy()
+    print(f"Jumlah per desa pada sampel identik: {'YA' if np.array_equal(naive, sample_counts) else 'TIDAK'}")
+
+    top = result.by_kabupaten(villages['kabupaten']).head(3)
+    print("Kabupaten teratas: " + ", ".join(f"{kab} {count:,}" for kab, count in top.items()))
+
+
+if __name__ == "__main__":
+    main()
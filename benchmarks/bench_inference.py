@@ -0,0 +1,69 @@
+"""
+Benchmark inferensi model KNN (models/initial_model.pkl) untuk dashboard:
+  per-desa - predict_proba satu baris per desa (diukur pada sampel, diekstrapolasi)
+  batch    - model_score (fitur vektor + predict_proba per batch)
+
+Input LST/NDVI/Rain sintetis dengan rentang nilai satelit harian Riau.
+
+Jalankan:  python benchmarks/bench_inference.py --villages 1900 20000 200000 --batch 1024 4096 16384
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fire_features import FEATURES, physics_features
+from risk_engine import MODEL_PATH, load_risk_model, model_score
+
+
+def synthetic_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(24, 42, n), rng.uniform(0.1, 0.9, n), rng.gamma(1.5, 60, n)
+
+
+def per_row(model, lst, ndvi, rain, sample=500):
+    """Replika skor per desa (satu predict_proba per baris), diekstrapolasi dari `sample` desa."""
+    X = physics_features(lst[:sample], ndvi[:sample], rain[:sample])
+    t0 = time.perf_counter()
+    for row in X:
+        model.predict_proba(pd.DataFrame([row], columns=FEATURES))
+    return (time.perf_counter() - t0) / len(X) * len(lst)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--villages', type=int, nargs='+', default=[1_900, 20_000, 200_000])
+    parser.add_argument('--batch', type=int, nargs='+', default=[1024, 4096, 16384])
+    parser.add_argument('--budget', type=float, default=1.0, help="anggaran detik per rerun")
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')   # InconsistentVersionWarning antar versi scikit-learn
+        t0 = time.perf_counter()
+        model = load_risk_model(args.model)
+        print(f"Load model: {(time.perf_counter() - t0) * 1000:.0f} ms ({os.path.getsize(args.model) / 1024:.0f} KiB)")
+
+    print(f"{'desa':>8} {'mode':<12} {'waktu':>9} {'ms/desa':>9} {'anggaran':>9}")
+    for n in args.villages:
+        lst, ndvi, rain = synthetic_inputs(n)
+        est = per_row(model, lst, ndvi, rain)
+        print(f"{n:>8} {'per-desa':<12} {est:>8.2f}s {est / n * 1000:>9.3f} {'OK' if est <= args.budget else 'LEWAT':>9}")
+        reference = None
+        for batch in args.batch:
+            scored = model_score(model, lst, ndvi, rain, batch_size=batch)
+            if reference is None:
+                reference = scored.prob_pct
+            ok = 'OK' if scored.seconds <= args.budget else 'LEWAT'
+            print(f"{n:>8} {f'batch {batch}':<12} {scored.seconds:>8.2f}s {scored.per_village_ms:>9.3f} {ok:>9}"
+                  + ("" if np.array_equal(reference, scored.prob_pct) else "  (hasil berbeda!)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark instrumentasi (instrumentation.Tracer).
+
+1. Overhead per panggilan span()/count(): nonaktif, aktif tanpa file, dan
+   aktif dengan JSON lines, dibandingkan loop kosong.
+2. Satu "rerun" pipeline dengan `ee` palsu (resolusi jendela + ekstraksi
+   reduceRegions + skor risiko) di bawah TRACER.rerun(): rincian per tahap,
+   jumlah round trip, dan potongan file Prometheus yang dihasilkan. Pipeline
+   yang sama dijalankan dengan tracer nonaktif untuk membandingkan waktunya.
+
+Jalankan:  python benchmarks/bench_instrumentation.py --villages 2000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from extraction_cache import ExtractionCache
+from instrumentation import JSONL_FILE, PROMETHEUS_FILE, TRACER
+from satellite_engine import WindowResolver
+from satellite_snapshot import SnapshotScheduler, build_snapshot
+from scored_snapshot import build_scored_snapshot, score_snapshot, scored_version
+
+
+def per_call_ns(fn, n):
+    t0 = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def loop_empty(n):
+    for _ in range(n):
+        pass
+
+
+def loop_span(n):
+    for _ in range(n):
+        with TRACER.span("x"):
+            pass
+
+
+def loop_count(n):
+    for _ in range(n):
+        TRACER.count("x")
+
+
+def pipeline(villages, tmp, workers):
+    """Satu putaran: snapshot baru (tanpa cache) -> frame terskor."""
+    cache = ExtractionCache(os.path.join(tmp, f"cache-{time.perf_counter_ns()}"))
+    build = lambda previous, **kw: build_snapshot(ee, WindowResolver(ee), cache, villages[['lon', 'lat']],
+                                                  "bench", previous, now=datetime.utcnow(), max_workers=workers,
+                                                  **kw)
+    snapshot = SnapshotScheduler(build).run_once()
+    df_sat, inference = score_snapshot(villages, snapshot, None)
+    return build_scored_snapshot(df_sat, inference, "Rumus Fisika", None, scored_version(snapshot.version, "-", "0"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--calls', type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = per_call_ns(loop_empty, args.calls)
+        print(f"{'mode':<26} {'span() ns':>10} {'count() ns':>11}")
+        for label, enabled, directory in [("nonaktif", False, None), ("aktif, tanpa file", True, None),
+                                          ("aktif + JSON lines", True, os.path.join(tmp, "micro"))]:
+            TRACER.configure(enabled=enabled, directory=directory)
+            calls = args.calls if directory is None else args.calls // 10
+            span_ns = per_call_ns(loop_span, calls) - base
+            count_ns = per_call_ns(loop_count, calls) - base
+            print(f"{label:<26} {span_ns:>10.0f} {count_ns:>11.0f}")
+        TRACER.close()
+
+        ee.configure(latency=args.latency)
+        rng = np.random.default_rng(0)
+        villages = pd.DataFrame({'lon': rng.uniform(100, 104, args.villages),
+                                 'lat': rng.uniform(-1, 2.5, args.villages),
+                                 'nama_desa': [f"DESA {i}" for i in range(args.villages)]})
+
+        TRACER.configure(enabled=False)
+        t0 = time.perf_counter()
+        pipeline(villages, tmp, args.workers)
+        disabled = time.perf_counter() - t0
+
+        out_dir = os.path.join(tmp, "telemetri")
+        TRACER.configure(enabled=True, directory=out_dir)
+        t0 = time.perf_counter()
+        with TRACER.rerun():
+            pipeline(villages, tmp, args.workers)
+        enabled = time.perf_counter() - t0
+        TRACER.close()
+
+        row = TRACER.breakdown(1)[0]
+        print(f"\nPipeline {args.villages:,} desa (latensi {args.latency}s): nonaktif {disabled:.2f}s, "
+              f"aktif {enabled:.2f}s")
+        print("Rincian rerun (span di thread rerun; reduceRegions berjalan di worker ekstraksi):")
+        for key, value in row.items():
+            if key not in ('rerun', 'mulai'):
+                print(f"  {key:<24} {value}")
+        with open(os.path.join(out_dir, JSONL_FILE)) as f:
+            lines = sum(1 for _ in f)
+        print(f"\n{JSONL_FILE}: {lines} baris. Potongan {PROMETHEUS_FILE}:")
+        with open(os.path.join(out_dir, PROMETHEUS_FILE)) as f:
+            for line in f:
+                if 'ee_' in line or line.startswith('rfcc_reruns'):
+                    print("  " + line.rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark backend indeks tetangga KNN: akurasi/F1 vs throughput query,
+ukuran file dan waktu load.
+
+  pickle    - Pipeline(StandardScaler, KNeighborsClassifier) + joblib (seperti models/MODEL.py)
+  kd_tree   - knn_index KDTree (.npz)
+  ball_tree - knn_index BallTree (.npz)
+  ivf-pN    - knn_index IVF + kode uint8, N kelompok diperiksa per query (.npz)
+
+Data latih sintetis meniru skala multi-tahun / multi-provinsi (fitur X1/X2/X3
+dari LST/NDVI/Rain acak, label dari aturan fisika + noise).
+
+Jalankan:  python benchmarks/bench_knn_index.py --train 500000 --test 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fire_features import physics_features
+from knn_index import KNNIndexModel
+
+
+def synthetic_dataset(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lst = rng.normal(33, 3, n)
+    ndvi = np.clip(rng.normal(0.7, 0.15, n), -0.2, 0.95)
+    rain = rng.gamma(1.2, 80, n)
+    # Label: panas + kering + vegetasi tipis -> kebakaran, dengan noise
+    logit = 0.6 * (lst - 33) - 0.015 * (rain - 100) - 4 * (ndvi - 0.7) + rng.normal(0, 1, n)
+    return physics_features(lst, ndvi, rain), (logit > 0).astype(int)
+
+
+def evaluate(label, model, path, load, X_test, y_test):
+    t0 = time.perf_counter()
+    loaded = load(path)
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    y_pred = loaded.predict(X_test)
+    t_query = time.perf_counter() - t0
+    print(f"{label:<10} {accuracy_score(y_test, y_pred):>8.4f} {f1_score(y_test, y_pred):>8.4f} "
+          f"{len(X_test) / t_query:>12,.0f} {os.path.getsize(path) / 2**20:>9.1f}MiB {t_load * 1000:>8.0f}ms")
+    return y_pred
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--train', type=int, default=500_000)
+    parser.add_argument('--test', type=int, default=20_000)
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    X_train, y_train = synthetic_dataset(args.train, seed=0)
+    X_test, y_test = synthetic_dataset(args.test, seed=1)
+    print(f"Latih {args.train:,} baris, uji {args.test:,} baris")
+    print(f"{'backend':<10} {'akurasi':>8} {'F1':>8} {'query/detik':>12} {'ukuran':>12} {'load':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = make_pipeline(StandardScaler(), KNeighborsClassifier(n_neighbors=5, weights='distance'))
+        pipeline.fit(X_train, y_train)
+        pkl = os.path.join(tmp, 'model.pkl')
+        joblib.dump(pipeline, pkl)
+        reference = evaluate('pickle', pipeline, pkl, joblib.load, X_test, y_test)
+
+        for backend in ('kd_tree', 'ball_tree'):
+            path = os.path.join(tmp, f'{backend}.npz')
+            t0 = time.perf_counter()
+            KNNIndexModel.from_pipeline(pipeline, backend=backend).save(path)
+            y_pred = evaluate(backend, None, path, KNNIndexModel.load, X_test, y_test)
+            print(f"{'':<10} build {time.perf_counter() - t0:.1f}s, prediksi sama dengan pickle: "
+                  f"{(y_pred == reference).mean() * 100:.2f}%")
+
+        ivf = KNNIndexModel.from_pipeline(pipeline, backend='ivf')
+        for n_probe in args.probes:
+            ivf.n_probe = n_probe
+            path = os.path.join(tmp, f'ivf-p{n_probe}.npz')
+            ivf.save(path)
+            y_pred = evaluate(f'ivf-p{n_probe}', None, path, KNNIndexModel.load, X_test, y_test)
+            print(f"{'':<10} prediksi sama dengan pickle: {(y_pred == reference).mean() * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark load layer desa:
+  lama   - .apply shapely.wkt.loads per baris + 2x centroid
+  vektor - prepare_village_frame (shapely 2.x array)
+  store  - read_village_store (GeoParquet WKB, tanpa parsing teks)
+
+Tiap mode dijalankan di subprocess terpisah (pemanasan sekali, lalu VmHWM
+di-reset) agar RSS puncak tidak saling tercampur; alokasi GEOS tidak terlihat
+oleh tracemalloc.
+
+Jalankan:
+    python benchmarks/bench_load_data.py                     # desa1_riau.csv (jika ada) + sintetis 100k
+    python benchmarks/bench_load_data.py --synthetic 200000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+
+def legacy_load(path):
+    """Replika load_data sebelum vektorisasi."""
+    import shapely.wkt
+    df = pd.read_csv(path)
+    df.columns = [c.strip().upper() for c in df.columns]
+    df = df.rename(columns={'WADMKD': 'nama_desa', 'NAMOBJ': 'nama_desa', 'DESA': 'nama_desa',
+                            'WADMKK': 'kabupaten', 'KABUPATEN': 'kabupaten'})
+    df = df.loc[:, ~df.columns.duplicated()]
+    df['geometry'] = df['WKT'].apply(lambda x: shapely.wkt.loads(str(x)) if pd.notnull(x) else None)
+    df = df.dropna(subset=['geometry']).reset_index(drop=True)
+    df['lat'] = df['geometry'].apply(lambda g: g.centroid.y)
+    df['lon'] = df['geometry'].apply(lambda g: g.centroid.x)
+    return df
+
+
+def vector_load(path):
+    from village_layer import prepare_village_frame
+    return prepare_village_frame(pd.read_csv(path))
+
+
+def store_load(path):
+    from village_layer import read_village_store
+    return read_village_store(path)
+
+
+def synthetic_layer(n, path, vertices=48, seed=0):
+    """Poligon desa tiruan (bintang tak beraturan) tersebar di bbox Riau."""
+    rng = np.random.default_rng(seed)
+    cx = rng.uniform(100.0, 103.8, n)
+    cy = rng.uniform(-1.1, 2.9, n)
+    theta = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radius = rng.uniform(0.005, 0.03, (n, 1)) * rng.uniform(0.6, 1.0, (n, vertices))
+    xs = cx[:, None] + radius * np.cos(theta)
+    ys = cy[:, None] + radius * np.sin(theta)
+    wkt = []
+    for x, y in zip(xs, ys):
+        ring = ", ".join(f"{a:.6f} {b:.6f}" for a, b in zip(x, y))
+        wkt.append(f"POLYGON (({ring}, {x[0]:.6f} {y[0]:.6f}))")
+    pd.DataFrame({
+        'WADMKD': [f"DESA {i}" for i in range(n)],
+        'WADMKK': rng.choice(['BENGKALIS', 'KAMPAR', 'SIAK', 'PELALAWAN', 'ROKAN HILIR'], n),
+        'WKT': wkt,
+    }).to_csv(path, index=False)
+
+
+def peak_rss_kib():
+    """VmHWM (Linux, di-reset saat exec) dengan fallback ke ru_maxrss."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(mode, path):
+    import gc
+    loader = {'lama': legacy_load, 'vektor': vector_load, 'store': store_load}[mode]
+
+    # Pemanasan satu kali (halaman kode .so, pool alokator) lalu reset VmHWM
+    loader(path)
+    gc.collect()
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    rss_before = peak_rss_kib()
+    t0 = time.perf_counter()
+    df = loader(path)
+    elapsed = time.perf_counter() - t0
+    rss_after = peak_rss_kib()
+    print(json.dumps({'rows': len(df), 'seconds': elapsed,
+                      'peak_mib': rss_after / 1024, 'delta_mib': (rss_after - rss_before) / 1024,
+                      'centroid_sum': float(df['lat'].sum() + df['lon'].sum())}))
+
+
+def compare(label, path):
+    from village_layer import build_village_store
+
+    store = os.path.splitext(path)[0] + ".bench.parquet"
+    build_village_store(path, store)
+    print(f"\n{label} ({os.path.getsize(path) / 2**20:.1f} MiB CSV, {os.path.getsize(store) / 2**20:.1f} MiB store)")
+    print(f"{'mode':<8} {'baris':>8} {'waktu':>9} {'RSS puncak':>12} {'Δ RSS':>10}")
+    checks = []
+    for mode, src in (('lama', path), ('vektor', path), ('store', store)):
+        out = subprocess.run([sys.executable, __file__, '--child', mode, src],
+                             capture_output=True, text=True, check=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        checks.append(r['centroid_sum'])
+        print(f"{mode:<8} {r['rows']:>8} {r['seconds']:>8.2f}s {r['peak_mib']:>10.1f}MiB {r['delta_mib']:>8.1f}MiB")
+    os.remove(store)
+    print(f"centroid identik: {'YA' if np.allclose(checks, checks[0]) else 'TIDAK'}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--riau', default=os.path.join(ROOT, 'desa1_riau.csv'))
+    parser.add_argument('--synthetic', type=int, default=100_000)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    if os.path.exists(args.riau):
+        compare("Layer Riau", args.riau)
+    else:
+        print(f"(lewati layer Riau: {args.riau} tidak ditemukan)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sintetis.csv')
+        synthetic_layer(args.synthetic, path)
+        compare(f"Sintetis {args.synthetic:,} poligon", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark tier level-of-detail peta: jumlah vertex, ukuran payload GeoJSON
+dan waktu serialisasi (json.dumps, setara yang dilakukan pydeck) per tier.
+
+Jalankan:
+    python benchmarks/bench_map_lod.py                       # desa1_riau.parquet jika ada
+    python benchmarks/bench_map_lod.py --synthetic 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import shapely
+
+from map_layers import LOD_TIERS, GeoJsonLayerCache, simplify_tier
+from risk_engine import classify_level
+from village_layer import build_village_store, read_village_store
+
+
+def load_layer(args, tmp):
+    if os.path.exists(args.store) and not args.synthetic:
+        return read_village_store(args.store), args.store
+    from bench_load_data import synthetic_layer
+    n = args.synthetic or 2000
+    csv = os.path.join(tmp, 'sintetis.csv')
+    synthetic_layer(n, csv)
+    return build_village_store(csv, os.path.join(tmp, 'sintetis.parquet')), f"sintetis {n:,} poligon"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--store', default=os.path.join(ROOT, 'desa1_riau.parquet'))
+    parser.add_argument('--synthetic', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df, label = load_layer(args, tmp)
+
+    df['prob_pct'] = np.round(np.random.default_rng(0).uniform(0, 100, len(df)), 1)
+    df['level'] = classify_level(df['prob_pct'])
+    df['status_kekeringan'] = 'NORMAL'
+    geoms = df['geometry'].to_numpy()
+    cache = GeoJsonLayerCache(geoms, df.index)
+
+    print(f"Layer: {label} ({len(df)} desa)")
+    print(f"{'tier':<8} {'zoom>=':>6} {'toleransi':>10} {'vertex':>10} {'simplify':>9} {'build':>8} {'dumps':>8} {'payload':>10}")
+    for min_zoom, tier, tol in LOD_TIERS:
+        t0 = time.perf_counter()
+        simplified = simplify_tier(geoms, tier)
+        t_simplify = time.perf_counter() - t0
+        vertices = int(shapely.get_num_coordinates(simplified).sum())
+
+        t0 = time.perf_counter()
+        fc = cache.collection(df, 'bench', tier)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        payload = json.dumps(fc)
+        t_dumps = time.perf_counter() - t0
+        print(f"{tier:<8} {min_zoom:>6} {tol:>10.4f} {vertices:>10,} {t_simplify * 1000:>7.0f}ms "
+              f"{t_build * 1000:>6.0f}ms {t_dumps * 1000:>6.0f}ms {len(payload) / 2**20:>8.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: resolusi LST/NDVI/CHIRPS serial vs paralel (fetch_layers).
+
+CHIRPS dibuat lambat untuk meniru kondisi lapangan; dataset lain tidak boleh
+ikut tertahan.
+
+Jalankan:  python benchmarks/bench_parallel_fetch.py --latency 0.3 --chirps-latency 1.5
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from satellite_engine import DATASETS, WindowResolver, fetch_layers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--chirps-latency', type=float, default=1.5)
+    parser.add_argument('--timeout', type=float, default=None)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    ee.configure(latency=args.latency, now=now,
+                 latency_by_collection={'UCSB-CHG/CHIRPS/DAILY': args.chirps_latency})
+
+    # Serial (alur lama: satu dataset setelah yang lain)
+    resolver = WindowResolver(ee)
+    t0 = time.perf_counter()
+    for spec in DATASETS.values():
+        resolver.resolve(spec, now)
+    serial = time.perf_counter() - t0
+
+    # Paralel
+    resolver = WindowResolver(ee)
+    t0 = time.perf_counter()
+
+    def report(result):
+        state = "OK" if result.ok else f"GAGAL ({result.error})"
+        print(f"  {result.key:<5} selesai pada {time.perf_counter() - t0:6.2f} s  (kerja {result.seconds:5.2f} s)  {state}")
+
+    results = fetch_layers(resolver, DATASETS.values(), now, timeout=args.timeout, on_done=report)
+    parallel = time.perf_counter() - t0
+
+    print("-" * 50)
+    print(f"Serial   : {serial:6.2f} s")
+    print(f"Paralel  : {parallel:6.2f} s  ({sum(r.ok for r in results.values())}/{len(results)} dataset OK)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark calculate_risk: versi lama (.apply per baris, level/warna list Python)
+vs risk_engine (np.select + Categorical + tabel warna uint8).
+
+Mengukur waktu dan memori frame hasil (deep memory_usage) untuk N desa
+sintetis, lalu memastikan skor, level dan status kekeringan identik.
+
+Jalankan:  python benchmarks/bench_risk.py --villages 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_engine import calculate_risk, level_colors
+
+
+def legacy_calculate_risk(df):
+    """Replika calculate_risk sebelum vektorisasi."""
+    norm_lst = ((df['LST'] - 25) / (40 - 25)).clip(0, 1)
+    norm_rain = (1 - (df['Rain'] / 300)).clip(0, 1)
+    norm_dry = (1 - df['NDVI']).clip(0, 1)
+    risk_score = (0.4 * norm_rain) + (0.4 * norm_lst) + (0.2 * norm_dry)
+    df['prob_pct'] = (risk_score * 100).round(1)
+
+    def get_level(p):
+        if p > 60: return "TINGGI", [255, 0, 0]
+        elif p > 50: return "SEDANG", [255, 165, 0]
+        return "RENDAH", [0, 128, 0]
+
+    res = df['prob_pct'].apply(get_level)
+    df['level'] = [x[0] for x in res]
+    df['color'] = [x[1] for x in res]
+
+    def get_dry_status(rain):
+        if pd.isna(rain): return "DATA TIDAK ADA"
+        if rain < 10: return "SANGAT KERING"
+        elif rain < 50: return "KERING"
+        elif rain < 100: return "NORMAL"
+        return "BASAH"
+
+    df['status_kekeringan'] = df['Rain'].apply(get_dry_status)
+    return df
+
+
+def synthetic_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rain = rng.gamma(1.5, 60, n)
+    rain[rng.random(n) < 0.01] = np.nan
+    return pd.DataFrame({
+        'LST': rng.uniform(22, 42, n),
+        'NDVI': rng.uniform(-0.2, 0.9, n),
+        'Rain': rain,
+    })
+
+
+def result_mib(df):
+    cols = [c for c in ('prob_pct', 'level', 'color', 'status_kekeringan') if c in df.columns]
+    return df[cols].memory_usage(deep=True, index=False).sum() / 2**20
+
+
+def measure(label, fn, base):
+    df = base.copy()
+    t0 = time.perf_counter()
+    out = fn(df)
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<8} {elapsed:>8.3f}s {result_mib(out):>10.1f}MiB")
+    return out, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    base = synthetic_frame(args.villages)
+    print(f"{args.villages:,} desa sintetis")
+    print(f"{'versi':<8} {'waktu':>9} {'memori hasil':>12}")
+    old, t_old = measure('lama', legacy_calculate_risk, base)
+    new, t_new = measure('vektor', calculate_risk, base)
+
+    # Warna versi baru dihitung saat dibutuhkan (layer peta), ikut diukur terpisah
+    t0 = time.perf_counter()
+    colors = level_colors(new['level'])
+    print(f"{'warna':<8} {time.perf_counter() - t0:>8.3f}s {colors.nbytes / 2**20:>10.1f}MiB  (uint8 n x 3, on-demand)")
+
+    same = (np.allclose(old['prob_pct'], new['prob_pct'], equal_nan=True)
+            and (old['level'] == new['level'].astype(str)).all()
+            and (old['status_kekeringan'] == new['status_kekeringan'].astype(str)).all()
+            and np.array_equal(np.asarray(old['color'].tolist()), colors))
+    print(f"\nspeedup {t_old / t_new:.1f}x, hasil identik: {'YA' if same else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
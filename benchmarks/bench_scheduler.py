@@ -0,0 +1,126 @@
+"""
+Simulasi penjadwal snapshot satelit dengan `ee` palsu dan jam tiruan.
+
+Jam tiruan dimajukan dari jadwal ke jadwal (next_run_time) selama beberapa
+hari; tiap putaran dicatat dataset mana yang diekstrak ulang dan berapa
+reduceRegions yang dikirim. Cache ekstraksi memakai setelan app.py (TTL 6 jam,
+maks. 256 MB), jadi entri LST/NDVI sudah kedaluwarsa saat jendela berikutnya
+berubah. CHIRPS disimulasikan rilis siang hari (delay 5 -> 4 hari mulai jam
+13), sehingga ada putaran yang hanya mengubah Rain; tiap putaran hanya boleh
+me-reduce band dataset yang jendelanya berubah.
+Di akhir dibandingkan waktu sesi baru menunggu data: ekstraksi di depan (cara
+lama) vs membaca snapshot yang sudah disiapkan.
+
+Jalankan:  python benchmarks/bench_scheduler.py --villages 5000 --days 3 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from extraction_cache import ExtractionCache
+from satellite_engine import DATASETS, WindowResolver
+from satellite_snapshot import SnapshotScheduler, SnapshotStore, build_snapshot, next_run_time
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def set(self, now):
+        self.now = now
+        ee.configure(now=now)
+
+    def epoch(self):
+        """Waktu epoch nyata + jam tiruan yang sudah berlalu (umur mtime file cache ikut bertambah)."""
+        return time.time() + (self.now - self.start).total_seconds()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    villages = pd.DataFrame({'lon': rng.uniform(100, 104, args.villages),
+                             'lat': rng.uniform(-1, 2.5, args.villages)})
+    clock = FakeClock(datetime(2024, 8, 1, 0, 30))
+    clock.start = clock.now
+    clock.set(clock.now)
+    ee.configure(latency=args.latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resolver = WindowResolver(ee, ttl_seconds=3600, clock=clock)
+        # Setelan sama dengan get_extraction_cache() di app.py
+        cache = ExtractionCache(os.path.join(tmp, "cache"), ttl_seconds=6 * 3600, max_bytes=256 * 2**20,
+                                clock=clock.epoch)
+        build = partial(build_snapshot, ee, resolver, cache, villages, "bench")
+        store = SnapshotStore(os.path.join(tmp, "snapshot.parquet"))
+        scheduler = SnapshotScheduler(build, store=store, clock=clock)
+
+        print(f"{'jam tiruan':<18} {'ekstrak ulang':<18} {'band direduce':<26} {'reduceRegions':>13} {'waktu':>8}")
+        rain_only = 0
+        end = clock.now + timedelta(days=args.days)
+        while clock.now < end:
+            # Rilis CHIRPS hari ini baru tersedia siang hari
+            ee.configure(chirps_delay_days=4 if clock.now.hour >= 13 else 5)
+            ee.reset_stats()
+            before = scheduler.latest()
+            t0 = time.perf_counter()
+            snapshot = scheduler.run_once()
+            changed = ', '.join(snapshot.plan.changed) if snapshot is not before else '-'
+            reduced = ', '.join(sorted(ee.BAND_REDUCTIONS)) or '-'
+            print(f"{clock.now.strftime('%d-%b %H:%M'):<18} {changed:<18} {reduced:<26} "
+                  f"{ee.STATS['reduceRegions']:>13} {time.perf_counter() - t0:>7.2f}s")
+            if snapshot is not before:
+                # Kolom dataset tetap harus disalin dari snapshot sebelumnya, bukan dari cache (kedaluwarsa)
+                expected = {DATASETS[key].out_band for key in snapshot.plan.changed}
+                assert set(ee.BAND_REDUCTIONS) == expected, f"band tidak berubah ikut direduce: {reduced}"
+                rain_only += before is not None and snapshot.plan.changed == ['Rain']
+            clock.set(next_run_time(clock.now, scheduler.hours))
+
+        print(f"\nPutaran hanya-Rain tanpa reduceRegions LST/NDVI: {rain_only}")
+
+        # Sesi baru: cara lama menunggu ekstraksi penuh, sekarang cukup baca snapshot
+        t0 = time.perf_counter()
+        build_snapshot(ee, WindowResolver(ee, clock=clock), ExtractionCache(os.path.join(tmp, "dingin")),
+                       villages, "bench")
+        cold = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        snapshot = scheduler.latest()
+        warm = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        restored = SnapshotScheduler(build, store=store, clock=clock).latest()
+        restart = time.perf_counter() - t0
+
+        print(f"\nSesi baru, ekstraksi di depan : {cold * 1000:9.1f} ms")
+        print(f"Sesi baru, snapshot di memori: {warm * 1000:9.3f} ms (umur {snapshot.age(clock.now)})")
+        print(f"Restart proses, snapshot disk: {restart * 1000:9.1f} ms "
+              f"(versi sama: {'YA' if restored.version == snapshot.version else 'TIDAK'})")
+
+        # Thread latar belakang: putaran pertama langsung jalan, stop() tidak menunggu jadwal berikutnya
+        scheduler.start()
+        time.sleep(0.5)
+        scheduler.stop(timeout=5)
+        print(f"Thread penjadwal: {scheduler.runs} putaran total, jadwal berikutnya {scheduler.next_run}")
+
+
+if __name__ == "__main__":
+    main()
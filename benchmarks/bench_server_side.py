@@ -0,0 +1,111 @@
+"""
+Benchmark: konversi satuan di klien vs image math di server + payload kolumnar.
+
+Tiga jalur dibandingkan terhadap `ee` palsu yang mengirim payload JSON realistis
+(fitur GeoJSON lengkap dengan geometri & id, di-serialisasi lalu di-parse):
+    loop per fitur   - loop Python lama: konversi per fitur -> list dict -> DataFrame
+    properti+pandas  - extract_points (list properti) + konversi vektor pandas
+    server+kolom     - satellite_snapshot.extract_satellite_values: konversi &
+                       mask sebagai image math, reduceColumns(toList) -> NumPy
+
+Dilaporkan waktu total, waktu di sisi klien (total dikurangi komputasi server
+tiruan; akurat untuk --workers 1), ukuran payload JSON dan selisih maksimum
+nilai antar jalur. --bandwidth mensimulasikan waktu unduh payload.
+
+Jalankan:  python benchmarks/bench_server_side.py --villages 20000 --chunk 1000 --bandwidth 5
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from satellite_engine import DATASETS, WindowResolver, extract_points, fetch_layers
+from satellite_snapshot import extract_satellite_values
+
+
+def raw_image(layers):
+    combined = None
+    for res in layers.values():
+        combined = res.image if combined is None else combined.addBands(res.image)
+    return combined.unmask(-9999)
+
+
+def loop_per_feature(villages, layers, chunk, workers):
+    data = extract_points(ee, raw_image(layers), villages.index, villages['lon'], villages['lat'],
+                          chunk_size=chunk, max_workers=workers)
+    rows = []
+    for p in data:
+        l_val, n_val, r_val = p.get('LST_RAW'), p.get('NDVI_RAW'), p.get('Rain_RAW')
+        rows.append({
+            'idx': p.get('idx'),
+            'LST': (l_val * 0.02) - 273.15 if l_val and l_val > 0 and l_val != -9999 else None,
+            'NDVI': max(-1, min(1, n_val * 0.0001)) if n_val and n_val != -9999 else None,
+            'Rain': float(r_val) if r_val is not None and r_val != -9999 else None,
+        })
+    return pd.DataFrame(rows).astype({'LST': float, 'NDVI': float, 'Rain': float})
+
+
+def props_pandas(villages, layers, chunk, workers):
+    raw = pd.DataFrame(extract_points(ee, raw_image(layers), villages.index, villages['lon'], villages['lat'],
+                                      chunk_size=chunk, max_workers=workers))
+    lst, ndvi, rain = raw['LST_RAW'], raw['NDVI_RAW'], raw['Rain_RAW']
+    return pd.DataFrame({
+        'idx': raw['idx'],
+        'LST': (lst * 0.02 - 273.15).where(lst.notna() & (lst > 0) & (lst != -9999)),
+        'NDVI': (ndvi * 0.0001).clip(-1, 1).where(ndvi.notna() & (ndvi != 0) & (ndvi != -9999)),
+        'Rain': rain.where(rain.notna() & (rain != -9999)),
+    })
+
+
+def server_columns(villages, layers, chunk, workers):
+    return extract_satellite_values(ee, villages, layers, chunk_size=chunk, max_workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=20000)
+    parser.add_argument('--chunk', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=float, default=0, help="MiB/detik (0 = tanpa batas)")
+    args = parser.parse_args()
+
+    ee.configure(latency=args.latency, json_payload=True, bandwidth=args.bandwidth * 2**20,
+                 max_features=max(args.chunk, 5000))
+    rng = np.random.default_rng(0)
+    villages = pd.DataFrame({'lon': rng.uniform(100, 104, args.villages),
+                             'lat': rng.uniform(-1, 2.5, args.villages)})
+    layers = fetch_layers(WindowResolver(ee), DATASETS.values(), datetime.utcnow())
+
+    print(f"{args.villages:,} desa, chunk {args.chunk}, {args.workers} worker, latensi {args.latency}s, "
+          f"bandwidth {args.bandwidth or '-'} MiB/s")
+    print(f"{'jalur':<18} {'total':>9} {'klien':>9} {'payload':>12} {'byte/desa':>10}")
+    results = {}
+    for label, fn in [('loop per fitur', loop_per_feature), ('properti+pandas', props_pandas),
+                      ('server+kolom', server_columns)]:
+        ee.reset_stats()
+        t0 = time.perf_counter()
+        out = fn(villages, layers, args.chunk, args.workers)
+        elapsed = time.perf_counter() - t0
+        results[label] = out.set_index('idx')[['LST', 'NDVI', 'Rain']]
+        client = elapsed - ee.STATS['server_seconds']
+        print(f"{label:<18} {elapsed:>8.2f}s {client:>8.2f}s {ee.STATS['bytes'] / 2**20:>9.2f} MiB "
+              f"{ee.STATS['bytes'] / args.villages:>10.0f}")
+
+    base = results['loop per fitur']
+    for label, out in results.items():
+        diff = (out - base).abs().max().max()
+        nan_same = (out.isna() == base.isna()).all().all()
+        print(f"selisih maks {label:<18}: {diff:.2e} (pola NaN sama: {'YA' if nan_same else 'TIDAK'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark memori per sesi: frame terskor per sesi vs ScoredSnapshot bersama.
+
+    per sesi - perilaku lama: tiap sesi menyimpan data_monitor (join snapshot +
+               skor) dan df_sorted_display (salinan terurut) di session_state
+    bersama  - scored_snapshot.ScoredSnapshot dibangun sekali per versi dan
+               direferensikan semua sesi; session_state hanya versi + TableView
+
+Tiap mode dijalankan di proses terpisah (RSS dari /proc/self/statm) agar
+allocator satu mode tidak memengaruhi mode lain. Dilaporkan RSS awal, biaya
+sesi pertama (termasuk data bersama) dan pertambahan RSS rata-rata per sesi
+tambahan. Jalankan juga dengan --villages 80000 untuk skala nasional.
+
+Jalankan:  python benchmarks/bench_shared_snapshot.py --villages 2000 --sessions 20
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_engine import SOURCE_FORMULA, calculate_risk
+from scored_snapshot import build_scored_snapshot, score_snapshot, scored_version
+from table_view import TableView
+
+MODES = ('per sesi', 'bersama')
+
+
+def rss_mib():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        # Tanpa /proc: puncak RSS (KiB di Linux, byte di macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def synthetic_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lon, lat = rng.uniform(95, 141, n), rng.uniform(-11, 6, n)
+    geoms = shapely.buffer(shapely.points(lon, lat), rng.uniform(0.005, 0.03, n), quad_segs=16)
+    df_base = pd.DataFrame({
+        'nama_desa': np.array([f"DESA {i:06d}" for i in range(n)], dtype=object),
+        'kabupaten': np.array([f"KABUPATEN {i % 500:03d}" for i in range(n)], dtype=object),
+        'lon': lon, 'lat': lat,
+        'xmin': lon - 0.03, 'ymin': lat - 0.03, 'xmax': lon + 0.03, 'ymax': lat + 0.03,
+        'geometry': geoms,
+    })
+    frame = pd.DataFrame({
+        'LST': rng.normal(33, 3, n), 'NDVI': rng.uniform(0.1, 0.9, n), 'Rain': rng.gamma(1.2, 80, n),
+        'LST_Date': "2024-08-01", 'NDVI_Date': "2024-07-27", 'Rain_Date': "2024-07-30",
+    })
+    return df_base, SimpleNamespace(frame=frame, version="snap-1")
+
+
+def run_worker(mode, villages, sessions):
+    df_base, snapshot = synthetic_inputs(villages)
+    rss = [rss_mib()]
+    shared = {}
+    states = []
+    for _ in range(sessions):
+        if mode == 'per sesi':
+            df_sat, inference = score_snapshot(df_base, snapshot, None)
+            df = calculate_risk(df_sat, SOURCE_FORMULA)
+            state = {'data_version': snapshot.version, 'inference': inference, 'data_monitor': df,
+                     'df_sorted_display': df.copy().sort_values(by='prob_pct')}
+        else:
+            version = scored_version(snapshot.version, SOURCE_FORMULA, "0")
+            if version not in shared:
+                df_sat, inference = score_snapshot(df_base, snapshot, None)
+                shared[version] = build_scored_snapshot(df_sat, inference, SOURCE_FORMULA, None, version)
+            state = {'data_version': snapshot.version,
+                     'table_view': TableView(shared[version].version, 'prob_pct', False)}
+        states.append(state)
+        rss.append(rss_mib())
+    print(" ".join(f"{r:.3f}" for r in rss))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.villages, args.sessions)
+        return
+
+    print(f"{args.villages:,} desa, {args.sessions} sesi")
+    print(f"{'mode':<10} {'RSS awal':>10} {'sesi pertama':>13} {'per sesi tambahan':>18} {'total':>10}")
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, '--worker', mode, '--villages', str(args.villages),
+                              '--sessions', str(args.sessions)], capture_output=True, text=True, check=True)
+        rss = [float(v) for v in out.stdout.split()]
+        per_session = (rss[-1] - rss[1]) / max(args.sessions - 1, 1)
+        print(f"{mode:<10} {rss[0]:>7.1f}MiB {rss[1] - rss[0]:>10.2f}MiB {per_session:>15.3f}MiB "
+              f"{rss[-1] - rss[0]:>7.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark memori training: baca CSV utuh (pd.read_csv seperti skrip training
+lama) vs store streaming (stream_training.build_training_store per chunk).
+
+Tiap mode jalan di subprocess terpisah; dilaporkan waktu dan RSS puncak (VmHWM).
+CSV sintetis meniru riwayat harian per desa (kolom ID/nama + LST/Rain/NDVI + TARGET).
+
+Jalankan:  python benchmarks/bench_streaming.py --rows 5000000 --chunksize 500000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_csv(path, rows, chunk=1_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    kab = np.array(['BENGKALIS', 'KAMPAR', 'SIAK', 'PELALAWAN', 'ROKAN HILIR'])
+    header = True
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        lst = rng.normal(33, 3, n)
+        pd.DataFrame({
+            'ID_DESA': 1401000000 + rng.integers(0, 20000, n),
+            'TANGGAL': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 1800, n), unit='D'),
+            'NAMA_PROV': 'RIAU',
+            'NAMA_KAB': kab[rng.integers(0, len(kab), n)],
+            'NAMA_DESA': [f"DESA {i}" for i in rng.integers(0, 20000, n)],
+            'Rain_Max_2024_mm': np.round(rng.gamma(1.2, 80, n), 2),
+            'LST_Max_2024_C': np.round(lst, 3),
+            'NDVI_Max_2024': np.round(rng.uniform(0.1, 0.95, n), 4),
+            'TARGET': (lst + rng.normal(0, 2, n) > 35).astype(int),
+        }).to_csv(path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+
+
+def run_child(mode, csv_path, chunksize):
+    from stream_training import build_training_store, peak_rss_mib
+
+    t0 = time.perf_counter()
+    if mode == 'utuh':
+        from fire_features import feature_frame
+        df = pd.read_csv(csv_path)
+        X = feature_frame(df).to_numpy()
+        rows = len(X)
+    else:
+        store = build_training_store(csv_path, csv_path + ".store", chunksize=chunksize)
+        X = store.X
+        rows = store.rows
+    print(json.dumps({'rows': rows, 'seconds': time.perf_counter() - t0,
+                      'peak_mib': peak_rss_mib(), 'checksum': float(np.asarray(X[:, 1], dtype=np.float64).sum())}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'CSV'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'riwayat.csv')
+        t0 = time.perf_counter()
+        synthetic_csv(path, args.rows)
+        print(f"CSV sintetis {args.rows:,} baris ({os.path.getsize(path) / 2**20:.0f} MiB) "
+              f"dibuat dalam {time.perf_counter() - t0:.1f}s")
+        print(f"{'mode':<10} {'baris':>11} {'waktu':>9} {'RSS puncak':>12}")
+        checks = []
+        for mode in ('utuh', 'streaming'):
+            out = subprocess.run([sys.executable, __file__, '--child', mode, path, '--chunksize', str(args.chunksize)],
+                                 capture_output=True, text=True, check=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            checks.append(r['checksum'])
+            print(f"{mode:<10} {r['rows']:>11,} {r['seconds']:>8.1f}s {r['peak_mib']:>10.0f}MiB")
+        print(f"fitur konsisten (float32 vs float64): {'YA' if np.isclose(checks[0], checks[1], rtol=1e-5) else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
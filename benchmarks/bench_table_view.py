@@ -0,0 +1,114 @@
+"""
+Benchmark tabel desa: sort per rerun vs permutasi yang dihitung sekali per versi data.
+
+    lama  - tiap rerun: df.copy() -> sort_values -> salinan terurut disimpan di
+            session_state (untuk lookup klik) -> reset_index -> subset kolom
+    baru  - table_view.SortIndex dibangun sekali per versi data (dibagi antar
+            sesi); tiap rerun hanya `take(permutasi)` kolom tampilan, sesi
+            menyimpan TableView (versi, kolom, arah)
+
+Dilaporkan latensi per rerun (median/maks untuk tiap kombinasi urutan + lookup
+baris yang diklik), biaya bangun SortIndex, dan memori yang ditahan per sesi.
+Frame sintetis memuat kolom geometri shapely seperti frame dashboard.
+
+Jalankan:  python benchmarks/bench_table_view.py --villages 2000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table_view import SORT_KEYS, TABLE_COLUMNS, SortIndex, TableView
+
+
+def synthetic_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lon, lat = rng.uniform(100, 104, n), rng.uniform(-1, 2.5, n)
+    geoms = shapely.buffer(shapely.points(lon, lat), rng.uniform(0.005, 0.03, n), quad_segs=16)
+    prob = rng.uniform(0, 100, n)
+    return pd.DataFrame({
+        'nama_desa': [f"DESA {i:05d}" for i in rng.permutation(n)],
+        'kabupaten': rng.choice(["KAMPAR", "SIAK", "PELALAWAN", "BENGKALIS", "ROKAN HILIR"], n),
+        'lon': lon, 'lat': lat,
+        'LST': rng.normal(33, 3, n), 'NDVI': rng.uniform(0.1, 0.9, n), 'Rain': rng.gamma(1.2, 80, n),
+        'prob_pct': prob,
+        'hotspot': rng.poisson(2, n).astype(np.int32),
+        'level': np.where(prob >= 70, "TINGGI", np.where(prob >= 40, "SEDANG", "RENDAH")),
+        'status_kekeringan': rng.choice(["Normal", "Waspada", "Kering"], n),
+        'geometry': geoms,
+    }, index=pd.RangeIndex(n) * 3)
+
+
+def old_rerun(df, column, ascending, session, click):
+    # kind='stable' agar urutan baris bernilai sama bisa dibandingkan dengan SortIndex (argsort stabil)
+    df_sorted = df.copy().sort_values(by=column, ascending=ascending, kind='stable')
+    session['df_sorted_display'] = df_sorted
+    table = df_sorted.reset_index(drop=True)[TABLE_COLUMNS]
+    return table, session['df_sorted_display'].iloc[click].name
+
+
+def new_rerun(df, sort_index, column, ascending, session, click):
+    session['table_view'] = TableView("v1", column, ascending)
+    table = sort_index.rows(column, ascending)
+    view = session['table_view']
+    return table, sort_index.village_at(view.column, view.ascending, click)
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return out, np.median(times) * 1000, np.max(times) * 1000
+
+
+def session_bytes(session):
+    total = 0
+    for value in session.values():
+        if isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(deep=True).sum())
+        else:
+            total += sys.getsizeof(value) + sum(sys.getsizeof(v) for v in vars(value).values())
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.villages)
+    t0 = time.perf_counter()
+    sort_index = SortIndex(df)
+    build = (time.perf_counter() - t0) * 1000
+    print(f"{args.villages:,} desa. SortIndex dibangun dalam {build:.1f} ms, "
+          f"permutasi {sort_index.nbytes / 1024:.1f} KiB (sekali per versi data, dibagi antar sesi)")
+
+    click = args.villages // 2
+    print(f"\n{'urutan':<36} {'lama median':>12} {'lama maks':>10} {'baru median':>12} {'baru maks':>10}")
+    old_session, new_session = {}, {}
+    for label, column in SORT_KEYS.items():
+        for ascending in (True, False):
+            (old_table, old_id), old_med, old_max = timed(
+                lambda: old_rerun(df, column, ascending, old_session, click), args.repeat)
+            (new_table, new_id), new_med, new_max = timed(
+                lambda: new_rerun(df, sort_index, column, ascending, new_session, click), args.repeat)
+            # Urutan baris & ID desa yang diklik harus identik dengan jalur lama
+            assert np.array_equal(old_table.to_numpy(), new_table.to_numpy()) and old_id == new_id
+            name = f"{label} {'naik' if ascending else 'turun'}"
+            print(f"{name:<36} {old_med:>10.2f}ms {old_max:>8.2f}ms {new_med:>10.2f}ms {new_max:>8.2f}ms")
+
+    print(f"\nMemori per sesi: lama {session_bytes(old_session) / 2**20:.2f} MiB (salinan frame terurut), "
+          f"baru {session_bytes(new_session)} byte (TableView)")
+
+
+if __name__ == "__main__":
+    main()
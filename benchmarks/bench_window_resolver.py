@@ -0,0 +1,68 @@
+"""
+Benchmark: loop mundur per hari (lama) vs WindowResolver (satu query per dataset).
+
+Jalankan:  python benchmarks/bench_window_resolver.py --latency 0.15 --lst-gap 14
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from satellite_engine import DATASETS, WindowNotFoundError, WindowResolver
+
+
+def legacy_probe(spec, now):
+    """Replika loop lama di get_satellite_data_robust."""
+    for days_back in range(0, spec.lookback_days):
+        end = now - timedelta(days=days_back)
+        start = end - timedelta(days=spec.window_days)
+        count = ee.ImageCollection(spec.collection).filterDate(start, end).select(spec.band).size().getInfo()
+        if count > 0:
+            return start, end
+    return None
+
+
+def run(label, fn):
+    ee.reset_stats()
+    t0 = time.perf_counter()
+    try:
+        result = fn()
+    except WindowNotFoundError:
+        result = None
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<22} {elapsed * 1000:>9.1f} ms   {ee.STATS['getInfo']:>3} getInfo")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.15)
+    parser.add_argument('--lst-gap', type=int, default=14, help="Hari terakhir tanpa LST (awan)")
+    parser.add_argument('--chirps-delay', type=int, default=12)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    ee.configure(latency=args.latency, now=now, lst_gap_days=args.lst_gap,
+                 chirps_delay_days=args.chirps_delay)
+
+    print(f"Latensi {args.latency * 1000:.0f} ms | gap LST {args.lst_gap} hari | delay CHIRPS {args.chirps_delay} hari")
+    print("-" * 50)
+    for key, spec in DATASETS.items():
+        old = run(f"{key} lama", lambda: legacy_probe(spec, now))
+        resolver = WindowResolver(ee)
+        new = run(f"{key} resolver", lambda: resolver.resolve(spec, now))
+        run(f"{key} resolver (cache)", lambda: resolver.resolve(spec, now))
+        if new is None:
+            print(f"{'':<22} tidak ditemukan (lama: {'tidak ditemukan' if old is None else 'ditemukan'})")
+            continue
+        same = old is not None and (old[0], old[1]) == (new.start, new.end)
+        print(f"{'':<22} jendela sama: {'YA' if same else 'TIDAK'} ({new.start:%d-%b} s/d {new.end:%d-%b})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark mode sampling satelit: titik centroid vs statistik zonal poligon.
+
+Poligon desa sintetis (lingkaran besar/kecil + desa cekung berbentuk sabit
+yang centroidnya jatuh di luar poligon) diekstrak dengan `ee` palsu pada tiap
+mode di satellite_snapshot.SAMPLING_MODES. Dilaporkan biaya (request, vertex,
+payload JSON, detik) dan selisih nilai terhadap centroid, termasuk berapa desa
+yang nilai zonal LST-nya > +2 °C dari nilai centroid (hotspot yang terlewat
+sampling titik, terutama untuk statistik max/p90).
+
+Jalankan:  python benchmarks/bench_zonal.py --villages 2000 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_ee as ee
+from extraction_cache import ExtractionCache
+from satellite_engine import WindowResolver
+from satellite_snapshot import SAMPLING_CENTROID, SAMPLING_MODES, build_snapshot, prepare_zonal
+
+
+def synthetic_villages(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cx, cy = rng.uniform(100, 104, n), rng.uniform(-1, 2.5, n)
+    radius = np.where(rng.random(n) < 0.1, rng.uniform(0.05, 0.12, n), rng.uniform(0.005, 0.03, n))
+    geoms = shapely.buffer(shapely.points(cx, cy), radius, quad_segs=64)
+    # 10% desa cekung (sabit): centroid berada di luar poligon
+    concave = rng.random(n) < 0.1
+    bite = shapely.buffer(shapely.points(cx + radius * 0.4, cy), radius * 0.9, quad_segs=64)
+    geoms = np.where(concave, shapely.difference(geoms, bite), geoms)
+    centroid = shapely.centroid(geoms)
+    return pd.DataFrame({'lon': shapely.get_x(centroid), 'lat': shapely.get_y(centroid), 'geometry': geoms})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--villages', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--zonal-chunk', type=int, default=100)
+    parser.add_argument('--max-vertices', type=int, default=50_000)
+    args = parser.parse_args()
+
+    ee.configure(latency=args.latency, json_payload=True)
+    villages = synthetic_villages(args.villages)
+    outside = ~shapely.contains(villages['geometry'].to_numpy(), shapely.points(villages['lon'], villages['lat']))
+
+    t0 = time.perf_counter()
+    zonal = prepare_zonal(villages['geometry'].to_numpy())
+    print(f"{args.villages:,} desa ({outside.sum()} centroid di luar poligon). Simplifikasi: "
+          f"{zonal.source_vertices:,} -> {int(zonal.vertex_counts.sum()):,} vertex "
+          f"dalam {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    snapshots = {}
+    print(f"\n{'mode':<12} {'request':>8} {'vertex':>9} {'payload':>10} {'waktu':>8} "
+          f"{'LST rata2':>10} {'NaN':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in SAMPLING_MODES:
+            ee.reset_stats()
+            snapshot = build_snapshot(ee, WindowResolver(ee), ExtractionCache(tmp), villages[['lon', 'lat']],
+                                      "bench", now=datetime.utcnow(), max_workers=args.workers, mode=mode,
+                                      zonal=zonal, zonal_chunk_size=args.zonal_chunk,
+                                      max_vertices=args.max_vertices)
+            snapshots[mode] = snapshot.frame
+            cost = snapshot.cost
+            print(f"{mode:<12} {cost['requests']:>8} {cost['vertices']:>9,} "
+                  f"{ee.STATS['bytes'] / 2**20:>7.2f}MiB {cost['seconds']:>7.2f}s "
+                  f"{snapshot.frame['LST'].mean():>10.2f} {snapshot.frame['LST'].isna().sum():>5}")
+
+    base = snapshots[SAMPLING_CENTROID]
+    print(f"\n{'mode':<12} {'|dLST| rata2':>13} {'> centroid+2°C':>15} {'|dNDVI| rata2':>14}")
+    for mode, frame in snapshots.items():
+        if mode == SAMPLING_CENTROID:
+            continue
+        d_lst = frame['LST'] - base['LST']
+        print(f"{mode:<12} {d_lst.abs().mean():>12.2f}° {(d_lst > 2).sum():>15} "
+              f"{(frame['NDVI'] - base['NDVI']).abs().mean():>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Modul `ee` palsu untuk benchmark offline engine satelit.
+
+Meniru sebagian kecil API earthengine-api yang dipakai RFCC. Objek bersifat
+lazy seperti GEE asli: hanya `getInfo()` yang dihitung sebagai round trip dan
+diberi latensi buatan.
+
+Pemakaian:
+    import fake_ee as ee
+    ee.configure(latency=0.2, lst_gap_days=6)
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+DAY = timedelta(days=1)
+_EPOCH = datetime(1970, 1, 1)
+_MOD13Q1_START = datetime(2000, 2, 18)
+
+CONFIG = {
+    'latency': 0.0,          # Detik per getInfo()
+    'latency_by_collection': {},  # Override latensi per ID koleksi
+    'now': None,             # Acuan "sekarang" untuk jadwal akuisisi (None = datetime.now)
+    'lst_gap_days': 0,       # Hari terakhir tanpa LST (simulasi awan)
+    'chirps_delay_days': 5,  # Delay rilis CHIRPS
+    'failure_rate': 0.0,     # Peluang getInfo() reduceRegions gagal (timeout buatan)
+    'max_features': 5000,    # Batas fitur per reduceRegions (meniru batas payload GEE)
+    'cloud_rate': 0.1,       # Proporsi titik tanpa LST (terisi nilai unmask)
+    'json_payload': False,   # Serialisasi + parse JSON tiap getInfo() (ukuran payload di STATS['bytes'])
+    'max_vertices': 200_000, # Batas vertex geometri per request (meniru batas ukuran request GEE)
+    'max_pixels': 256,       # Maks. piksel tiruan per poligon saat reduksi zonal
+    'bandwidth': 0,          # Byte/detik unduhan payload JSON (0 = tanpa batas)
+    'seed': 42,
+}
+
+STATS = {'getInfo': 0, 'reduceRegions': 0, 'failures': 0, 'bytes': 0, 'server_seconds': 0.0}
+# Jumlah reduceRegions per nama band (mis. 'NDVI_RAW'), untuk memeriksa band mana yang diekstrak ulang
+BAND_REDUCTIONS = {}
+_lock = threading.Lock()
+
+
+def configure(**kwargs):
+    unknown = set(kwargs) - set(CONFIG)
+    if unknown:
+        raise KeyError(f"Opsi fake_ee tidak dikenal: {sorted(unknown)}")
+    CONFIG.update(kwargs)
+
+
+def reset_stats():
+    with _lock:
+        for k in STATS:
+            STATS[k] = 0
+        BAND_REDUCTIONS.clear()
+
+
+def Initialize(*args, **kwargs):
+    return None
+
+
+class EEException(Exception):
+    pass
+
+
+def _now():
+    return CONFIG['now'] or datetime.utcnow()
+
+
+def _rng(*key):
+    return random.Random(zlib.crc32(repr((CONFIG['seed'],) + key).encode()))
+
+
+def _raw_value(collection_id, idx):
+    """Nilai mentah tiruan per desa, deterministik terhadap idx."""
+    rng = _rng(collection_id, idx)
+    if collection_id == 'MODIS/061/MOD11A1':
+        return None if rng.random() < CONFIG['cloud_rate'] else rng.uniform(14800, 15700)
+    if collection_id == 'MODIS/061/MOD13Q1':
+        return rng.uniform(2000, 8800)
+    if collection_id == 'UCSB-CHG/CHIRPS/DAILY':
+        return rng.uniform(0, 400)
+    return rng.random()
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value.tzinfo else value
+    if isinstance(value, (int, float)):
+        return _EPOCH + timedelta(milliseconds=value)
+    return datetime.fromisoformat(str(value))
+
+
+def _to_ms(dt):
+    return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _acquisitions(collection_id, start, end):
+    """Jadwal akuisisi sintetis per koleksi, dipotong ke [start, end)."""
+    now = _now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if collection_id == 'MODIS/061/MOD13Q1':
+        offset = (start - _MOD13Q1_START).days // 16
+        day = _MOD13Q1_START + timedelta(days=16 * max(offset, 0))
+        step = timedelta(days=16)
+        last = now - timedelta(days=8)   # Komposit 16 hari dirilis setelah ~8 hari
+    else:
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        step = DAY
+        if collection_id == 'UCSB-CHG/CHIRPS/DAILY':
+            last = now - timedelta(days=CONFIG['chirps_delay_days'])
+        else:
+            last = now - timedelta(days=1 + CONFIG['lst_gap_days'])
+
+    dates = []
+    while day < end:
+        if day >= start and day <= last:
+            dates.append(day)
+        day += step
+    return dates
+
+
+# ==============================================================================
+# OBJEK LAZY
+# ==============================================================================
+class ComputedObject:
+    def __init__(self, fn, tag=None):
+        self._fn = fn
+        self._tag = tag
+
+    def getInfo(self):
+        with _lock:
+            STATS['getInfo'] += 1
+        latency = CONFIG['latency_by_collection'].get(self._tag, CONFIG['latency'])
+        if latency:
+            time.sleep(latency)
+        t0 = time.perf_counter()
+        result = self._fn()
+        if CONFIG['json_payload']:
+            # Seperti klien asli: respons diterima sebagai teks JSON lalu di-parse
+            text = json.dumps(result)
+            with _lock:
+                STATS['bytes'] += len(text)
+                STATS['server_seconds'] += time.perf_counter() - t0
+            if CONFIG['bandwidth']:
+                time.sleep(len(text) / CONFIG['bandwidth'])
+            result = json.loads(text)
+        else:
+            with _lock:
+                STATS['server_seconds'] += time.perf_counter() - t0
+        return result
+
+
+class ImageCollection(ComputedObject):
+    def __init__(self, collection_id, _start=None, _end=None, _band=None):
+        self.id = collection_id
+        self._start = _start or datetime(2000, 1, 1)
+        self._end = _end or _now() + DAY
+        self._band = _band
+        super().__init__(lambda: [{'id': self.id, 'time': _to_ms(d)} for d in self._dates()], collection_id)
+
+    def _dates(self):
+        return _acquisitions(self.id, self._start, self._end)
+
+    def filterDate(self, start, end=None):
+        start = max(_to_datetime(start), self._start)
+        end = min(_to_datetime(end), self._end) if end is not None else self._end
+        return ImageCollection(self.id, start, end, self._band)
+
+    def select(self, band):
+        return ImageCollection(self.id, self._start, self._end, band)
+
+    def size(self):
+        return ComputedObject(lambda: len(self._dates()), self.id)
+
+    def aggregate_max(self, prop):
+        def _max():
+            dates = self._dates()
+            return _to_ms(max(dates)) if dates else None
+        return ComputedObject(_max, self.id)
+
+    def mean(self):
+        return Image({self._band or self.id: self.id})
+
+    def sum(self):
+        return Image({self._band or self.id: self.id})
+
+
+class Image(ComputedObject):
+    """
+    Image sintetis: peta nama band -> (ID koleksi asal, operasi per piksel).
+    Operasi `f(nilai, idx)` dijalankan berurutan; None = piksel ter-mask.
+    """
+
+    def __init__(self, bands):
+        self._bands = {name: (src, ()) if isinstance(src, str) else src for name, src in bands.items()}
+        super().__init__(lambda: {'bands': [{'id': b} for b in self._bands]})
+
+    def _value(self, band, idx):
+        source, ops = self._bands[band]
+        value = _raw_value(source, idx)
+        for op in ops:
+            value = op(value, idx)
+        return value
+
+    def _map(self, op):
+        return Image({name: (src, ops + (op,)) for name, (src, ops) in self._bands.items()})
+
+    def _arith(self, fn):
+        return self._map(lambda v, i: None if v is None else fn(v))
+
+    def rename(self, *names):
+        if len(names) == 1 and isinstance(names[0], (list, tuple)):
+            names = names[0]
+        return Image(dict(zip(names, self._bands.values())))
+
+    def addBands(self, other):
+        merged = dict(self._bands)
+        merged.update(other._bands)
+        return Image(merged)
+
+    def multiply(self, value):
+        return self._arith(lambda v: v * value)
+
+    def add(self, value):
+        return self._arith(lambda v: v + value)
+
+    def subtract(self, value):
+        return self._arith(lambda v: v - value)
+
+    def clamp(self, low, high):
+        return self._arith(lambda v: min(max(v, low), high))
+
+    def gt(self, value):
+        return self._arith(lambda v: int(v > value))
+
+    def neq(self, value):
+        return self._arith(lambda v: int(v != value))
+
+    def updateMask(self, mask):
+        band = next(iter(mask._bands))
+        return self._map(lambda v, i: v if v is not None and mask._value(band, i) else None)
+
+    def unmask(self, value=0):
+        return self._map(lambda v, i: value if v is None else v)
+
+    def reduceRegions(self, collection, reducer=None, scale=None, tileScale=1, **kwargs):
+        reducer = reducer or Reducer('first')
+
+        def _reduce():
+            if len(collection.features) > CONFIG['max_features']:
+                raise EEException("Computation timed out. (payload terlalu besar)")
+            vertices = sum(_num_vertices(f.geometry.geojson) for f in collection.features)
+            if vertices > CONFIG['max_vertices']:
+                raise EEException("Request payload size exceeds the limit.")
+            if CONFIG['failure_rate'] and random.random() < CONFIG['failure_rate']:
+                with _lock:
+                    STATS['failures'] += 1
+                raise EEException("Computation timed out.")
+            features = []
+            for f in collection.features:
+                props = dict(f.properties)
+                idx = props.get('idx')
+                geojson = f.geometry.geojson
+                if geojson['type'] == 'Point':
+                    keys = [idx]
+                else:
+                    # Piksel di dalam poligon: jumlah mengikuti luas / scale^2 (dibatasi)
+                    pixels = _area_m2(geojson) / float(scale or 1000) ** 2
+                    keys = [(idx, k) for k in range(int(min(max(round(pixels), 1), CONFIG['max_pixels'])))]
+                for band in self._bands:
+                    values = [v for v in (self._value(band, key) for key in keys) if v is not None]
+                    if values:
+                        props.update(reducer.apply(band, values))
+                features.append({'type': 'Feature', 'geometry': geojson,
+                                 'id': f"{idx:020x}", 'properties': props})
+            return {'type': 'FeatureCollection', 'features': features}
+
+        with _lock:
+            STATS['reduceRegions'] += 1
+            for band in self._bands:
+                BAND_REDUCTIONS[band] = BAND_REDUCTIONS.get(band, 0) + 1
+        return FeatureCollection(_fn=_reduce)
+
+
+def _rings(geojson):
+    if geojson['type'] == 'Polygon':
+        return [geojson['coordinates']]
+    if geojson['type'] == 'MultiPolygon':
+        return geojson['coordinates']
+    return []
+
+
+def _num_vertices(geojson):
+    if geojson['type'] == 'Point':
+        return 1
+    return sum(len(ring) for poly in _rings(geojson) for ring in poly)
+
+
+def _area_m2(geojson):
+    """Luas ring luar (shoelace) dalam m2, pendekatan ekuator."""
+    total = 0.0
+    for poly in _rings(geojson):
+        xy = poly[0]
+        total += abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(xy, xy[1:] + xy[:1]))) / 2
+    return total * 111_320.0 ** 2
+
+
+class _Geometry:
+    def __init__(self, geojson):
+        self.geojson = geojson
+
+    @staticmethod
+    def Point(coords):
+        return _Geometry({'type': 'Point', 'coordinates': list(coords)})
+
+
+Geometry = _Geometry
+
+
+class Feature:
+    def __init__(self, geometry, properties=None):
+        self.geometry = geometry
+        self.properties = dict(properties or {})
+
+
+class FeatureCollection(ComputedObject):
+    def __init__(self, features=None, _fn=None):
+        self.features = list(features or [])
+        super().__init__(_fn or (lambda: {'type': 'FeatureCollection', 'features': [
+            {'type': 'Feature', 'geometry': f.geometry.geojson, 'properties': f.properties}
+            for f in self.features
+        ]}))
+
+    def select(self, propertySelectors, newProperties=None, retainGeometry=True):
+        """Selektor berupa nama/regex (fullmatch), seperti GEE."""
+        patterns = [re.compile(sel) for sel in propertySelectors]
+
+        def _select():
+            features = []
+            for f in self._fn()['features']:
+                props = {k: v for k, v in f['properties'].items() if any(p.fullmatch(k) for p in patterns)}
+                features.append({'type': 'Feature', 'geometry': f['geometry'] if retainGeometry else None,
+                                 'id': f.get('id'), 'properties': props})
+            return {'type': 'FeatureCollection', 'features': features}
+        return FeatureCollection(_fn=_select)
+
+    def reduceColumns(self, reducer, selectors):
+        """Hanya toList().repeat(n): fitur dengan properti kosong dilewati (seperti GEE)."""
+        def _columns():
+            rows = [f['properties'] for f in self._fn()['features']]
+            rows = [r for r in rows if all(r.get(s) is not None for s in selectors)]
+            return {'list': [[r[s] for r in rows] for s in selectors]}
+        return ComputedObject(_columns)
+
+
+class Reducer:
+    def __init__(self, name, percentiles=()):
+        self.name = name
+        self.percentiles = list(percentiles)
+
+    @staticmethod
+    def first():
+        return Reducer('first')
+
+    @staticmethod
+    def mean():
+        return Reducer('mean')
+
+    @staticmethod
+    def max():
+        return Reducer('max')
+
+    @staticmethod
+    def percentile(percentiles):
+        return Reducer('percentile', percentiles)
+
+    @staticmethod
+    def toList():
+        return Reducer('toList')
+
+    def repeat(self, count):
+        return Reducer(f"{self.name}x{count}")
+
+    def apply(self, band, values):
+        """Keluaran reduceRegions untuk satu band: satu keluaran -> nama band, persentil -> band_pNN."""
+        if self.name == 'first':
+            return {band: values[0]}
+        if self.name == 'mean':
+            return {band: sum(values) / len(values)}
+        if self.name == 'max':
+            return {band: max(values)}
+        if self.name == 'percentile':
+            ordered = sorted(values)
+            out = {}
+            for p in self.percentiles:
+                pos = (len(ordered) - 1) * p / 100
+                lo = int(pos)
+                hi = min(lo + 1, len(ordered) - 1)
+                out[f"{band}_p{p}"] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+            return out
+        raise EEException(f"Reducer {self.name} tidak didukung fake_ee")
@@ -0,0 +1,41 @@
+"""
+BUILD INDEKS TETANGGA MODEL KNN
+Konversi model Pipeline(StandardScaler, KNN) ter-pickle menjadi indeks
+tetangga .npz (knn_index.py) yang dimuat dashboard tanpa unpickle scikit-learn.
+
+Pemakaian:
+    python build_knn_index.py
+    python build_knn_index.py --backend ivf --n-probe 8 --out models/initial_model.npz
+"""
+import argparse
+import os
+import time
+import warnings
+
+import joblib
+
+from knn_index import BACKENDS, KNNIndexModel
+
+parser = argparse.ArgumentParser(description="Bangun indeks tetangga .npz dari model KNN ter-pickle")
+parser.add_argument('--model', default=os.path.join("models", "initial_model.pkl"), help="Pickle Pipeline KNN")
+parser.add_argument('--out', default=os.path.join("models", "initial_model.npz"), help="File indeks keluaran")
+parser.add_argument('--backend', default='kd_tree', choices=BACKENDS)
+parser.add_argument('--n-lists', type=int, default=None, help="Jumlah kelompok IVF (default sqrt(n))")
+parser.add_argument('--n-probe', type=int, default=4, help="Kelompok IVF yang diperiksa per query")
+args = parser.parse_args()
+
+if not os.path.exists(args.model):
+    print(f"❌ Model tidak ditemukan: {args.model}")
+    exit(1)
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore')   # InconsistentVersionWarning antar versi scikit-learn
+    pipeline = joblib.load(args.model)
+
+t0 = time.perf_counter()
+index = KNNIndexModel.from_pipeline(pipeline, backend=args.backend,
+                                    n_lists=args.n_lists, n_probe=args.n_probe)
+index.save(args.out)
+print(f"✅ Indeks {args.backend} ({index.n_samples_fit_} titik latih) disimpan ke {args.out} "
+      f"({os.path.getsize(args.out) / 1024:.0f} KB, pickle {os.path.getsize(args.model) / 1024:.0f} KB) "
+      f"dalam {time.perf_counter() - t0:.1f} detik")
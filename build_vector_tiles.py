@@ -0,0 +1,37 @@
+"""
+BUILD VECTOR TILE DESA (MBTiles)
+Pra-render layer desa dari store GeoParquet menjadi Mapbox Vector Tile untuk
+mode MVT dashboard. Jalankan ulang hanya jika layer desa berubah.
+
+Pemakaian:
+    python build_vector_tiles.py
+    python build_vector_tiles.py --store desa1_riau.parquet --out desa1_riau.mbtiles --maxzoom 13
+"""
+import argparse
+import os
+import time
+
+from vector_tiles import build_mbtiles
+from village_layer import read_village_store
+
+parser = argparse.ArgumentParser(description="Bangun MBTiles vector tile layer desa")
+parser.add_argument('--store', default="desa1_riau.parquet", help="Store GeoParquet (build_village_store.py)")
+parser.add_argument('--out', default="desa1_riau.mbtiles", help="File MBTiles keluaran")
+parser.add_argument('--minzoom', type=int, default=6)
+parser.add_argument('--maxzoom', type=int, default=12)
+args = parser.parse_args()
+
+if not os.path.exists(args.store):
+    print(f"❌ Store tidak ditemukan: {args.store} (jalankan build_village_store.py dulu)")
+    exit(1)
+
+df = read_village_store(args.store)
+print(f"🧩 Membangun vector tile untuk {len(df)} desa (zoom {args.minzoom}-{args.maxzoom})...")
+t0 = time.perf_counter()
+total = build_mbtiles(
+    df['geometry'].to_numpy(), df.index, args.out,
+    minzoom=args.minzoom, maxzoom=args.maxzoom,
+    progress=lambda z, n: print(f"   zoom {z:>2}: {n} tile")
+)
+print(f"✅ {total} tile disimpan ke {args.out} "
+      f"({os.path.getsize(args.out) / 2**20:.1f} MB) dalam {time.perf_counter() - t0:.1f} detik")
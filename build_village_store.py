@@ -0,0 +1,29 @@
+"""
+BUILD STORE GEOMETRI DESA
+Konversi sekali layer desa mentah (CSV berisi WKT) menjadi GeoParquet biner
+yang dibaca langsung oleh load_data di app.py.
+
+Pemakaian:
+    python build_village_store.py
+    python build_village_store.py --src desa1_riau.csv --out desa1_riau.parquet
+"""
+import argparse
+import os
+import time
+
+from village_layer import build_village_store
+
+parser = argparse.ArgumentParser(description="Bangun store GeoParquet layer desa")
+parser.add_argument('--src', default="desa1_riau.csv", help="CSV sumber dengan kolom WKT")
+parser.add_argument('--out', default="desa1_riau.parquet", help="File GeoParquet keluaran")
+args = parser.parse_args()
+
+if not os.path.exists(args.src):
+    print(f"❌ File sumber tidak ditemukan: {args.src}")
+    exit(1)
+
+print(f"📂 Membaca {args.src} ({os.path.getsize(args.src) / 2**20:.1f} MB)...")
+t0 = time.perf_counter()
+df = build_village_store(args.src, args.out)
+print(f"✅ {len(df)} desa disimpan ke {args.out} "
+      f"({os.path.getsize(args.out) / 2**20:.1f} MB) dalam {time.perf_counter() - t0:.1f} detik")
@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 import os
 import joblib
-import re
 import warnings
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.model_selection import train_test_split
@@ -10,6 +9,8 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import make_pipeline
 
+from fire_features import FEATURES, FORMULA_DIVIDE, feature_frame
+
 # Matikan warning agar terminal bersih
 warnings.filterwarnings('ignore')
 
@@ -34,18 +35,7 @@ except Exception as e:
     print(f"❌ File error: {e}")
     exit()
 
-# --- 3. CLEANING ---
-def clean_numeric(x):
-    if pd.isna(x): return 0.0
-    x = str(x).strip()
-    x = re.sub(r'[^0-9.]', '', x)
-    try: return float(x)
-    except: return 0.0
-
-for col in ['LST_Max_2024_C', 'Rain_Max_2024_mm', 'NDVI_Max_2024']:
-    if col in df.columns:
-        df[col] = df[col].apply(clean_numeric)
-
+# --- 3. TARGET (kolom fitur mentah dibersihkan di feature_frame, lihat fire_features.clean_numeric) ---
 if 'TARGET' in df.columns:
     df['TARGET'] = pd.to_numeric(df['TARGET'], errors='coerce').fillna(0).astype(int)
 else:
@@ -53,20 +43,9 @@ else:
     exit()
 
 # --- 4. PHYSICS FEATURES (DISESUAIKAN DENGAN TUNING ANDA: PEMBAGIAN) ---
-LST = df['LST_Max_2024_C']
-NDVI = df['NDVI_Max_2024']
-Rain_Log = np.log1p(df['Rain_Max_2024_mm'])
-EPS = 0.01
-
 # [PENTING] Menggunakan PEMBAGIAN (/) agar sama dengan hasil Tuning
-df['X1_Fuel_Dryness'] = (LST * (1 - NDVI)) / (Rain_Log + EPS) 
-df['X2_Thermal_Kinetic'] = LST ** 2
-df['X3_Hydro_Stress'] = LST / (Rain_Log + EPS)
-
-df = df.replace([np.inf, -np.inf], 0).fillna(0)
-
-features = ['X1_Fuel_Dryness', 'X2_Thermal_Kinetic', 'X3_Hydro_Stress']
-X = df[features]
+X = feature_frame(df, FORMULA_DIVIDE)
+features = FEATURES
 y = df['TARGET']
 
 # --- 5. SPLIT DATA ---
@@ -100,5 +79,7 @@ print(f"Akurasi  : {res['Akurasi']:.4f}")
 print("-" * 50)
 
 # --- 8. SIMPAN MODEL ---
+# Rumus fitur ikut disimpan agar risk_engine.model_score memakai rumus yang sama
+knn_model.feature_formula = FORMULA_DIVIDE
 joblib.dump(knn_model, FILE_MODEL_OUTPUT)
 print(f"✅ MODEL VALID DISIMPAN KE: {FILE_MODEL_OUTPUT}")
\ No newline at end of file
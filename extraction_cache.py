@@ -0,0 +1,158 @@
+"""
+CACHE EKSTRAKSI SATELIT (DISK)
+Hasil LST/NDVI/Rain per desa disimpan sebagai Parquet dan dibagi ke semua sesi.
+
+Kunci cache = jendela data tiap dataset (tanggal + akuisisi terbaru) + hash
+file geometri desa. Selama MODIS/CHIRPS belum rilis data baru dan layer desa
+tidak berubah, sesi baru cukup membaca file lokal tanpa memanggil Earth Engine.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rfcc_cache")
+# Jumlah lock tetap (kunci di-hash ke salah satunya), jadi memori tidak tumbuh per kunci
+LOCK_STRIPES = 64
+# File sementara lebih tua dari ini dianggap sisa proses yang mati saat menulis
+STALE_TMP_SECONDS = 3600
+
+
+# ==============================================================================
+# 1. KUNCI CACHE
+# ==============================================================================
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+
+def file_fingerprint(path):
+    """SHA-1 isi file, di-memo per (path, ukuran, mtime) agar tidak dihitung ulang tiap sesi."""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _fingerprint_lock:
+        if memo_key in _fingerprints:
+            return _fingerprints[memo_key]
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+
+    with _fingerprint_lock:
+        _fingerprints[memo_key] = value
+    return value
+
+
+def make_key(windows, geometry_hash, extra=""):
+    """
+    Kunci dari jendela data (dict key -> DataWindow) dan hash geometri desa.
+
+    Jam pada `end` diabaikan: dua sesi di hari yang sama dengan akuisisi
+    terbaru yang sama menghasilkan kunci yang sama.
+    """
+    parts = [geometry_hash, extra]
+    for key in sorted(windows):
+        win = windows[key]
+        parts.append(f"{key}:{win.start.date()}:{win.end.date()}:{win.latest.isoformat()}")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+# ==============================================================================
+# 2. CACHE PARQUET DENGAN TTL & BATAS UKURAN
+# ==============================================================================
+class ExtractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=6 * 3600,
+                 max_bytes=256 * 2**20, clock=time.time):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def lock(self, key):
+        """
+        Lock per kunci (bergaris): sesi bersamaan menunggu satu ekstraksi, bukan
+        menarik ulang. Kunci berbeda bisa berbagi lock; jangan dipegang bertingkat.
+        """
+        stripe = int(hashlib.sha1(key.encode()).hexdigest()[:8], 16) % len(self._locks)
+        return self._locks[stripe]
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            age = self.clock() - os.path.getmtime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        if age > self.ttl_seconds:
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            df = pd.read_parquet(path)
+        except Exception:
+            # File rusak (mis. proses mati saat menulis versi lama) -> anggap miss
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return df
+
+    def put(self, key, df):
+        # Tulis ke file sementara lalu os.replace -> pembaca tidak pernah melihat file setengah jadi
+        tmp = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Hapus entri kedaluwarsa & file sementara basi, lalu entri tertua sampai total <= max_bytes."""
+        now = self.clock()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            is_tmp = name.startswith(".") and name.endswith(".tmp")
+            if not (is_tmp or name.endswith(".parquet")):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if is_tmp:
+                # Sisa put() yang terputus (crash); file yang masih ditulis proses lain masih baru
+                if now - st.st_mtime > STALE_TMP_SECONDS:
+                    self._remove(path)
+            elif now - st.st_mtime > self.ttl_seconds:
+                self._remove(path)
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Hapus semua entri & file sementara cache (subdirektori seperti snapshots/ tidak disentuh)."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".parquet") or (name.startswith(".") and name.endswith(".tmp")):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,108 @@
+"""
+FITUR FISIKA MODEL KEBAKARAN
+Satu sumber fitur untuk training (models/MODEL.py, emergency_model.py) dan
+dashboard: pembersihan kolom numerik mentah + fitur X1/X2/X3 dari LST, NDVI
+dan curah hujan, semuanya vektor (tanpa .apply per sel).
+
+Dua varian rumus, sesuai skrip training masing-masing:
+    kali (models/MODEL.py -> models/initial_model.pkl)
+        X1 = LST * (1 - NDVI) * (log1p(Rain) + EPS)
+        X3 = LST * (log1p(Rain) + EPS)
+    bagi (emergency_model.py, hasil tuning)
+        X1 = LST * (1 - NDVI) / (log1p(Rain) + EPS)
+        X3 = LST / (log1p(Rain) + EPS)
+    X2 = LST ** 2 untuk keduanya.
+"""
+import numpy as np
+import pandas as pd
+
+FEATURES = ['X1_Fuel_Dryness', 'X2_Thermal_Kinetic', 'X3_Hydro_Stress']
+RAW_COLUMNS = ['LST_Max_2024_C', 'Rain_Max_2024_mm', 'NDVI_Max_2024']
+EPS = 0.01
+
+FORMULA_MULTIPLY = "kali"
+FORMULA_DIVIDE = "bagi"
+FORMULAS = (FORMULA_MULTIPLY, FORMULA_DIVIDE)
+
+# Versi kode fitur (clean_numeric / physics_features): naikkan jika hasilnya
+# berubah agar cache fitur tune_knn ikut dibatalkan.
+FEATURES_VERSION = 2
+
+# Teks yang lolos float() setelah regex: "12", "12.", "12.5", ".5"
+_FLOAT_TEXT = r"[0-9]+\.?[0-9]*|\.[0-9]+"
+# str(float) memakai notasi eksponen untuk |x| < 1e-4 atau |x| >= 1e16
+_REPR_EXP_MIN, _REPR_EXP_MAX = 1e-4, 1e16
+
+
+def clean_numeric(values):
+    """
+    Kolom mentah -> float64. Setara regex lama `[^0-9.]` per sel pada str(sel):
+    semua karakter selain angka & titik dibuang (termasuk tanda minus),
+    gagal/kosong -> 0.0.
+
+    Kolom teks diproses sekaligus oleh kernel string Arrow (regex RE2 di C).
+    Kolom yang sudah numerik cukup di-abs (tanda minus ikut terbuang), NaN/inf
+    -> 0.0; hanya sel yang str()-nya berbentuk eksponen (mis. 5e-05 -> "505")
+    yang lewat jalur teks agar hasilnya tetap sama dengan regex lama.
+    """
+    s = pd.Series(values, copy=False)
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        raw = s.to_numpy(dtype=np.float64)
+        magnitude = np.abs(raw)
+        out = np.where(np.isfinite(raw), magnitude, 0.0)
+        exponent = np.isfinite(raw) & (raw != 0) & ((magnitude < _REPR_EXP_MIN) | (magnitude >= _REPR_EXP_MAX))
+        if exponent.any():
+            out[exponent] = clean_numeric(np.array([str(float(v)) for v in raw[exponent]], dtype=object))
+        return out
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        text = pa.array(s.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    except (ImportError, TypeError, ValueError):
+        # Tanpa pyarrow / sel campuran non-teks: operasi string pandas
+        stripped = s.astype(str).str.replace(r'[^0-9.]', '', regex=True)
+        valid = stripped.str.fullmatch(_FLOAT_TEXT)
+        return np.where(valid, pd.to_numeric(stripped.where(valid), errors='coerce'), 0.0).astype(np.float64)
+
+    def parse(strings):
+        valid = pc.match_substring_regex(strings, f"^(?:{_FLOAT_TEXT})$")
+        numbers = pc.cast(pc.if_else(valid, strings, pa.scalar(None, pa.string())), pa.float64())
+        return valid, pc.fill_null(numbers, 0.0).to_numpy(zero_copy_only=False)
+
+    # Sel bersih langsung di-cast; regex pembersih hanya untuk sel kotor
+    clean, out = parse(text)
+    dirty = pc.indices_nonzero(pc.invert(clean)).to_numpy()
+    if len(dirty):
+        out = out.copy()
+        out[dirty] = parse(pc.replace_substring_regex(text.take(dirty), r'[^0-9.]', ''))[1]
+    return out
+
+
+def physics_features(lst, ndvi, rain, formula=FORMULA_MULTIPLY):
+    """Array LST (C), NDVI, Rain (mm) -> matriks fitur (n, 3) float64, inf/NaN -> 0."""
+    if formula not in FORMULAS:
+        raise ValueError(f"Rumus fitur tidak dikenal: {formula} (pilih {', '.join(FORMULAS)})")
+    lst = np.asarray(lst, dtype=np.float64)
+    ndvi = np.asarray(ndvi, dtype=np.float64)
+    rain_term = np.log1p(np.asarray(rain, dtype=np.float64)) + EPS
+
+    X = np.empty((lst.shape[0], 3), dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if formula == FORMULA_MULTIPLY:
+            X[:, 0] = (lst * (1 - ndvi)) * rain_term
+            X[:, 2] = lst * rain_term
+        else:
+            X[:, 0] = (lst * (1 - ndvi)) / rain_term
+            X[:, 2] = lst / rain_term
+    X[:, 1] = lst ** 2
+    X[~np.isfinite(X)] = 0.0
+    return X
+
+
+def feature_frame(df, formula=FORMULA_MULTIPLY):
+    """Frame training mentah (kolom RAW_COLUMNS) -> DataFrame fitur X1/X2/X3 (indeks sama)."""
+    lst = clean_numeric(df['LST_Max_2024_C'])
+    rain = clean_numeric(df['Rain_Max_2024_mm'])
+    ndvi = clean_numeric(df['NDVI_Max_2024'])
+    return pd.DataFrame(physics_features(lst, ndvi, rain, formula), columns=FEATURES, index=df.index)
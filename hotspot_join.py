@@ -0,0 +1,109 @@
+"""
+JOIN TITIK API (HOTSPOT FIRMS) KE DESA
+Titik deteksi api (CSV FIRMS MODIS/VIIRS, diunduh manual) dihitung per desa &
+per kabupaten dengan indeks spasial STRtree atas poligon desa.
+
+Alur per batch titik (semuanya fungsi array shapely 2.x, tanpa loop per titik):
+    1. buang titik di luar bbox seluruh layer desa (mask NumPy)
+    2. STRtree.query(points)          -> pasangan kandidat (titik, desa) via bbox
+    3. intersects_xy(poligon prepared) -> uji titik-dalam-poligon sebenarnya
+    4. titik di batas dua desa        -> dihitung sekali (desa dengan posisi terkecil)
+    5. bincount posisi desa           -> jumlah titik per desa
+
+Predikat langsung di STRtree.query menyiapkan (prepare) geometri input, yaitu
+titik; menguji ulang kandidat bbox dengan poligon desa yang sudah di-prepare
+sekali kira-kira 3x lebih cepat untuk jutaan titik.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Kolom CSV FIRMS (MODIS: confidence 0-100, VIIRS: l/n/h)
+FIRMS_COLUMNS = {'longitude': 'lon', 'latitude': 'lat', 'acq_date': 'acq_date', 'confidence': 'confidence'}
+# Kelas confidence "low" FIRMS: MODIS < 30, VIIRS 'l'
+MODIS_LOW_CONFIDENCE = 30
+QUERY_CHUNK = 1_000_000
+
+
+def read_firms_csv(path, drop_low_confidence=True):
+    """CSV FIRMS -> DataFrame lon, lat, acq_date, confidence (kolom opsional berisi None jika tidak ada)."""
+    import pyarrow.csv as pv
+
+    table = pv.read_csv(path, convert_options=pv.ConvertOptions(
+        include_columns=list(FIRMS_COLUMNS), include_missing_columns=True))
+    df = table.to_pandas().rename(columns=FIRMS_COLUMNS)
+
+    conf = df['confidence']
+    if drop_low_confidence and conf.notna().any():
+        if pd.api.types.is_numeric_dtype(conf):
+            df = df[~(conf < MODIS_LOW_CONFIDENCE)]
+        else:
+            df = df[conf.astype(str).str.strip().str.lower() != 'l']
+    return df.reset_index(drop=True)
+
+
+@dataclass
+class HotspotCounts:
+    village: pd.Series       # Jumlah titik per desa (indeks = ID desa, int32)
+    total: int               # Titik yang diproses
+    unmatched: int           # Titik di luar semua poligon desa
+    seconds: float
+
+    @property
+    def matched(self):
+        return self.total - self.unmatched
+
+    def by_kabupaten(self, kabupaten):
+        """Jumlah titik per kabupaten (urut turun); `kabupaten` berindeks ID desa."""
+        return self.village.groupby(kabupaten.reindex(self.village.index), observed=True).sum() \
+            .sort_values(ascending=False)
+
+
+class HotspotIndex:
+    """STRtree atas poligon desa (dibangun sekali per versi layer desa)."""
+
+    def __init__(self, geometries, index):
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.index = pd.Index(index)
+        self.tree = shapely.STRtree(self.geometries)
+        # Poligon di-prepare sekali: uji titik berikutnya tidak membangun ulang struktur tepi
+        shapely.prepare(self.geometries)
+        self.bounds = shapely.total_bounds(self.geometries)
+
+    def locate(self, lon, lat, chunk_size=QUERY_CHUNK):
+        """Posisi desa (0..n-1) untuk tiap titik, -1 jika di luar semua poligon."""
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        out = np.full(len(lon), -1, dtype=np.int64)
+
+        xmin, ymin, xmax, ymax = self.bounds
+        candidates = np.flatnonzero((lon >= xmin) & (lon <= xmax) & (lat >= ymin) & (lat <= ymax))
+        for start in range(0, len(candidates), chunk_size):
+            sel = candidates[start:start + chunk_size]
+            x, y = lon[sel], lat[sel]
+            point_pos, village_pos = self.tree.query(shapely.points(x, y))
+            hit = shapely.intersects_xy(self.geometries[village_pos], x[point_pos], y[point_pos])
+            point_pos, village_pos = point_pos[hit], village_pos[hit]
+
+            # Titik tepat di batas desa: satu desa saja (posisi terkecil) agar tidak dihitung ganda
+            order = np.lexsort((village_pos, point_pos))
+            point_pos, village_pos = point_pos[order], village_pos[order]
+            first = np.flatnonzero(np.r_[True, point_pos[1:] != point_pos[:-1]]) if len(point_pos) else point_pos
+            out[sel[point_pos[first]]] = village_pos[first]
+        return out
+
+    def count(self, lon, lat, chunk_size=QUERY_CHUNK):
+        """Jumlah titik per desa untuk satu batch titik."""
+        t0 = time.perf_counter()
+        pos = self.locate(lon, lat, chunk_size)
+        matched = pos[pos >= 0]
+        counts = np.bincount(matched, minlength=len(self.index)).astype(np.int32)
+        return HotspotCounts(
+            village=pd.Series(counts, index=self.index, name='hotspot'),
+            total=len(pos),
+            unmatched=int(len(pos) - len(matched)),
+            seconds=time.perf_counter() - t0,
+        )
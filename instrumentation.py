@@ -0,0 +1,254 @@
+"""
+INSTRUMENTASI HOT PATH DASHBOARD
+Span waktu & penghitung panggilan remote untuk tahap pipeline: load_data,
+getInfo / reduceRegions Earth Engine, calculate_risk, GeoJSON dan render pydeck.
+
+    with TRACER.span("calculate_risk"):     # durasi per tahap
+        ...
+    TRACER.count("ee_getinfo")               # penghitung round trip
+    with TRACER.rerun():                    # satu rerun Streamlit -> ringkasan per tahap
+        main()
+
+Keluaran (jika `directory` diisi saat configure):
+    <directory>/spans.jsonl - satu baris JSON per span dan per rerun
+    <directory>/rfcc.prom   - format teks Prometheus (textfile collector
+                              node_exporter), ditulis ulang atomik tiap akhir rerun
+
+Span yang berjalan di thread lain (worker ekstraksi, penjadwal latar belakang)
+tetap masuk total Prometheus & JSONL, tetapi tidak masuk ringkasan rerun.
+Penghitung pada ringkasan rerun adalah selisih penghitung proses selama rerun.
+
+Nonaktif (default): span()/rerun() mengembalikan context manager no-op bersama
+dan count() langsung kembali, jadi biayanya hanya satu cek atribut per panggilan.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+JSONL_FILE = "spans.jsonl"
+PROMETHEUS_FILE = "rfcc.prom"
+DEFAULT_HISTORY = 20
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'attrs', 'start')
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._finish_span(self.name, time.perf_counter() - self.start, self.attrs, exc_type)
+        return False
+
+
+@dataclass
+class RerunRecord:
+    id: str
+    started: float                               # epoch detik
+    seconds: float
+    spans: dict = field(default_factory=dict)    # nama span -> total detik di thread rerun
+    calls: dict = field(default_factory=dict)    # nama penghitung -> selisih selama rerun
+    exit: str = None                             # nama exception yang mengakhiri rerun (st.stop dll.)
+
+
+class _Rerun:
+    __slots__ = ('tracer', 'record', 'start', 'calls_start')
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __enter__(self):
+        self.record = RerunRecord(uuid.uuid4().hex[:8], time.time(), 0.0)
+        self.calls_start = self.tracer.calls()
+        self.tracer._local.rerun = self.record
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._local.rerun = None
+        self.record.seconds = time.perf_counter() - self.start
+        self.record.exit = exc_type.__name__ if exc_type else None
+        calls = self.tracer.calls()
+        self.record.calls = {k: v - self.calls_start.get(k, 0) for k, v in calls.items()
+                             if v != self.calls_start.get(k, 0)}
+        self.tracer._finish_rerun(self.record)
+        return False
+
+
+class Tracer:
+    def __init__(self, enabled=False, directory=None, history=DEFAULT_HISTORY):
+        self.enabled = enabled
+        self.directory = directory
+        self.reruns = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._span_seconds = defaultdict(float)
+        self._span_count = defaultdict(int)
+        self._calls = defaultdict(int)
+        self._reruns_total = 0
+        self._jsonl = None
+
+    def configure(self, enabled=None, directory=None, history=None):
+        with self._lock:
+            if directory is not None and directory != self.directory:
+                if self._jsonl is not None:
+                    self._jsonl.close()
+                    self._jsonl = None
+                self.directory = directory
+            if history is not None and history != self.reruns.maxlen:
+                self.reruns = deque(self.reruns, maxlen=history)
+            if enabled is not None:
+                self.enabled = enabled
+        return self
+
+    # ==============================================================================
+    # 1. SPAN & PENGHITUNG
+    # ==============================================================================
+    def span(self, name, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, attrs)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._calls[name] += n
+
+    def rerun(self):
+        if not self.enabled:
+            return _NOOP
+        return _Rerun(self)
+
+    def calls(self):
+        with self._lock:
+            return dict(self._calls)
+
+    def totals(self):
+        """Total per span sejak proses mulai: nama -> (jumlah, detik)."""
+        with self._lock:
+            return {name: (self._span_count[name], self._span_seconds[name]) for name in self._span_count}
+
+    def _finish_span(self, name, seconds, attrs, exc_type):
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is not None:
+            rerun.spans[name] = rerun.spans.get(name, 0.0) + seconds
+        with self._lock:
+            self._span_seconds[name] += seconds
+            self._span_count[name] += 1
+        if self.directory is None:
+            return
+        self._write({
+            "type": "span", "ts": round(time.time(), 3), "span": name, "seconds": round(seconds, 6),
+            "thread": threading.current_thread().name, "rerun": rerun.id if rerun is not None else None,
+            "error": exc_type.__name__ if exc_type else None, **attrs,
+        })
+
+    def _finish_rerun(self, record):
+        with self._lock:
+            self.reruns.append(record)
+            self._reruns_total += 1
+        self._write({
+            "type": "rerun", "ts": round(record.started, 3), "rerun": record.id,
+            "seconds": round(record.seconds, 6), "exit": record.exit,
+            "spans": {k: round(v, 6) for k, v in record.spans.items()}, "calls": record.calls,
+        })
+        self.write_prometheus()
+
+    # ==============================================================================
+    # 2. KELUARAN: JSON LINES & PROMETHEUS
+    # ==============================================================================
+    def _write(self, entry):
+        if self.directory is None:
+            return
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if self._jsonl is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._jsonl = open(os.path.join(self.directory, JSONL_FILE), 'a', buffering=1, encoding='utf-8')
+            self._jsonl.write(line + "\n")
+
+    def prometheus_text(self):
+        with self._lock:
+            spans = sorted((name, self._span_count[name], self._span_seconds[name]) for name in self._span_count)
+            calls = sorted(self._calls.items())
+            reruns = self._reruns_total
+        lines = [
+            "# HELP rfcc_span_seconds Durasi tahap pipeline dashboard (detik).",
+            "# TYPE rfcc_span_seconds summary",
+        ]
+        for name, count, seconds in spans:
+            lines.append(f'rfcc_span_seconds_sum{{span="{_label(name)}"}} {seconds:.6f}')
+            lines.append(f'rfcc_span_seconds_count{{span="{_label(name)}"}} {count}')
+        lines += [
+            "# HELP rfcc_calls_total Jumlah panggilan (round trip remote) per jenis.",
+            "# TYPE rfcc_calls_total counter",
+        ]
+        lines += [f'rfcc_calls_total{{call="{_label(name)}"}} {n}' for name, n in calls]
+        lines += [
+            "# HELP rfcc_reruns_total Jumlah rerun dashboard yang diukur.",
+            "# TYPE rfcc_reruns_total counter",
+            f"rfcc_reruns_total {reruns}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self):
+        if self.directory is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, PROMETHEUS_FILE)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+        return path
+
+    def breakdown(self, last=None):
+        """Rerun terakhir (terbaru dulu) sebagai list dict datar: total, ms per span, penghitung."""
+        with self._lock:
+            records = list(self.reruns)
+        rows = []
+        for record in reversed(records[-last:] if last else records):
+            row = {'rerun': record.id, 'mulai': time.strftime('%H:%M:%S', time.localtime(record.started)),
+                   'total_ms': round(record.seconds * 1000, 1)}
+            row.update({f'{name}_ms': round(seconds * 1000, 1) for name, seconds in record.spans.items()})
+            row.update(record.calls)
+            rows.append(row)
+        return rows
+
+    def close(self):
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Tracer proses (nonaktif sampai dikonfigurasi, mis. oleh app.py)
+TRACER = Tracer()
@@ -0,0 +1,247 @@
+"""
+INDEKS TETANGGA UNTUK MODEL KNN
+Pengganti KNeighborsClassifier ter-pickle untuk data latih besar
+(multi-tahun / multi-provinsi): scaler + indeks tetangga + label disimpan
+sebagai array polos di file .npz, bukan pickle objek scikit-learn.
+
+Backend:
+    kd_tree   - sklearn KDTree, hasil eksak
+    ball_tree - sklearn BallTree, hasil eksak
+    ivf       - aproksimasi: data latih dikelompokkan k-means (inverted file),
+                titik disimpan sebagai kode uint8 per dimensi; query hanya
+                memeriksa `n_probe` kelompok terdekat
+
+Prediksi mengikuti KNeighborsClassifier(weights='distance'|'uniform'):
+bobot 1/jarak, tetangga berjarak 0 mendominasi.
+
+Dengan 3 fitur (X1/X2/X3) kd_tree paling cepat; ivf dipakai bila ukuran file
+dan waktu load lebih penting daripada throughput (lihat benchmarks/bench_knn_index.py).
+
+Varian rumus fitur data latih (`feature_formula`, fire_features.FORMULAS) ikut
+disimpan di .npz agar inferensi dashboard memakai rumus yang sama.
+"""
+import os
+import uuid
+
+import numpy as np
+
+from fire_features import FORMULA_MULTIPLY
+
+BACKENDS = ('kd_tree', 'ball_tree', 'ivf')
+FORMAT_VERSION = 1
+
+
+def _standardize(X, mean, scale):
+    return (np.asarray(X, dtype=np.float64) - mean) / scale
+
+
+def _vote(dist, ind, y, n_classes, weights):
+    """Jarak & indeks k tetangga -> probabilitas kelas (n, n_classes)."""
+    labels = y[ind]
+    if weights == 'distance':
+        with np.errstate(divide='ignore'):
+            w = 1.0 / dist
+        exact = np.isinf(w)
+        hit = exact.any(axis=1)
+        w[hit] = exact[hit].astype(np.float64)
+        w[~np.isfinite(w)] = 0.0          # Baris isian (kelompok IVF kurang dari k titik)
+    else:
+        w = np.isfinite(dist).astype(np.float64)
+
+    proba = np.zeros((len(labels), n_classes), dtype=np.float64)
+    rows = np.repeat(np.arange(len(labels)), labels.shape[1])
+    np.add.at(proba, (rows, labels.ravel()), w.ravel())
+    total = proba.sum(axis=1, keepdims=True)
+    total[total == 0] = 1.0
+    return proba / total
+
+
+class KNNIndexModel:
+    def __init__(self, backend='kd_tree', n_neighbors=5, weights='distance',
+                 leaf_size=40, n_lists=None, n_probe=4, feature_formula=FORMULA_MULTIPLY):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend tidak dikenal: {backend} (pilih {', '.join(BACKENDS)})")
+        self.backend = backend
+        self.feature_formula = feature_formula
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.leaf_size = leaf_size
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+
+    # ------------------------------------------------------------------
+    # Fit
+    # ------------------------------------------------------------------
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        return self._fit_scaled(_standardize(X, self.mean_, self.scale_), np.asarray(y))
+
+    def fit_scaled(self, Z, y, mean, scale):
+        """Fit dari fitur yang sudah di-standardisasi dengan statistik scaler `mean`/`scale` (training streaming)."""
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        return self._fit_scaled(np.asarray(Z), np.asarray(y))
+
+    @classmethod
+    def from_pipeline(cls, pipeline, backend='kd_tree', **params):
+        """
+        Konversi Pipeline(StandardScaler, KNeighborsClassifier) ter-latih tanpa
+        training ulang: data latih yang sudah di-scale diambil dari estimator KNN.
+        """
+        scaler, knn = pipeline[0], pipeline[-1]
+        params.setdefault('n_neighbors', knn.n_neighbors)
+        params.setdefault('weights', knn.weights)
+        params.setdefault('feature_formula', getattr(pipeline, 'feature_formula', FORMULA_MULTIPLY))
+        model = cls(backend=backend, **params)
+        model.mean_ = np.asarray(scaler.mean_, dtype=np.float64)
+        model.scale_ = np.asarray(scaler.scale_, dtype=np.float64)
+        return model._fit_scaled(np.asarray(knn._fit_X, dtype=np.float64), knn.classes_[knn._y])
+
+    def _fit_scaled(self, Z, y):
+        self.classes_, codes = np.unique(y, return_inverse=True)
+        self._y = codes.astype(np.uint8 if len(self.classes_) < 256 else np.int32)
+
+        if self.backend == 'ivf':
+            self._fit_ivf(Z)
+        else:
+            self._points = Z.astype(np.float32)
+            self._build_tree()
+        return self
+
+    def _tree_cls(self):
+        from sklearn.neighbors import BallTree, KDTree
+        return KDTree if self.backend == 'kd_tree' else BallTree
+
+    def _build_tree(self):
+        self._tree = self._tree_cls()(self._points.astype(np.float64), leaf_size=self.leaf_size)
+
+    def _tree_arrays(self):
+        """Node pohon siap pakai (layout internal sklearn), disimpan agar load tidak membangun ulang."""
+        import sklearn
+        state = self._tree.__getstate__()
+        if len(state) != 13 or state[12] is not None:
+            return {}
+        return {'tree_idx': state[1], 'tree_nodes': state[2], 'tree_bounds': state[3],
+                'tree_ints': np.array(state[4:11], dtype=np.int64),
+                'tree_sklearn': np.array(sklearn.__version__)}
+
+    def _restore_tree(self, data):
+        """Pulihkan pohon dari node tersimpan; versi sklearn berbeda -> bangun ulang."""
+        import sklearn
+        if 'tree_sklearn' not in data or str(data['tree_sklearn']) != sklearn.__version__:
+            self._build_tree()
+            return
+        tree = self._tree_cls()(np.zeros((1, self._points.shape[1])))
+        metric = tree.__getstate__()[11]
+        tree.__setstate__((self._points.astype(np.float64), data['tree_idx'], data['tree_nodes'],
+                           data['tree_bounds'], *data['tree_ints'].tolist(), metric, None))
+        self._tree = tree
+
+    def _fit_ivf(self, Z):
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_lists = self.n_lists or int(np.clip(np.sqrt(len(Z)), 1, 4096))
+        km = MiniBatchKMeans(n_clusters=n_lists, n_init=3, random_state=0,
+                             batch_size=min(len(Z), 4096)).fit(Z)
+        order = np.argsort(km.labels_, kind='stable')
+        counts = np.bincount(km.labels_, minlength=n_lists)
+
+        # Kuantisasi skalar 8-bit per dimensi (256 tingkat di rentang data latih)
+        lo, hi = Z.min(axis=0), Z.max(axis=0)
+        step = np.where(hi > lo, (hi - lo) / 255.0, 1.0)
+        self._centroids = km.cluster_centers_.astype(np.float32)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._codes = np.round((Z[order] - lo) / step).astype(np.uint8)
+        self._q_lo, self._q_step = lo.astype(np.float32), step.astype(np.float32)
+        self._y = self._y[order]
+
+    @property
+    def n_samples_fit_(self):
+        return len(self._y)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def transform(self, X):
+        """Fitur mentah -> fitur ter-standardisasi (setara StandardScaler.transform)."""
+        return _standardize(X, self.mean_, self.scale_)
+
+    def kneighbors(self, X):
+        Z = self.transform(X)
+        if self.backend == 'ivf':
+            return self._query_ivf(Z)
+        return self._tree.query(Z, k=self.n_neighbors)
+
+    def _query_ivf(self, Z):
+        k = self.n_neighbors
+        n_probe = min(self.n_probe, len(self._centroids))
+        Zf = Z.astype(np.float32)
+        d_cent = ((Zf[:, None, :] - self._centroids[None, :, :]) ** 2).sum(axis=2)
+        probes = np.argpartition(d_cent, n_probe - 1, axis=1)[:, :n_probe]
+
+        best_d = np.full((len(Z), k), np.inf, dtype=np.float32)
+        best_i = np.zeros((len(Z), k), dtype=np.int64)
+        # Satu pass per kelompok: semua query yang memeriksa kelompok itu sekaligus
+        for c in np.unique(probes):
+            q = np.nonzero((probes == c).any(axis=1))[0]
+            a, b = self._offsets[c], self._offsets[c + 1]
+            if a == b:
+                continue
+            members = self._codes[a:b] * self._q_step + self._q_lo
+            d = ((Zf[q, None, :] - members[None, :, :]) ** 2).sum(axis=2)
+            cand_d = np.concatenate([best_d[q], d], axis=1)
+            cand_i = np.concatenate([best_i[q], np.broadcast_to(np.arange(a, b), d.shape)], axis=1)
+            top = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+            best_d[q] = np.take_along_axis(cand_d, top, axis=1)
+            best_i[q] = np.take_along_axis(cand_i, top, axis=1)
+        return np.sqrt(best_d.astype(np.float64)), best_i
+
+    def predict_proba(self, X):
+        dist, ind = self.kneighbors(X)
+        return _vote(dist, ind, self._y, len(self.classes_), self.weights)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    # ------------------------------------------------------------------
+    # Serialisasi .npz (array polos, tanpa pickle)
+    # ------------------------------------------------------------------
+    def _arrays(self):
+        if self.backend == 'ivf':
+            return {'centroids': self._centroids, 'offsets': self._offsets, 'codes': self._codes,
+                    'q_lo': self._q_lo, 'q_step': self._q_step}
+        return {'points': self._points, **self._tree_arrays()}
+
+    def save(self, path):
+        """Tulis .npz tanpa kompresi (load = baca array, tanpa membangun pohon ulang), atomik."""
+        meta = np.array([FORMAT_VERSION, BACKENDS.index(self.backend), self.n_neighbors,
+                         self.weights == 'distance', self.leaf_size, self.n_probe], dtype=np.int64)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp.npz"
+        np.savez(tmp, meta=meta, mean=self.mean_, scale=self.scale_, formula=np.array(self.feature_formula),
+                 classes=self.classes_, y=self._y, **self._arrays())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            version, backend, k, distance, leaf_size, n_probe = data['meta'].tolist()
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Versi format indeks KNN tidak didukung: {version}")
+            model = cls(backend=BACKENDS[backend], n_neighbors=k,
+                        weights='distance' if distance else 'uniform',
+                        leaf_size=leaf_size, n_probe=n_probe)
+            # Indeks lama tanpa kolom formula dilatih dengan rumus perkalian (default)
+            if 'formula' in data.files:
+                model.feature_formula = str(data['formula'])
+            model.mean_, model.scale_ = data['mean'], data['scale']
+            model.classes_, model._y = data['classes'], data['y']
+            if model.backend == 'ivf':
+                model._centroids, model._offsets, model._codes = data['centroids'], data['offsets'], data['codes']
+                model._q_lo, model._q_step = data['q_lo'], data['q_step']
+            else:
+                model._points = data['points']
+                model._restore_tree(data)
+        return model
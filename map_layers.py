@@ -0,0 +1,152 @@
+"""
+LAYER PETA
+Builder GeoJSON untuk pydeck dengan geometri yang diserialisasi sekali saja.
+
+Geometri desa tidak berubah antar rerun; yang berubah hanya properti risiko
+(level / prob / color) setelah data satelit ditarik ulang. Builder menyimpan
+dict geometri GeoJSON per desa dan hanya membangun ulang properti ketika
+versi data berubah.
+
+Untuk zoom provinsi dipakai geometri yang disederhanakan (level-of-detail):
+toleransi tiap tier di bawah ukuran satu piksel pada zoom tersebut, jadi
+bentuk desa tidak berubah secara visual tetapi payload jauh lebih kecil.
+"""
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+
+from risk_engine import level_colors
+
+# Kolom frame -> nama properti GeoJSON (dipakai tooltip); 'color' diturunkan dari level
+PROPERTY_COLUMNS = {
+    'nama': 'nama_desa',
+    'kab': 'kabupaten',
+    'level': 'level',
+    'prob': 'prob_pct',
+    'kering': 'status_kekeringan',
+}
+
+
+# Tier level-of-detail: (zoom minimum, nama tier, toleransi simplifikasi dalam derajat)
+# 1 piksel ~ 0.0078 derajat di zoom 7.5, ~0.0014 di zoom 10, ~0.0005 di zoom 11.5
+LOD_TIERS = (
+    (0, 'ringan', 0.005),
+    (9, 'sedang', 0.001),
+    (11, 'penuh', 0.0),
+)
+FULL_TIER = 'penuh'
+
+
+def tier_for_zoom(zoom):
+    """Tier paling ringan yang masih sub-piksel untuk zoom `zoom`."""
+    name = LOD_TIERS[0][1]
+    for min_zoom, tier, _ in LOD_TIERS:
+        if zoom >= min_zoom:
+            name = tier
+    return name
+
+
+def simplify_tier(geometries, tier):
+    tolerance = {name: tol for _, name, tol in LOD_TIERS}[tier]
+    if tolerance <= 0:
+        return geometries
+    # preserve_topology: poligon tidak runtuh/berpotongan sendiri (desa kecil tetap terlihat)
+    return shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+
+def geojson_geometries(geometries):
+    """
+    Array shapely -> list dict geometri GeoJSON.
+
+    Memakai to_ragged_array (koordinat + offset) lalu memotong list koordinat,
+    jauh lebih cepat daripada mapping() per baris atau json.loads(to_geojson).
+    Layer campuran yang tidak didukung to_ragged_array (mis. Polygon +
+    GeometryCollection / LineString) memakai jalur to_geojson per geometri.
+    """
+    try:
+        geom_type, coords, offsets = shapely.to_ragged_array(geometries)
+    except ValueError:
+        return _geojson_fallback(geometries)
+    xy = coords.tolist()
+    if geom_type == shapely.GeometryType.POLYGON:
+        ring_off, poly_off = offsets
+        rings = [xy[a:b] for a, b in zip(ring_off[:-1], ring_off[1:])]
+        return [{"type": "Polygon", "coordinates": rings[a:b]}
+                for a, b in zip(poly_off[:-1], poly_off[1:])]
+    if geom_type == shapely.GeometryType.MULTIPOLYGON:
+        ring_off, poly_off, multi_off = offsets
+        rings = [xy[a:b] for a, b in zip(ring_off[:-1], ring_off[1:])]
+        polys = [rings[a:b] for a, b in zip(poly_off[:-1], poly_off[1:])]
+        return [{"type": "MultiPolygon", "coordinates": polys[a:b]}
+                for a, b in zip(multi_off[:-1], multi_off[1:])]
+    return _geojson_fallback(geometries)
+
+
+def _geojson_fallback(geometries):
+    """Semua tipe geometri (termasuk campuran & kosong); None -> None seperti baris tanpa geometri."""
+    return [json.loads(text) if text is not None else None for text in shapely.to_geojson(geometries)]
+
+
+def _to_python(value):
+    return value.tolist() if hasattr(value, 'tolist') else value
+
+
+class GeoJsonLayerCache:
+    def __init__(self, geometries, index, max_versions=4):
+        self.index = index
+        self._source = geometries
+        self._tiers = {}
+        self._versions = OrderedDict()
+        self._max_versions = max_versions
+        self._lock = threading.Lock()
+
+    def geometries(self, tier=FULL_TIER):
+        """Dict geometri GeoJSON untuk satu tier, dibangun sekali lalu disimpan."""
+        with self._lock:
+            if tier not in self._tiers:
+                self._tiers[tier] = geojson_geometries(simplify_tier(self._source, tier))
+            return self._tiers[tier]
+
+    def _features(self, df, version, tier):
+        key = (version, tier)
+        with self._lock:
+            if key in self._versions:
+                self._versions.move_to_end(key)
+                return self._versions[key]
+
+        geoms = self.geometries(tier)
+
+        positions = self.index.get_indexer(df.index)
+        columns = {prop: df[col].tolist() for prop, col in PROPERTY_COLUMNS.items()}
+        # prob disimpan float32: bulatkan ke 1 desimal agar tooltip tidak menampilkan 60.099998
+        columns['prob'] = np.round(df['prob_pct'].to_numpy(dtype=np.float64), 1).tolist()
+        columns['color'] = level_colors(df['level']).tolist()
+        features = {}
+        for i, (label, pos) in enumerate(zip(df.index, positions)):
+            props = {prop: _to_python(values[i]) for prop, values in columns.items()}
+            features[label] = {"type": "Feature", "geometry": geoms[pos], "properties": props}
+
+        with self._lock:
+            self._versions[key] = features
+            while len(self._versions) > self._max_versions:
+                self._versions.popitem(last=False)
+        return features
+
+    def collection(self, df, version, tier=FULL_TIER):
+        """FeatureCollection semua desa untuk versi data `version` pada tier LOD `tier`."""
+        return {"type": "FeatureCollection", "features": list(self._features(df, version, tier).values())}
+
+    def highlight(self, df, label):
+        """FeatureCollection berisi satu desa terpilih, selalu resolusi penuh (lookup indeks)."""
+        if label not in df.index:
+            return {"type": "FeatureCollection", "features": []}
+        row = df.loc[label]
+        props = {prop: _to_python(row[col]) for prop, col in PROPERTY_COLUMNS.items()}
+        props['prob'] = round(float(row['prob_pct']), 1)
+        props['color'] = level_colors([row['level']])[0].tolist()
+        geometry = self.geometries(FULL_TIER)[self.index.get_loc(label)]
+        return {"type": "FeatureCollection",
+                "features": [{"type": "Feature", "geometry": geometry, "properties": props}]}
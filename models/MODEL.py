@@ -2,9 +2,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
 import warnings
 import os
+import sys
 
 # Model Components
 from sklearn.neighbors import KNeighborsClassifier
@@ -18,6 +18,10 @@ import joblib
 
 warnings.filterwarnings('ignore')
 
+# Modul fitur bersama (dipakai juga oleh dashboard) ada di root repo
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fire_features import FEATURES, FORMULA_MULTIPLY, feature_frame
+
 # =============================================================================
 # 1. LOAD & PHYSICS FEATURE
 # =============================================================================
@@ -34,36 +38,12 @@ except Exception as e:
     print(f"❌ File error: {e}")
     exit()
 
-# Cleaning
-def clean_numeric(x):
-    if pd.isna(x):
-        return 0.0
-    x = str(x).strip()
-    x = re.sub(r'[^0-9.]', '', x)
-    try:
-        return float(x)
-    except:
-        return 0.0
-
-for col in ['LST_Max_2024_C', 'Rain_Max_2024_mm', 'NDVI_Max_2024']:
-    df[col] = df[col].apply(clean_numeric)
-
 df['TARGET'] = pd.to_numeric(df['TARGET'], errors='coerce').fillna(0).astype(int)
 
-# Physics Features
-LST = df['LST_Max_2024_C']
-NDVI = df['NDVI_Max_2024']
-Rain_Log = np.log1p(df['Rain_Max_2024_mm'])
-EPS = 0.01
-
-# Variabel sesuai kode asli
-df['X1_Fuel_Dryness'] = (LST * (1 - NDVI)) * (Rain_Log + EPS)
-df['X2_Thermal_Kinetic'] = LST ** 2
-df['X3_Hydro_Stress'] = LST * (Rain_Log + EPS)
-df = df.replace([np.inf, -np.inf], 0).fillna(0)
-
-features = ['X1_Fuel_Dryness', 'X2_Thermal_Kinetic', 'X3_Hydro_Stress']
-X = df[features]
+# Physics Features - rumus PERKALIAN (sama dengan model dashboard);
+# kolom mentah dibersihkan di feature_frame (fire_features.clean_numeric)
+X = feature_frame(df, FORMULA_MULTIPLY)
+features = FEATURES
 y = df['TARGET']
 
 # Split Data
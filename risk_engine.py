@@ -0,0 +1,156 @@
+"""
+LOGIKA RISIKO FISIKA
+Skor risiko kebakaran per desa dari LST, NDVI dan curah hujan 30 hari.
+
+Seluruh perhitungan vektor NumPy: klasifikasi level & kekeringan memakai
+np.select dan disimpan sebagai pandas Categorical, sedangkan warna peta
+diambil dari tabel uint8 yang diindeks kode level (bukan list per baris).
+
+Selain rumus berbobot, skor bisa diambil dari model KNN terlatih
+(models/initial_model.pkl): fitur X1/X2/X3 dihitung vektor dan
+predict_proba dijalankan per batch untuk semua desa.
+"""
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fire_features import FEATURES, FORMULA_MULTIPLY, physics_features
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'initial_model.pkl')
+
+# Sumber skor prob_pct yang bisa dipilih operator
+SOURCE_FORMULA = "Rumus Fisika"
+SOURCE_MODEL = "Model KNN"
+SCORE_SOURCES = (SOURCE_FORMULA, SOURCE_MODEL)
+
+# Urutan kategori = kode Categorical (RENDAH=0, SEDANG=1, TINGGI=2)
+LEVELS = pd.CategoricalDtype(["RENDAH", "SEDANG", "TINGGI"], ordered=True)
+LEVEL_COLORS = np.array([
+    [0, 128, 0],     # Hijau
+    [255, 165, 0],   # Oranye
+    [255, 0, 0],     # Merah
+], dtype=np.uint8)
+
+# Klasifikasi BMKG/Standar Umum (Bulanan) berdasarkan curah hujan 30 hari
+DRY_STATUS = pd.CategoricalDtype(["DATA TIDAK ADA", "SANGAT KERING", "KERING", "NORMAL", "BASAH"])
+
+
+def classify_level(prob_pct):
+    """> 60 TINGGI, > 50 SEDANG, selain itu (termasuk NaN) RENDAH."""
+    p = np.asarray(prob_pct, dtype=float)
+    codes = np.select([p > 60, p > 50], [2, 1], default=0).astype(np.int8)
+    return pd.Categorical.from_codes(codes, dtype=LEVELS)
+
+
+def classify_dryness(rain):
+    r = np.asarray(rain, dtype=float)
+    codes = np.select(
+        [np.isnan(r), r < 10, r < 50, r < 100],   # < 10mm Ekstrem, 10-50mm Waspada, 50-100mm Normal
+        [0, 1, 2, 3],
+        default=4                                 # > 100mm Aman
+    ).astype(np.int8)
+    return pd.Categorical.from_codes(codes, dtype=DRY_STATUS)
+
+
+def level_colors(level):
+    """Series/Categorical level -> array warna (n, 3) uint8."""
+    return LEVEL_COLORS[pd.Categorical(level, dtype=LEVELS).codes]
+
+
+def risk_score(lst, ndvi, rain):
+    """Skor 0-100 (1 desimal): 40% Hujan + 40% Suhu + 20% Kekeringan."""
+    # 1. Suhu: makin panas makin bahaya (range 25C - 40C)
+    norm_lst = np.clip((np.asarray(lst, dtype=float) - 25) / (40 - 25), 0, 1)
+    # 2. Hujan: makin banyak makin aman (hujan 30 hari 0mm - 300mm)
+    norm_rain = np.clip(1 - np.asarray(rain, dtype=float) / 300, 0, 1)
+    # 3. Vegetasi: makin rendah/kering makin bahaya (NDVI -1 sampai 1)
+    norm_dry = np.clip(1 - np.asarray(ndvi, dtype=float), 0, 1)
+
+    score = (0.4 * norm_rain) + (0.4 * norm_lst) + (0.2 * norm_dry)
+    return np.round(score * 100, 1)
+
+
+# ==============================================================================
+# MODEL KNN (BATCH INFERENCE)
+# ==============================================================================
+@dataclass
+class ModelScore:
+    prob_pct: np.ndarray     # Probabilitas kelas kebakaran (0-100, 1 desimal)
+    seconds: float           # Waktu fitur + predict_proba seluruh batch
+    batches: int
+    out_of_range: int        # Desa dengan fitur di luar sebaran data latih (|z| > 4)
+
+    @property
+    def per_village_ms(self):
+        return 1000 * self.seconds / max(len(self.prob_pct), 1)
+
+
+def load_risk_model(path=MODEL_PATH):
+    """Pickle Pipeline scikit-learn (.pkl) atau indeks tetangga knn_index (.npz)."""
+    if path.endswith('.npz'):
+        from knn_index import KNNIndexModel
+        return KNNIndexModel.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+def _positive_column(model):
+    classes = list(model.classes_)
+    return classes.index(1) if 1 in classes else len(classes) - 1
+
+
+def feature_formula(model):
+    """Varian rumus fitur data latih model (atribut `feature_formula`); model lama = rumus perkalian."""
+    return getattr(model, 'feature_formula', FORMULA_MULTIPLY)
+
+
+def model_score(model, lst, ndvi, rain, batch_size=4096):
+    """predict_proba untuk semua desa, dipecah per `batch_size` baris agar matriks jarak tetap kecil."""
+    t0 = time.perf_counter()
+    X = physics_features(lst, ndvi, rain, feature_formula(model))
+    pos = _positive_column(model)
+    # Pipeline scaler -> KNN (atau KNNIndexModel.transform): z-score untuk deteksi fitur di luar data latih
+    if hasattr(model, 'steps'):
+        scaler = model[:-1] if len(model.steps) > 1 else None
+    else:
+        scaler = model if hasattr(model, 'transform') else None
+
+    proba = np.empty(len(X), dtype=np.float64)
+    out_of_range = 0
+    batches = 0
+    for start in range(0, len(X), batch_size):
+        batch = pd.DataFrame(X[start:start + batch_size], columns=FEATURES)
+        proba[start:start + len(batch)] = model.predict_proba(batch)[:, pos]
+        if scaler is not None:
+            out_of_range += int((np.abs(scaler.transform(batch)) > 4).any(axis=1).sum())
+        batches += 1
+
+    return ModelScore(np.round(proba * 100, 1), time.perf_counter() - t0, batches, out_of_range)
+
+
+def calculate_risk(df, source=SOURCE_FORMULA):
+    """
+    Isi prob_pct / level / status_kekeringan. Skor rumus selalu disimpan di
+    prob_rumus; `source` = SOURCE_MODEL memakai kolom prob_model (jika ada).
+    """
+    if df is None: return None
+
+    df['prob_rumus'] = risk_score(df['LST'], df['NDVI'], df['Rain']).astype(np.float32)
+    apply_score_source(df, source)
+
+    # Kekeringan diklasifikasi dari HUJAN (bukan NDVI)
+    df['status_kekeringan'] = classify_dryness(df['Rain'])
+    return df
+
+
+def apply_score_source(df, source=SOURCE_FORMULA):
+    """Isi ulang prob_pct / level dari skor yang sudah ada (prob_rumus atau prob_model), tanpa menghitung rumus."""
+    if source == SOURCE_MODEL and 'prob_model' in df.columns:
+        df['prob_pct'] = df['prob_model']
+    else:
+        df['prob_pct'] = df['prob_rumus']
+    df['level'] = classify_level(df['prob_pct'])
+    return df
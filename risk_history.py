@@ -0,0 +1,196 @@
+"""
+RIWAYAT RISIKO HARIAN PER DESA
+Store kolumnar append-only: satu file Parquet per hari di
+`<root>/days/date=YYYY-MM-DD/part.parquet` (LST, NDVI, Rain, prob_pct,
+prob_model per desa). Refresh berikutnya di hari yang sama menimpa file hari
+itu secara atomik; hari sebelumnya tidak pernah diubah.
+
+Dua pola query:
+    day(D)        - semua desa pada hari D  -> baca satu partisi
+    village(X)    - semua hari untuk desa X -> indeks village_index.parquet
+                    (semua hari yang sudah tutup, diurutkan per desa lalu
+                    tanggal; row group kecil sehingga filter idx hanya
+                    membaca beberapa row group) + partisi terbaru yang belum
+                    dipadatkan.
+    daily_summary - rata-rata/maks/jumlah desa TINGGI per hari, dari
+                    daily_summary.parquet yang diperbarui tiap append.
+
+Indeks dipadatkan ulang otomatis setiap `compact_after` hari baru.
+"""
+import os
+import shutil
+import threading
+import uuid
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from risk_engine import classify_level
+
+HISTORY_COLUMNS = ['LST', 'NDVI', 'Rain', 'prob_pct', 'prob_model']
+INDEX_FILE = "village_index.parquet"
+SUMMARY_FILE = "daily_summary.parquet"
+SUMMARY_COLUMNS = ['prob_pct', 'prob_model']
+INDEX_ROW_GROUP = 16_384
+
+_SCHEMA = pa.schema([('idx', pa.int32())] + [(c, pa.float32()) for c in HISTORY_COLUMNS])
+
+
+class RiskHistory:
+    def __init__(self, root, compact_after=7):
+        self.root = root
+        self.compact_after = compact_after
+        self._days_dir = os.path.join(root, "days")
+        self._index_path = os.path.join(root, INDEX_FILE)
+        self._summary_path = os.path.join(root, SUMMARY_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(self._days_dir, exist_ok=True)
+
+    # ==============================================================================
+    # 1. PARTISI HARIAN
+    # ==============================================================================
+    def _day_path(self, day):
+        return os.path.join(self._days_dir, f"date={day.isoformat()}", "part.parquet")
+
+    def days(self):
+        """Semua hari yang tersimpan (urut naik)."""
+        out = []
+        for name in os.listdir(self._days_dir):
+            if name.startswith("date=") and os.path.exists(os.path.join(self._days_dir, name, "part.parquet")):
+                out.append(date.fromisoformat(name[5:]))
+        return sorted(out)
+
+    def append(self, day, df):
+        """
+        Simpan nilai per desa untuk `day`. `df` berindeks idx desa dan memuat
+        kolom HISTORY_COLUMNS (prob_model boleh tidak ada -> NaN).
+        """
+        table = pa.table(
+            [pa.array(df.index.to_numpy(), type=pa.int32())] +
+            [pa.array(df[c].to_numpy(dtype=np.float32) if c in df else np.full(len(df), np.nan, np.float32))
+             for c in HISTORY_COLUMNS],
+            schema=_SCHEMA,
+        )
+        path = self._day_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+
+        with self._lock:
+            through = self._index_through()
+            if through is not None and day <= through:
+                # Hari yang sudah dipadatkan ditulis ulang -> indeks tidak berlaku lagi
+                self._remove_index()
+            self._update_summary(day, table)
+        if len(self._tail_days()) > self.compact_after:
+            self.compact()
+
+    def day(self, day):
+        """Semua desa pada hari `day` (DataFrame berindeks idx, kosong jika tidak ada)."""
+        path = self._day_path(day)
+        if not os.path.exists(path):
+            return _SCHEMA.empty_table().to_pandas().set_index('idx')
+        return pq.read_table(path).to_pandas().set_index('idx')
+
+    # ==============================================================================
+    # 2. INDEKS PER DESA (DIPADATKAN)
+    # ==============================================================================
+    def _index_through(self):
+        try:
+            meta = pq.read_schema(self._index_path).metadata or {}
+        except OSError:
+            return None
+        through = meta.get(b"through")
+        return date.fromisoformat(through.decode()) if through else None
+
+    def _remove_index(self):
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)
+
+    def _tail_days(self):
+        through = self._index_through()
+        return [d for d in self.days() if through is None or d > through]
+
+    def _read_day_table(self, day, filters=None):
+        table = pq.read_table(self._day_path(day), filters=filters)
+        return table.append_column('date', pa.array(np.full(len(table), day, dtype='datetime64[D]'), pa.date32()))
+
+    def compact(self, today=None):
+        """Padatkan semua hari sebelum hari terakhir (hari terakhir masih bisa ditimpa refresh)."""
+        with self._lock:
+            days = self.days()
+            if today is not None:
+                days = [d for d in days if d < today]
+            else:
+                days = days[:-1]
+            if not days:
+                return None
+
+            table = pa.concat_tables([self._read_day_table(d) for d in days])
+            order = pc.sort_indices(table, sort_keys=[('idx', 'ascending'), ('date', 'ascending')])
+            table = table.take(order)
+            table = table.replace_schema_metadata({b"through": days[-1].isoformat().encode()})
+
+            tmp = f"{self._index_path}.{uuid.uuid4().hex}.tmp"
+            pq.write_table(table, tmp, row_group_size=INDEX_ROW_GROUP)
+            os.replace(tmp, self._index_path)
+            return days[-1]
+
+    def village(self, idx):
+        """Semua hari untuk desa `idx` (DataFrame berindeks tanggal, urut naik)."""
+        idx = int(idx)
+        parts = []
+        through = self._index_through()
+        if through is not None:
+            parts.append(pq.read_table(self._index_path, filters=[('idx', '=', idx)]))
+        for day in self.days():
+            if through is None or day > through:
+                parts.append(self._read_day_table(day, filters=[('idx', '=', idx)]))
+        if not parts:
+            return pd.DataFrame(columns=HISTORY_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+
+        df = pa.concat_tables([p.select(['date'] + HISTORY_COLUMNS) for p in parts]).to_pandas()
+        df['date'] = pd.to_datetime(df['date'])
+        return df.set_index('date').sort_index()
+
+    # ==============================================================================
+    # 3. RINGKASAN HARIAN SEMUA DESA
+    # ==============================================================================
+    def _update_summary(self, day, table):
+        row = {'date': pd.Timestamp(day)}
+        for column in SUMMARY_COLUMNS:
+            values = table[column].to_numpy(zero_copy_only=False).astype(np.float64)
+            valid = values[~np.isnan(values)]
+            row[f'{column}_mean'] = valid.mean() if len(valid) else np.nan
+            row[f'{column}_max'] = valid.max() if len(valid) else np.nan
+            row[f'{column}_high'] = int((classify_level(valid) == 'TINGGI').sum())
+
+        summary = self._read_summary()
+        summary = pd.concat([summary[summary['date'] != row['date']], pd.DataFrame([row])], ignore_index=True) \
+            if len(summary) else pd.DataFrame([row])
+        tmp = f"{self._summary_path}.{uuid.uuid4().hex}.tmp"
+        summary.sort_values('date').to_parquet(tmp, index=False)
+        os.replace(tmp, self._summary_path)
+
+    def _read_summary(self):
+        if not os.path.exists(self._summary_path):
+            return pd.DataFrame()
+        return pd.read_parquet(self._summary_path)
+
+    def daily_summary(self, column='prob_pct'):
+        """Ringkasan semua desa per hari (indeks tanggal): mean, max & high (jumlah desa TINGGI)."""
+        summary = self._read_summary()
+        if not len(summary):
+            return pd.DataFrame(columns=['mean', 'max', 'high'], index=pd.DatetimeIndex([], name='date'))
+        return summary.set_index('date')[[f'{column}_mean', f'{column}_max', f'{column}_high']] \
+            .set_axis(['mean', 'max', 'high'], axis=1)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            os.makedirs(self._days_dir, exist_ok=True)
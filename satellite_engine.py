@@ -0,0 +1,457 @@
+"""
+ENGINE SATELIT RFCC
+Resolusi jendela data terbaru (LST, NDVI, CHIRPS) di Google Earth Engine.
+
+Modul ini sengaja tidak mengimpor Streamlit maupun `ee` secara langsung:
+modul `ee` diberikan sebagai parameter sehingga engine bisa dijalankan
+terhadap modul palsu (benchmarks/fake_ee.py) untuk benchmark offline.
+"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from instrumentation import TRACER
+
+DAY = timedelta(days=1)
+
+
+# ==============================================================================
+# 1. DEFINISI DATASET
+# ==============================================================================
+@dataclass(frozen=True)
+class DatasetSpec:
+    key: str             # Nama variabel di dashboard (LST / NDVI / Rain)
+    collection: str      # ID ImageCollection di GEE
+    band: str            # Band yang diambil
+    out_band: str        # Nama band setelah komposit
+    window_days: int     # Panjang jendela komposit
+    lookback_days: int   # Batas mundur maksimal
+    composite: str       # 'mean' atau 'sum'
+
+
+DATASETS = {
+    # MODIS Terra MOD11A1 - Harian, kadang ada gap karena awan -> komposit 8 hari
+    'LST': DatasetSpec('LST', 'MODIS/061/MOD11A1', 'LST_Day_1km', 'LST_RAW', 8, 30, 'mean'),
+    # MODIS MOD13Q1 - 16 hari sekali
+    'NDVI': DatasetSpec('NDVI', 'MODIS/061/MOD13Q1', 'NDVI', 'NDVI_RAW', 16, 60, 'mean'),
+    # CHIRPS Daily - biasanya delay 2-7 hari -> total hujan 30 hari
+    'Rain': DatasetSpec('Rain', 'UCSB-CHG/CHIRPS/DAILY', 'precipitation', 'Rain_RAW', 30, 15, 'sum'),
+}
+
+
+@dataclass(frozen=True)
+class DataWindow:
+    key: str
+    start: datetime
+    end: datetime
+    latest: datetime     # Waktu akuisisi terbaru di dalam jendela
+    days_back: int       # Berapa hari jendela digeser mundur dari "sekarang"
+
+
+class WindowNotFoundError(Exception):
+    pass
+
+
+# ==============================================================================
+# 2. RESOLVER JENDELA DATA TERBARU
+# ==============================================================================
+class WindowResolver:
+    """
+    Mencari jendela data terbaru dengan SATU query server per dataset.
+
+    Hasilnya identik dengan loop lama (mundur per hari sampai `size() > 0`):
+    jendela [end - window_days, end) dengan `end` = sekarang dikurangi jumlah
+    hari mundur terkecil yang masih memuat akuisisi terbaru.
+    """
+
+    def __init__(self, ee_module, ttl_seconds=3600, clock=datetime.now):
+        self.ee = ee_module
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.round_trips = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, spec, now=None):
+        now = now or self.clock()
+        with self._lock:
+            hit = self._cache.get(spec.key)
+        if hit is not None and (now - hit[0]).total_seconds() < self.ttl_seconds:
+            return hit[1]
+
+        window = self._query(spec, now)
+        with self._lock:
+            self._cache[spec.key] = (now, window)
+        return window
+
+    def _query(self, spec, now):
+        search_start = now - timedelta(days=spec.lookback_days + spec.window_days)
+        TRACER.count("ee_getinfo")
+        with TRACER.span("ee_getinfo", dataset=spec.key):
+            latest_ms = self.ee.ImageCollection(spec.collection) \
+                .filterDate(search_start, now) \
+                .aggregate_max('system:time_start') \
+                .getInfo()
+        with self._lock:
+            self.round_trips += 1
+
+        if latest_ms is None:
+            raise WindowNotFoundError(
+                f"{spec.key} data tidak ditemukan dalam {spec.lookback_days} hari terakhir"
+            )
+
+        # GEE memakai UTC; datetime naive diperlakukan sebagai UTC oleh filterDate
+        latest = datetime.fromtimestamp(latest_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+        gap = (now - timedelta(days=spec.window_days)) - latest
+        days_back = max(0, math.ceil(gap / DAY))
+        if days_back >= spec.lookback_days:
+            raise WindowNotFoundError(
+                f"{spec.key} data tidak ditemukan dalam {spec.lookback_days} hari terakhir"
+            )
+
+        end = now - timedelta(days=days_back)
+        return DataWindow(spec.key, end - timedelta(days=spec.window_days), end, latest, days_back)
+
+    def image(self, spec, window):
+        """Komposit lazy untuk jendela yang sudah di-resolve (tanpa round trip)."""
+        collection = self.ee.ImageCollection(spec.collection) \
+            .filterDate(window.start, window.end) \
+            .select(spec.band)
+        composite = collection.sum() if spec.composite == 'sum' else collection.mean()
+        return composite.rename(spec.out_band)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'round_trips': self.round_trips, 'cached': sorted(self._cache)}
+
+
+# ==============================================================================
+# 3. PENARIKAN PARALEL LST / NDVI / CHIRPS
+# ==============================================================================
+@dataclass(frozen=True)
+class LayerResult:
+    key: str
+    window: DataWindow = None
+    image: object = None
+    seconds: float = 0.0
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _resolve_layer(resolver, spec, now):
+    t0 = time.perf_counter()
+    try:
+        window = resolver.resolve(spec, now)
+        return LayerResult(spec.key, window, resolver.image(spec, window), time.perf_counter() - t0)
+    except Exception as e:
+        return LayerResult(spec.key, seconds=time.perf_counter() - t0, error=e)
+
+
+def fetch_layers(resolver, specs, now=None, max_workers=3, timeout=None, on_done=None):
+    """
+    Resolusi jendela semua dataset secara paralel di thread pool terbatas.
+
+    Kegagalan satu dataset tidak membatalkan dataset lain; hasilnya dicatat
+    di `LayerResult.error`. `on_done(result)` dipanggil di thread pemanggil
+    begitu tiap dataset selesai (aman untuk update UI Streamlit). Dataset yang
+    belum selesai setelah `timeout` detik dilaporkan sebagai TimeoutError.
+    """
+    now = now or resolver.clock()
+    specs = list(specs)
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs))),
+                                  thread_name_prefix="rfcc-sat")
+    t0 = time.perf_counter()
+    try:
+        pending = {executor.submit(_resolve_layer, resolver, spec, now): spec for spec in specs}
+        while pending:
+            remaining = None if timeout is None else max(0.0, timeout - (time.perf_counter() - t0))
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                result = future.result()
+                pending.pop(future)
+                results[result.key] = result
+                if on_done:
+                    on_done(result)
+
+        for future, spec in pending.items():
+            future.cancel()
+            result = LayerResult(spec.key, seconds=time.perf_counter() - t0,
+                                 error=TimeoutError(f"{spec.key} melebihi batas waktu {timeout} detik"))
+            results[spec.key] = result
+            if on_done:
+                on_done(result)
+    finally:
+        # Jangan menunggu thread yang macet; hasilnya tetap masuk cache resolver
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {spec.key: results[spec.key] for spec in specs}
+
+
+# ==============================================================================
+# 4. EKSTRAKSI PER DESA - reduceRegions BERTAHAP (CHUNK) & PARALEL
+# ==============================================================================
+@dataclass
+class ExtractionStats:
+    chunks: int = 0
+    requests: int = 0
+    retries: int = 0
+    features: int = 0
+    vertices: int = 0
+    seconds: float = 0.0
+    chunk_seconds: list = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                if name == 'chunk_seconds':
+                    self.chunk_seconds.append(value)
+                else:
+                    setattr(self, name, getattr(self, name) + value)
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def _point_collection(ee, idx, lon, lat):
+    return ee.FeatureCollection([
+        ee.Feature(ee.Geometry.Point([float(x), float(y)]), {'idx': int(i)})
+        for i, x, y in zip(idx, lon, lat)
+    ])
+
+
+def _polygon_collection(ee, idx, geometries):
+    return ee.FeatureCollection([
+        ee.Feature(ee.Geometry(geom), {'idx': int(i)})
+        for i, geom in zip(idx, geometries)
+    ])
+
+
+def _reduce_chunk(ee, image, build_fc, reducer, scale, tile_scale, max_retries, backoff, stats, sleep,
+                  columns=None, properties=None):
+    t0 = time.perf_counter()
+    fc = build_fc()
+    for attempt in range(max_retries + 1):
+        try:
+            stats.add(requests=1)
+            reduced = image.reduceRegions(
+                collection=fc,
+                reducer=reducer,
+                scale=scale,
+                tileScale=tile_scale
+            )
+            if columns is not None:
+                # Diringkas di server jadi satu list per kolom: tanpa geometri & nama properti per fitur
+                reduced = reduced.reduceColumns(ee.Reducer.toList().repeat(len(columns)), columns)
+            elif properties is not None:
+                # Geometri (poligon lengkap) tidak dikirim balik, hanya properti terpilih
+                reduced = reduced.select(properties, None, False)
+            TRACER.count("ee_reduce_regions")
+            with TRACER.span("ee_reduce_regions", attempt=attempt):
+                data = reduced.getInfo()
+            break
+        except Exception as e:
+            if attempt == max_retries:
+                raise ExtractionError(f"Chunk gagal setelah {max_retries + 1} percobaan: {e}") from e
+            stats.add(retries=1)
+            TRACER.count("ee_retry")
+            # Exponential backoff + jitter agar chunk yang gagal tidak menyerbu GEE bersamaan
+            sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+    if columns is not None:
+        arrays = {col: np.asarray(values, dtype=np.float64) for col, values in zip(columns, data['list'])}
+        stats.add(features=len(arrays[columns[0]]), chunk_seconds=time.perf_counter() - t0)
+        return arrays
+    props = [f['properties'] for f in data['features']]
+    stats.add(features=len(props), chunk_seconds=time.perf_counter() - t0)
+    return props
+
+
+def _run_chunks(ee, image, bounds, build_fc, max_workers, max_retries, backoff,
+                scale, tile_scale, reducer, stats, sleep, columns=None, properties=None):
+    """Jalankan chunk [a, b) paralel; `build_fc(a, b)` membuat FeatureCollection chunk. Hasil urut chunk."""
+    reducer = reducer if reducer is not None else ee.Reducer.first()
+    stats.add(chunks=len(bounds))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(bounds))),
+                            thread_name_prefix="rfcc-extract") as executor:
+        futures = [
+            executor.submit(
+                _reduce_chunk, ee, image, lambda a=a, b=b: build_fc(a, b),
+                reducer, scale, tile_scale, max_retries, backoff, stats, sleep, columns, properties
+            )
+            for a, b in bounds
+        ]
+        try:
+            results = [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+    stats.add(seconds=time.perf_counter() - t0)
+    return results
+
+
+def _fixed_chunks(n, chunk_size):
+    return [(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+
+
+def extract_points(ee, image, idx, lon, lat, chunk_size=500, max_workers=4,
+                   max_retries=3, backoff=1.0, scale=1000, tile_scale=4,
+                   reducer=None, stats=None, sleep=time.sleep):
+    """
+    Sampling `image` di titik (lon, lat) per desa, dipecah per `chunk_size` titik.
+
+    Chunk dijalankan paralel dengan retry + backoff; hasil digabung kembali
+    berdasarkan `idx` dan dikembalikan sebagai list properti terurut idx.
+    """
+    stats = stats if stats is not None else ExtractionStats()
+    idx, lon, lat = list(idx), list(lon), list(lat)
+    chunks = _run_chunks(ee, image, _fixed_chunks(len(idx), chunk_size),
+                         lambda a, b: _point_collection(ee, idx[a:b], lon[a:b], lat[a:b]),
+                         max_workers, max_retries, backoff, scale, tile_scale, reducer, stats, sleep)
+    merged = {props.get('idx'): props for chunk in chunks for props in chunk}
+    return [merged[k] for k in sorted(merged)]
+
+
+def _sorted_columns(chunks, columns):
+    merged = {col: np.concatenate([chunk[col] for chunk in chunks]) if chunks else np.empty(0)
+              for col in columns}
+    merged['idx'] = merged['idx'].astype(np.int64)
+    order = np.argsort(merged['idx'], kind='stable')
+    return {col: values[order] for col, values in merged.items()}
+
+
+def extract_columns(ee, image, bands, idx, lon, lat, chunk_size=500, max_workers=4,
+                    max_retries=3, backoff=1.0, scale=1000, tile_scale=4,
+                    reducer=None, stats=None, sleep=time.sleep):
+    """
+    Seperti extract_points, tetapi tiap chunk diringkas di server dengan
+    reduceColumns(toList) sehingga payload berisi satu list angka per band.
+
+    Mengembalikan dict kolom NumPy {'idx': int64, band: float64, ...} terurut
+    idx. Desa tanpa nilai (mis. di luar citra) tidak ikut; pakai `unmask`
+    di `image` agar semua desa punya nilai.
+    """
+    stats = stats if stats is not None else ExtractionStats()
+    idx, lon, lat = list(idx), list(lon), list(lat)
+    columns = ['idx'] + list(bands)
+    chunks = _run_chunks(ee, image, _fixed_chunks(len(idx), chunk_size),
+                         lambda a, b: _point_collection(ee, idx[a:b], lon[a:b], lat[a:b]),
+                         max_workers, max_retries, backoff, scale, tile_scale, reducer, stats, sleep,
+                         columns=columns)
+    return _sorted_columns(chunks, columns)
+
+
+# Statistik zonal: nama -> reducer GEE (pNN = persentil ke-NN)
+ZONAL_STATS = ('mean', 'max', 'p90')
+
+
+def zonal_reducer(ee, stat):
+    if stat == 'mean':
+        return ee.Reducer.mean()
+    if stat == 'max':
+        return ee.Reducer.max()
+    if stat.startswith('p') and stat[1:].isdigit():
+        return ee.Reducer.percentile([int(stat[1:])])
+    raise ValueError(f"Statistik zonal tidak dikenal: {stat}")
+
+
+def vertex_chunks(vertex_counts, chunk_size, max_vertices):
+    """Batas chunk [a, b): maks. `chunk_size` poligon dan `max_vertices` vertex per request."""
+    bounds, start, total = [], 0, 0
+    for i, count in enumerate(vertex_counts):
+        if i > start and (i - start >= chunk_size or total + count > max_vertices):
+            bounds.append((start, i))
+            start, total = i, 0
+        total += int(count)
+    if start < len(vertex_counts):
+        bounds.append((start, len(vertex_counts)))
+    return bounds
+
+
+def extract_zonal(ee, image, bands, idx, geometries, vertex_counts, stat='mean',
+                  chunk_size=100, max_vertices=50_000, max_workers=4, max_retries=3, backoff=1.0,
+                  scale=1000, tile_scale=4, stats=None, sleep=time.sleep):
+    """
+    Statistik zonal `stat` (mean / max / pNN) per band di atas poligon desa
+    (dict GeoJSON, sebaiknya sudah disederhanakan). Chunk dibatasi jumlah
+    poligon dan jumlah vertex agar request tetap di bawah batas payload GEE.
+
+    Piksel ter-mask diabaikan oleh reducer (jangan `unmask` image); desa yang
+    semua pikselnya ter-mask bernilai NaN. Mengembalikan dict kolom NumPy
+    {'idx': int64, band: float64, ...} terurut idx.
+    """
+    stats = stats if stats is not None else ExtractionStats()
+    idx, geometries = list(idx), list(geometries)
+    stats.add(vertices=int(np.sum(vertex_counts)))
+    # GEE menamai keluaran `band` atau `band_<stat>` (persentil) -> pilih dengan regex
+    properties = ['idx'] + [f"{band}(_.*)?" for band in bands]
+    chunks = _run_chunks(ee, image, vertex_chunks(vertex_counts, chunk_size, max_vertices),
+                         lambda a, b: _polygon_collection(ee, idx[a:b], geometries[a:b]),
+                         max_workers, max_retries, backoff, scale, tile_scale, zonal_reducer(ee, stat),
+                         stats, sleep, properties=properties)
+
+    props = [p for chunk in chunks for p in chunk]
+    columns = {'idx': np.fromiter((p['idx'] for p in props), dtype=np.float64, count=len(props))}
+    for band in bands:
+        # None (semua piksel ter-mask) -> NaN
+        columns[band] = np.array([p.get(band, p.get(f"{band}_{stat}")) for p in props], dtype=np.float64)
+    return _sorted_columns([columns], list(columns))
+
+
+# ==============================================================================
+# 5. PERENCANA REFRESH - HANYA DATASET YANG JENDELANYA BERUBAH
+# ==============================================================================
+def window_signature(window):
+    """Identitas isi jendela: tanggal awal/akhir + akuisisi terbaru (jam diabaikan)."""
+    return window.start.date(), window.end.date(), window.latest
+
+
+@dataclass
+class RefreshPlan:
+    changed: list        # Dataset yang perlu diekstrak ulang
+    unchanged: list      # Dataset yang hasil ekstraksinya masih berlaku
+
+    @property
+    def up_to_date(self):
+        return not self.changed
+
+    def describe(self):
+        if self.up_to_date:
+            return "semua dataset belum berubah"
+        return f"berubah: {', '.join(self.changed)}" + (
+            f"; tetap: {', '.join(self.unchanged)}" if self.unchanged else "")
+
+
+def plan_refresh(previous, current):
+    """
+    Bandingkan jendela sebelumnya dan terbaru (dict key -> DataWindow).
+    Tanpa snapshot sebelumnya semua dataset dianggap berubah.
+    """
+    previous = previous or {}
+    changed, unchanged = [], []
+    for key, window in current.items():
+        old = previous.get(key)
+        if old is not None and window_signature(old) == window_signature(window):
+            unchanged.append(key)
+        else:
+            changed.append(key)
+    return RefreshPlan(changed, unchanged)
@@ -0,0 +1,424 @@
+"""
+SNAPSHOT DATA SATELIT & PENJADWAL LATAR BELAKANG
+Pipeline ekstraksi (resolusi jendela -> ekstraksi per dataset -> konversi
+satuan) dikemas menjadi Snapshot: frame nilai per desa + jendela data +
+waktu pembuatan. Snapshot terbaru disimpan atomik di disk dan di memori,
+sehingga sesi dashboard langsung membacanya tanpa menunggu Earth Engine.
+
+SnapshotScheduler menjalankan pipeline di thread latar belakang pada jam
+tetap (produk harian MOD11A1 & CHIRPS dicek beberapa kali sehari); ekstraksi
+hanya terjadi jika ada jendela yang berubah (plan_refresh). Tanpa start(),
+penjadwal yang sama dipakai on-demand: due() menandai jadwal yang sudah lewat
+dan pemanggil menjalankan run_once() saat snapshot benar-benar dibutuhkan.
+
+Mode sampling: nilai band di titik centroid desa (default), atau statistik
+zonal (mean / max / p90) di atas poligon desa yang disederhanakan. Biaya tiap
+ekstraksi (request, retry, vertex, detik) disimpan di Snapshot.cost.
+
+Seperti satellite_engine, modul ini tidak mengimpor Streamlit maupun `ee`:
+`ee` dan jam (`clock`) diberikan sebagai parameter agar bisa diuji dengan
+benchmarks/fake_ee.py dan waktu tiruan.
+"""
+import json
+import os
+import threading
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from extraction_cache import make_key
+from instrumentation import TRACER
+from map_layers import geojson_geometries
+from satellite_engine import (DATASETS, ZONAL_STATS, DataWindow, ExtractionStats, RefreshPlan, extract_columns,
+                              extract_zonal, fetch_layers, plan_refresh)
+
+SATELLITE_COLUMNS = ['LST', 'NDVI', 'Rain', 'LST_Date', 'NDVI_Date', 'Rain_Date']
+
+# Jam cek (waktu `clock`): produk harian rilis tidak menentu, cukup dicek tiap 6 jam
+DEFAULT_HOURS = (1, 7, 13, 19)
+
+# Mode sampling nilai per desa: titik centroid atau statistik zonal poligon
+SAMPLING_CENTROID = 'centroid'
+SAMPLING_MODES = (SAMPLING_CENTROID,) + tuple(f"zonal_{stat}" for stat in ZONAL_STATS)
+# Resolusi reduksi (m); toleransi simplifikasi poligon = setengah piksel
+EXTRACT_SCALE = 1000
+
+
+def _silent(level, message):
+    pass
+
+
+# ==============================================================================
+# 1. KONVERSI SATUAN (DI SERVER) & EKSTRAKSI PER DATASET
+# ==============================================================================
+# Konversi nilai mentah band -> satuan dashboard sebagai image math di GEE,
+# sebelum reduceRegions: piksel tidak valid di-mask, lalu di-unmask ke NODATA
+NODATA = -9999
+
+
+def _convert_lst(image):
+    # Kelvin (skala 0.02) -> Celcius, nilai <= 0 tidak valid
+    return image.updateMask(image.gt(0)).multiply(0.02).subtract(273.15)
+
+
+def _convert_ndvi(image):
+    # Skala 0.0001, clip ke range valid NDVI (-1 sampai 1), nilai 0 tidak valid
+    return image.updateMask(image.neq(0)).multiply(0.0001).clamp(-1, 1)
+
+
+def _convert_rain(image):
+    # Hujan: mm (sudah dalam satuan yang benar)
+    return image
+
+
+SERVER_CONVERTERS = {'LST': _convert_lst, 'NDVI': _convert_ndvi, 'Rain': _convert_rain}
+
+
+def window_label(key, window):
+    if key == 'Rain':
+        return f"{window.start.strftime('%d-%b-%Y')} s/d {window.end.strftime('%d-%b-%Y')}"
+    return window.end.strftime("%d-%B-%Y")
+
+
+@dataclass(frozen=True)
+class ZonalGeometry:
+    geometries: list             # Dict GeoJSON per desa (urutan = baris frame desa)
+    vertex_counts: np.ndarray    # Jumlah vertex per desa setelah simplifikasi
+    source_vertices: int         # Total vertex sebelum simplifikasi
+
+
+def prepare_zonal(geometries, scale=EXTRACT_SCALE):
+    """Sederhanakan poligon desa sekali (toleransi setengah piksel reduksi) untuk mode zonal."""
+    tolerance = scale / 2 / 111_320
+    simplified = shapely.simplify(geometries, tolerance, preserve_topology=True)
+    return ZonalGeometry(geojson_geometries(simplified), shapely.get_num_coordinates(simplified),
+                         int(shapely.get_num_coordinates(geometries).sum()))
+
+
+def extract_satellite_values(ee, villages, layers, chunk_size=500, max_workers=4, status=_silent,
+                             mode=SAMPLING_CENTROID, zonal=None, zonal_chunk_size=100, max_vertices=50_000,
+                             stats=None):
+    """Gabungkan band yang diminta (subset LST/NDVI/Rain) dalam satuan dashboard, ekstrak nilai per desa"""
+    combined = None
+    for key, res in layers.items():
+        image = SERVER_CONVERTERS[key](res.image)
+        combined = image if combined is None else combined.addBands(image)
+
+    extract_stats = stats if stats is not None else ExtractionStats()
+    bands = {key: DATASETS[key].out_band for key in layers}
+    if mode == SAMPLING_CENTROID:
+        # Ekstrak data per desa dari titik centroid (bertahap per chunk, paralel + retry),
+        # payload per chunk = satu list angka per band
+        status('info', f"📡 MENGEKSTRAK {', '.join(layers)} UNTUK {len(villages)} DESA "
+                       f"({-(-len(villages) // chunk_size)} chunk)...")
+        columns = extract_columns(
+            ee, combined.unmask(NODATA), list(bands.values()), villages.index, villages['lon'], villages['lat'],
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            scale=EXTRACT_SCALE,
+            tile_scale=4,
+            stats=extract_stats
+        )
+    else:
+        # Statistik zonal di atas poligon: piksel ter-mask diabaikan reducer (tanpa unmask)
+        stat = mode.split('_', 1)[1]
+        status('info', f"📡 MENGEKSTRAK {', '.join(layers)} ({stat.upper()} ZONAL) UNTUK {len(villages)} DESA "
+                       f"({int(zonal.vertex_counts.sum()):,} vertex)...")
+        columns = extract_zonal(
+            ee, combined, list(bands.values()), villages.index, zonal.geometries, zonal.vertex_counts,
+            stat=stat,
+            chunk_size=zonal_chunk_size,
+            max_vertices=max_vertices,
+            max_workers=max_workers,
+            scale=EXTRACT_SCALE,
+            tile_scale=4,
+            stats=extract_stats
+        )
+
+    results = pd.DataFrame({'idx': columns['idx']})
+    for key, band in bands.items():
+        values = columns[band]
+        results[key] = np.where(values == NODATA, np.nan, values)
+        results[f'{key}_Date'] = window_label(key, layers[key].window)
+
+    status('success', f"✅ DATA SATELIT {', '.join(layers)} BERHASIL DITARIK! "
+                      f"({extract_stats.requests} request, {extract_stats.retries} retry, "
+                      f"{extract_stats.seconds:.1f} dtk)")
+    return results
+
+
+# ==============================================================================
+# 2. SNAPSHOT (FRAME + JENDELA) & STORE DISK ATOMIK
+# ==============================================================================
+@dataclass(frozen=True)
+class Snapshot:
+    frame: pd.DataFrame          # Indeks = idx desa, kolom SATELLITE_COLUMNS (NaN = tidak valid)
+    windows: dict                # key -> DataWindow
+    created_at: datetime
+    version: str = field(default_factory=lambda: uuid.uuid4().hex)
+    plan: RefreshPlan = None     # Dataset yang diekstrak ulang vs dipakai ulang dari snapshot sebelumnya
+    mode: str = SAMPLING_CENTROID
+    cost: dict = None            # Biaya ekstraksi build ini: request, retry, fitur, vertex, detik
+    geometry_hash: str = None    # Versi layer desa yang diekstrak (kolom hanya dipakai ulang jika sama)
+
+    def age(self, now):
+        return now - self.created_at
+
+
+def _window_to_json(win):
+    return {'start': win.start.isoformat(), 'end': win.end.isoformat(),
+            'latest': win.latest.isoformat(), 'days_back': win.days_back}
+
+
+def _window_from_json(key, data):
+    return DataWindow(key, datetime.fromisoformat(data['start']), datetime.fromisoformat(data['end']),
+                      datetime.fromisoformat(data['latest']), data['days_back'])
+
+
+class SnapshotStore:
+    """Snapshot terakhir sebagai Parquet (metadata jendela di schema), ditulis tmp + os.replace."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, snapshot):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        meta = {
+            'version': snapshot.version,
+            'created_at': snapshot.created_at.isoformat(),
+            'changed': snapshot.plan.changed if snapshot.plan else list(snapshot.windows),
+            'unchanged': snapshot.plan.unchanged if snapshot.plan else [],
+            'windows': {key: _window_to_json(win) for key, win in snapshot.windows.items()},
+            'mode': snapshot.mode,
+            'cost': snapshot.cost,
+            'geometry_hash': snapshot.geometry_hash,
+        }
+        table = pa.Table.from_pandas(snapshot.frame.rename_axis('idx').reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b"rfcc_snapshot": json.dumps(meta).encode()})
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        import pyarrow.parquet as pq
+
+        try:
+            table = pq.read_table(self.path)
+            meta = json.loads(table.schema.metadata[b"rfcc_snapshot"])
+        except (OSError, KeyError, ValueError):
+            return None
+        return Snapshot(
+            frame=table.to_pandas().set_index('idx'),
+            windows={key: _window_from_json(key, win) for key, win in meta['windows'].items()},
+            created_at=datetime.fromisoformat(meta['created_at']),
+            version=meta['version'],
+            plan=RefreshPlan(meta.get('changed', []), meta.get('unchanged', [])),
+            mode=meta.get('mode', SAMPLING_CENTROID),
+            cost=meta.get('cost'),
+            geometry_hash=meta.get('geometry_hash'),
+        )
+
+
+def build_snapshot(ee, resolver, cache, villages, geometry_hash, previous=None, now=None,
+                   timeout=None, chunk_size=500, max_workers=4, status=_silent,
+                   mode=SAMPLING_CENTROID, zonal=None, zonal_chunk_size=100, max_vertices=50_000):
+    """
+    Jalankan pipeline sekali. Mengembalikan `previous` apa adanya jika tidak ada
+    jendela yang berubah; selain itu Snapshot baru: kolom dataset yang tidak
+    berubah disalin dari `previous` (mode & hash geometri sama), hanya dataset
+    berubah yang dicari di cache atau diekstrak ulang. Mode zonal butuh `zonal`
+    (hasil prepare_zonal, urutan sama dengan `villages`).
+    """
+    now = now or resolver.clock()
+    calls_before = resolver.round_trips
+
+    def on_layer_done(res):
+        if not res.ok:
+            status('warning', f"⚠️ {res.key}: {res.error}")
+            return
+        win = res.window
+        period = f"{win.start.strftime('%d-%b-%Y')} s/d {win.end.strftime('%d-%b-%Y')}"
+        if res.key == 'LST':
+            status('info', f"✅ SUHU (LST): Data ditemukan dari {period} ({res.seconds:.1f} dtk)")
+        elif res.key == 'NDVI':
+            status('info', f"✅ VEGETASI (NDVI): Data ditemukan dari {period} ({res.seconds:.1f} dtk)")
+        else:
+            status('info', f"✅ HUJAN (CHIRPS): Data 30 hari dari {period} ({res.seconds:.1f} dtk)")
+
+    layers = fetch_layers(resolver, DATASETS.values(), now, timeout=timeout, on_done=on_layer_done)
+    failed = [res for res in layers.values() if not res.ok]
+    if failed:
+        raise Exception("; ".join(str(res.error) for res in failed))
+    status('info', f"✅ SEMUA JENDELA DATA SIAP ({resolver.round_trips - calls_before} panggilan GEE)")
+
+    windows = {key: res.window for key, res in layers.items()}
+    # Snapshot dengan mode sampling lain atau layer desa lain tidak bisa dipakai ulang
+    reusable = previous is not None and previous.mode == mode and previous.geometry_hash == geometry_hash
+    previous_windows = previous.windows if reusable else None
+    plan = plan_refresh(previous_windows, windows)
+    if previous_windows is not None and plan.up_to_date:
+        status('success', "✅ DATA SATELIT SUDAH TERBARU (tidak ada akuisisi baru, tidak ada yang ditarik ulang)")
+        return previous
+
+    # Dataset yang jendelanya tidak berubah disalin langsung dari snapshot sebelumnya,
+    # tidak bergantung pada TTL cache disk (entri LST & NDVI bisa sudah kedaluwarsa
+    # saat hari baru CHIRPS masuk). Dataset berubah dicari dulu di cache disk:
+    # kunci = jendela satu dataset + hash file geometri desa (+ mode zonal)
+    extra = "" if mode == SAMPLING_CENTROID else mode
+    band_keys = {key: make_key({key: win}, geometry_hash, extra) for key, win in windows.items()}
+    extract_stats = ExtractionStats()
+    with cache.lock(make_key(windows, geometry_hash, extra)):
+        parts, missing = [], []
+        if previous_windows is not None and plan.unchanged:
+            parts.append(previous.frame[[col for key in plan.unchanged for col in (key, f'{key}_Date')]])
+        for key in plan.changed:
+            cached = cache.get(band_keys[key])
+            if cached is None:
+                missing.append(key)
+            else:
+                parts.append(cached.set_index('idx'))
+
+        if missing:
+            if parts:
+                status('info', f"♻️ {', '.join(k for k in layers if k not in missing)} DIPAKAI ULANG, "
+                               f"MENARIK ULANG: {', '.join(missing)}")
+            with TRACER.span("extract", bands=",".join(missing), mode=mode):
+                fresh = extract_satellite_values(ee, villages, {key: layers[key] for key in missing},
+                                                 chunk_size=chunk_size, max_workers=max_workers, status=status,
+                                                 mode=mode, zonal=zonal, zonal_chunk_size=zonal_chunk_size,
+                                                 max_vertices=max_vertices, stats=extract_stats)
+            for key in missing:
+                cache.put(band_keys[key], fresh[['idx', key, f'{key}_Date']])
+            parts.append(fresh.set_index('idx'))
+        else:
+            status('success', "✅ DATA SATELIT REAL DIMUAT TANPA EKSTRAKSI (snapshot sebelumnya / cache)")
+
+    frame = pd.concat(parts, axis=1, join='inner')[SATELLITE_COLUMNS]
+    cost = {'requests': extract_stats.requests, 'retries': extract_stats.retries,
+            'features': extract_stats.features, 'vertices': extract_stats.vertices,
+            'seconds': round(extract_stats.seconds, 3)}
+    return Snapshot(frame, windows, now, plan=plan, mode=mode, cost=cost, geometry_hash=geometry_hash)
+
+
+# ==============================================================================
+# 3. PENJADWAL LATAR BELAKANG
+# ==============================================================================
+def next_run_time(now, hours=DEFAULT_HOURS):
+    """Jadwal berikutnya (> now) pada salah satu jam `hours`."""
+    for day in range(2):
+        base = (now + timedelta(days=day)).replace(minute=0, second=0, microsecond=0)
+        for hour in sorted(hours):
+            candidate = base.replace(hour=hour)
+            if candidate > now:
+                return candidate
+    return now + timedelta(days=1)
+
+
+class SnapshotScheduler:
+    """
+    Thread daemon yang memperbarui snapshot pada `hours` (dan sekali saat start).
+
+    `build(previous)` mengembalikan Snapshot (boleh objek `previous` yang sama
+    jika tidak ada perubahan). Publikasi = ganti referensi di bawah lock +
+    tulis store atomik; pembaca tidak pernah melihat snapshot setengah jadi.
+    `on_publish(snapshot)` dipanggil sekali per snapshot baru (mis. menulis
+    riwayat risiko); kegagalannya tidak membatalkan publikasi.
+
+    Tanpa start() tidak ada thread: due() True jika belum pernah jalan atau
+    jadwal berikutnya (atau jeda retry setelah gagal) sudah lewat.
+    """
+
+    def __init__(self, build, store=None, clock=datetime.now, hours=DEFAULT_HOURS,
+                 retry_seconds=900, on_error=None, on_publish=None):
+        self.build = build
+        self.store = store
+        self.clock = clock
+        self.hours = hours
+        self.retry_seconds = retry_seconds
+        self.on_error = on_error
+        self.on_publish = on_publish
+        self.runs = 0
+        self.last_error = None
+        self.next_run = None
+        self._latest = store.load() if store is not None else None
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    def publish(self, snapshot):
+        with self._lock:
+            if snapshot is self._latest:
+                return False
+            self._latest = snapshot
+        if self.store is not None:
+            self.store.save(snapshot)
+        if self.on_publish is not None:
+            try:
+                self.on_publish(snapshot)
+            except Exception as e:
+                self._report(e)
+        return True
+
+    def _report(self, error):
+        if self.on_error:
+            self.on_error(error)
+        else:
+            traceback.print_exc()
+
+    def run_once(self, status=None):
+        """Satu putaran pipeline (dipakai thread, mode on-demand & tombol refresh). Satu putaran dalam satu waktu."""
+        with self._run_lock:
+            kwargs = {'status': status} if status is not None else {}
+            try:
+                with TRACER.span("build_snapshot"):
+                    snapshot = self.build(self.latest(), **kwargs)
+            except Exception as e:
+                self.last_error = e
+                self.next_run = self.clock() + timedelta(seconds=self.retry_seconds)
+                raise
+            self.runs += 1
+            self.last_error = None
+            self.next_run = next_run_time(self.clock(), self.hours)
+            self.publish(snapshot)
+            return snapshot
+
+    def due(self):
+        """Mode on-demand (thread tidak berjalan): perlu run_once() sebelum snapshot dipakai."""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        return self.next_run is None or self.clock() >= self.next_run
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self._report(e)
+            wait = max(0.0, (self.next_run - self.clock()).total_seconds())
+            self._stop.wait(wait)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="rfcc-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,103 @@
+"""
+SNAPSHOT TERSKOR BERSAMA (READ-ONLY)
+Frame desa terskor dibangun sekali per versi (snapshot satelit + sumber skor +
+CSV titik api) dan dibagi ke semua sesi dashboard. Sesi hanya menyimpan state
+tampilan kecil (versi, urutan tabel, seleksi), sehingga memori tidak tumbuh
+linear dengan jumlah operator yang membuka dashboard saat darurat kebakaran.
+
+    score_snapshot        - layer desa + nilai satelit + skor model & rumus
+                            (sekali per snapshot, dari ukuran float64)
+    build_scored_snapshot - level risiko per sumber skor + kolom titik api +
+                            permutasi urut tabel (sekali per versi)
+
+Frame di ScoredSnapshot dibagi antar sesi dan tidak boleh diubah; kolom baru
+dibuat pada salinan dangkal (`copy(deep=False)`) sehingga geometri shapely dan
+kolom yang tidak berubah tetap dipakai bersama.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import TRACER
+from risk_engine import apply_score_source, calculate_risk, model_score
+from table_view import SortIndex
+
+# Ukuran satelit & skor disimpan float32 (7 digit signifikan, jauh di atas presisi sensor)
+MEASUREMENT_COLUMNS = ('LST', 'NDVI', 'Rain', 'prob_model')
+DATE_COLUMNS = ('LST_Date', 'NDVI_Date', 'Rain_Date')
+
+
+def join_satellite_data(df, snapshot):
+    """Gabungkan nilai satelit snapshot ke layer desa; nilai kosong (awan) diisi median"""
+    # Join berdasarkan idx -> indeks frame tetap indeks layer desa (dipakai lookup peta)
+    df_final = df.join(snapshot.frame, how='inner')
+
+    # Isi nilai None dengan median (untuk desa yang mungkin tertutup awan)
+    for col in ('LST', 'NDVI', 'Rain'):
+        if df_final[col].isna().any():
+            df_final[col] = df_final[col].fillna(df_final[col].median())
+
+    return df_final
+
+
+def score_snapshot(df_base, snapshot, risk_model):
+    """Layer desa + nilai satelit + skor model KNN (jika ada) + skor rumus. Mengembalikan (frame, ModelScore)"""
+    with TRACER.span("join_satellite"):
+        df_sat = join_satellite_data(df_base, snapshot)
+    scored = None
+    if risk_model is not None:
+        # Inferensi batch semua desa sekali per snapshot data satelit
+        with TRACER.span("model_score"):
+            scored = model_score(risk_model, df_sat['LST'], df_sat['NDVI'], df_sat['Rain'])
+        df_sat['prob_model'] = scored.prob_pct
+    with TRACER.span("calculate_risk"):
+        calculate_risk(df_sat)
+    # Ringkas setelah semua skor (fitur model, skor rumus, status kekeringan) dihitung dari float64
+    return compact_measurements(df_sat), scored
+
+
+def compact_measurements(df):
+    """Kolom ukuran -> float32, label tanggal (satu nilai per dataset) -> Categorical."""
+    for col in MEASUREMENT_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype(np.float32)
+    for col in DATE_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def attach_hotspots(df, hotspots):
+    """Sisipkan jumlah titik api per desa tepat setelah prob_pct (0 untuk desa tanpa deteksi)"""
+    if 'hotspot' in df:
+        df.drop(columns='hotspot', inplace=True)
+    if hotspots is not None:
+        df.insert(df.columns.get_loc('prob_pct') + 1, 'hotspot', hotspots.village.reindex(df.index, fill_value=0))
+
+
+def scored_version(snapshot_version, score_source, hotspot_version):
+    return f"{snapshot_version}-{score_source}-{hotspot_version[:8]}"
+
+
+@dataclass(frozen=True)
+class ScoredSnapshot:
+    version: str
+    frame: pd.DataFrame      # Read-only, dibagi antar sesi
+    inference: object        # risk_engine.ModelScore atau None
+    hotspots: object         # hotspot_join.HotspotCounts atau None
+    sort_index: SortIndex
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum()) + self.sort_index.nbytes
+
+
+def build_scored_snapshot(df_sat, inference, score_source, hotspots, version):
+    """Frame hasil score_snapshot -> ScoredSnapshot untuk satu sumber skor & versi CSV titik api."""
+    # Skor sudah dihitung di score_snapshot; di sini hanya pilih sumber skor (ukuran float32 tidak dipakai)
+    frame = apply_score_source(df_sat.copy(deep=False), score_source)
+    attach_hotspots(frame, hotspots)
+    with TRACER.span("sort_index"):
+        sort_index = SortIndex(frame)
+    return ScoredSnapshot(version, frame, inference, hotspots, sort_index)
@@ -0,0 +1,109 @@
+"""
+TRAINING STREAMING (OUT-OF-CORE)
+Dataset harian per desa (ratusan juta baris) tidak pernah dimuat utuh:
+CSV dibaca per chunk, dibersihkan & diubah jadi fitur X1/X2/X3 per chunk,
+statistik scaler diperbarui dengan StandardScaler.partial_fit, lalu fitur
+ditulis berurutan ke file biner float32 yang dibuka kembali sebagai memmap.
+
+Isi direktori store:
+    X.f32          - fitur (baris, 3) float32, row-major
+    y.u8           - label TARGET uint8
+    manifest.json  - jumlah baris, rumus fitur, statistik scaler (ditulis terakhir)
+"""
+import json
+import os
+import resource
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from fire_features import FEATURES, FORMULA_MULTIPLY, RAW_COLUMNS, clean_numeric, physics_features
+
+MANIFEST = "manifest.json"
+
+
+def peak_rss_mib():
+    """RSS puncak proses (VmHWM Linux, fallback ru_maxrss)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TrainingStore:
+    """Store fitur siap latih: X & y sebagai memmap read-only + statistik scaler."""
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.rows = manifest['rows']
+        self.formula = manifest['formula']
+        self.mean = np.asarray(manifest['mean'], dtype=np.float64)
+        self.scale = np.asarray(manifest['scale'], dtype=np.float64)
+        self.positives = manifest['positives']
+        shape = (self.rows, len(FEATURES))
+        self.X = np.memmap(os.path.join(path, "X.f32"), dtype=np.float32, mode='r', shape=shape) \
+            if self.rows else np.empty(shape, dtype=np.float32)
+        self.y = np.memmap(os.path.join(path, "y.u8"), dtype=np.uint8, mode='r', shape=(self.rows,)) \
+            if self.rows else np.empty(0, dtype=np.uint8)
+
+    @classmethod
+    def open(cls, path):
+        with open(os.path.join(path, MANIFEST)) as f:
+            return cls(path, json.load(f))
+
+    def standardized(self, rows=None, chunk_rows=1_000_000):
+        """Fitur ter-standardisasi (float32) untuk `rows` (indeks) atau semua baris, diproses per chunk."""
+        index = np.arange(self.rows) if rows is None else np.asarray(rows)
+        out = np.empty((len(index), len(FEATURES)), dtype=np.float32)
+        for start in range(0, len(index), chunk_rows):
+            part = index[start:start + chunk_rows]
+            out[start:start + len(part)] = (self.X[part] - self.mean) / self.scale
+        return out
+
+
+def build_training_store(csv_path, out_dir, formula=FORMULA_MULTIPLY, chunksize=500_000, progress=None):
+    """CSV mentah -> store fitur float32 + statistik scaler, tanpa memuat CSV utuh. Mengembalikan TrainingStore."""
+    from sklearn.preprocessing import StandardScaler
+
+    tmp_dir = f"{out_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    scaler = StandardScaler()
+    rows = positives = 0
+    t0 = time.perf_counter()
+    with open(os.path.join(tmp_dir, "X.f32"), 'wb') as fx, open(os.path.join(tmp_dir, "y.u8"), 'wb') as fy:
+        # Hanya kolom fitur mentah + label yang dibaca; kolom nama/ID tidak pernah masuk RAM
+        reader = pd.read_csv(csv_path, usecols=RAW_COLUMNS + ['TARGET'], chunksize=chunksize)
+        for chunk in reader:
+            X = physics_features(clean_numeric(chunk['LST_Max_2024_C']),
+                                 clean_numeric(chunk['NDVI_Max_2024']),
+                                 clean_numeric(chunk['Rain_Max_2024_mm']), formula)
+            y = pd.to_numeric(chunk['TARGET'], errors='coerce').fillna(0).astype(np.uint8).to_numpy()
+            scaler.partial_fit(X)
+            fx.write(X.astype(np.float32).tobytes())
+            fy.write(y.tobytes())
+            rows += len(y)
+            positives += int(y.sum())
+            if progress:
+                progress(rows, time.perf_counter() - t0)
+
+    manifest = {
+        'rows': rows, 'positives': positives, 'formula': formula, 'features': FEATURES,
+        'mean': scaler.mean_.tolist() if rows else [0.0] * len(FEATURES),
+        'scale': scaler.scale_.tolist() if rows else [1.0] * len(FEATURES),
+        'source': os.path.abspath(csv_path), 'seconds': time.perf_counter() - t0,
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    # Ganti store lama setelah store baru lengkap
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return TrainingStore.open(out_dir)
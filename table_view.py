@@ -0,0 +1,83 @@
+"""
+TABEL DESA: URUTAN & SELEKSI TANPA SALINAN FRAME
+Permutasi argsort untuk tiap kolom urut dihitung sekali per versi data
+(snapshot + sumber skor), lalu dipakai ulang di setiap rerun. Tabel hanya
+mengambil kolom tampilan dengan `take(permutasi)`; baris yang diklik dipetakan
+kembali ke ID desa stabil (indeks frame = idx layer desa) lewat permutasi yang
+sama, sehingga sesi cukup menyimpan (versi, kolom, arah) alih-alih salinan
+frame terurut.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Label pilihan urutan di dashboard -> kolom frame
+SORT_KEYS = {
+    "Nama Desa": 'nama_desa',
+    "Tingkat Risiko (Probabilitas)": 'prob_pct',
+    "Curah Hujan (Rain)": 'Rain',
+    "Titik Api (FIRMS)": 'hotspot',
+}
+TABLE_COLUMNS = ['nama_desa', 'kabupaten', 'level', 'prob_pct', 'hotspot', 'LST', 'Rain', 'NDVI', 'status_kekeringan']
+
+
+@dataclass(frozen=True)
+class TableView:
+    """State tampilan tabel yang disimpan per sesi (kecil, tanpa data)."""
+    version: str
+    column: str
+    ascending: bool
+
+
+def _sort_key(values):
+    """Kunci numerik untuk argsort: angka apa adanya, teks -> peringkat leksikografis; NaN tetap NaN."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Peringkat leksikografis kategori (urutan kategori bisa urutan kemunculan)
+        categories = values.cat.categories
+        if not len(categories):
+            return np.full(len(values), np.nan)
+        rank = np.empty(len(categories), dtype=np.float64)
+        rank[np.argsort(categories.to_numpy(dtype=object).astype(str), kind='stable')] = np.arange(len(categories))
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes < 0, np.nan, rank[codes])
+    codes, _ = pd.factorize(values, sort=True)
+    return np.where(codes < 0, np.nan, codes).astype(np.float64)
+
+
+class SortIndex:
+    """Permutasi naik & turun (stabil, NaN di akhir) untuk kolom `columns` yang ada di satu versi frame."""
+
+    def __init__(self, df, columns=tuple(SORT_KEYS.values()), table_columns=TABLE_COLUMNS):
+        self.ids = df.index.to_numpy()
+        self.table = df[[c for c in table_columns if c in df]]
+        self._perm = {}
+        self.columns = []
+        dtype = np.int32 if len(df) < 2**31 else np.int64
+        for col in columns:
+            if col not in df:
+                continue
+            self.columns.append(col)
+            key = _sort_key(df[col])
+            self._perm[(col, True)] = np.argsort(key, kind='stable').astype(dtype)
+            self._perm[(col, False)] = np.argsort(-key, kind='stable').astype(dtype)
+
+    def order(self, column, ascending=True):
+        return self._perm[(column, ascending)]
+
+    def rows(self, column, ascending=True):
+        """Kolom tampilan dalam urutan terpilih (indeks = ID desa)."""
+        return self.table.take(self.order(column, ascending))
+
+    def village_at(self, column, ascending, position):
+        """ID desa pada baris ke-`position` tabel terurut, None jika di luar jangkauan."""
+        order = self.order(column, ascending)
+        if not 0 <= position < len(order):
+            return None
+        return self.ids[order[position]]
+
+    @property
+    def nbytes(self):
+        return sum(p.nbytes for p in self._perm.values()) + self.ids.nbytes
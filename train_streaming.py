@@ -0,0 +1,81 @@
+"""
+TRAINING KNN STREAMING
+Latih indeks tetangga KNN (knn_index.py) dari CSV riwayat harian per desa
+yang terlalu besar untuk pd.read_csv utuh. CSV diubah per chunk menjadi store
+fitur float32 (stream_training.py), lalu model dilatih dari memmap store.
+RSS puncak proses dilaporkan di tiap tahap.
+
+Pemakaian:
+    python train_streaming.py --csv data/riwayat_harian.csv
+    python train_streaming.py --csv data/riwayat_harian.csv --backend ivf --sample 20000000
+    python train_streaming.py --reuse-store --store data/riwayat_harian.store
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from fire_features import FORMULAS, FORMULA_MULTIPLY
+from knn_index import BACKENDS, KNNIndexModel
+from stream_training import TrainingStore, build_training_store, peak_rss_mib
+
+parser = argparse.ArgumentParser(description="Training KNN out-of-core dari CSV besar")
+parser.add_argument('--csv', default=os.path.join("data", "DATA_SMOTE_ENN_PRESERVATIF.csv"))
+parser.add_argument('--store', default=None, help="Direktori store fitur (default: <csv>.store)")
+parser.add_argument('--reuse-store', action='store_true', help="Pakai store yang sudah ada, tanpa baca CSV")
+parser.add_argument('--chunksize', type=int, default=500_000)
+parser.add_argument('--formula', default=FORMULA_MULTIPLY, choices=FORMULAS)
+parser.add_argument('--backend', default='kd_tree', choices=BACKENDS)
+parser.add_argument('--sample', type=int, default=None, help="Maks. baris latih (acak), default semua")
+parser.add_argument('--holdout', type=float, default=0.01, help="Fraksi baris untuk evaluasi")
+parser.add_argument('--out', default=os.path.join("models", "streaming_model.npz"))
+args = parser.parse_args()
+
+store_dir = args.store or os.path.splitext(args.csv)[0] + ".store"
+print("🚀 TRAINING STREAMING KNN")
+
+# --- 1. CSV -> STORE FITUR (PER CHUNK) ---
+if args.reuse_store:
+    store = TrainingStore.open(store_dir)
+    print(f"📦 Store dipakai ulang: {store_dir} ({store.rows:,} baris)")
+else:
+    if not os.path.exists(args.csv):
+        print(f"❌ File tidak ditemukan: {args.csv}")
+        exit(1)
+
+    def progress(rows, seconds):
+        print(f"   ⏳ {rows:,} baris ({rows / max(seconds, 1e-9):,.0f} baris/detik, RSS puncak {peak_rss_mib():.0f} MiB)")
+
+    t0 = time.perf_counter()
+    store = build_training_store(args.csv, store_dir, formula=args.formula,
+                                 chunksize=args.chunksize, progress=progress)
+    print(f"✅ Store {store_dir}: {store.rows:,} baris dalam {time.perf_counter() - t0:.1f} detik "
+          f"| RSS puncak {peak_rss_mib():.0f} MiB")
+
+if store.rows == 0:
+    print("❌ Store kosong.")
+    exit(1)
+
+# --- 2. PILIH BARIS LATIH & EVALUASI ---
+rng = np.random.default_rng(42)
+order = rng.permutation(store.rows)
+n_test = int(store.rows * args.holdout)
+test_idx = np.sort(order[:n_test])
+train_idx = np.sort(order[n_test:n_test + args.sample] if args.sample else order[n_test:])
+
+# --- 3. FIT INDEKS TETANGGA DARI MEMMAP ---
+t0 = time.perf_counter()
+model = KNNIndexModel(backend=args.backend, feature_formula=store.formula)
+model.fit_scaled(store.standardized(train_idx), store.y[train_idx], store.mean, store.scale)
+model.save(args.out)
+print(f"✅ Model {args.backend} ({len(train_idx):,} baris latih) disimpan ke {args.out} "
+      f"({os.path.getsize(args.out) / 2**20:.1f} MiB) dalam {time.perf_counter() - t0:.1f} detik "
+      f"| RSS puncak {peak_rss_mib():.0f} MiB")
+
+if n_test:
+    from sklearn.metrics import accuracy_score, f1_score
+
+    y_test = np.asarray(store.y[test_idx])
+    y_pred = model.predict(np.asarray(store.X[test_idx], dtype=np.float64))
+    print(f"📊 Holdout {n_test:,} baris: F1 {f1_score(y_test, y_pred):.4f} | Akurasi {accuracy_score(y_test, y_pred):.4f}")
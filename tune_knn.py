@@ -0,0 +1,220 @@
+"""
+TUNING MODEL KNN (SWEEP PARALEL)
+Grid search k / bobot / scaler / varian rumus fitur dengan StratifiedKFold,
+dijalankan di process pool. Matriks fitur tiap varian rumus dihitung sekali,
+disimpan sebagai .npy di cache dan di-memory-map oleh semua worker & fold.
+
+Hasil:
+    models/sweep_leaderboard.csv / .json  - metrik rata-rata per konfigurasi + waktu
+    models/tuned_model.pkl                - Pipeline pemenang, dilatih ulang dengan semua data
+                                            (rumus fitur di atribut `feature_formula`)
+    models/tuned_model.json               - parameter pemenang (termasuk rumus fitur)
+
+Cache .npy dikunci isi CSV + fire_features.FEATURES_VERSION; --refresh-cache
+menghitung ulang fitur walau kuncinya sama.
+
+Pemakaian:
+    python tune_knn.py
+    python tune_knn.py --k 3 5 7 9 --folds 5 --workers 8 --metric f1
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from extraction_cache import DEFAULT_CACHE_DIR, file_fingerprint
+from fire_features import FEATURES, FEATURES_VERSION, FORMULAS, clean_numeric, physics_features
+
+SCALERS = ('standard', 'minmax', 'robust')
+WEIGHTS = ('uniform', 'distance')
+METRICS = ('f1', 'recall', 'precision', 'accuracy')
+
+
+def make_pipeline_for(k, weights, scaler):
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+    scaler_cls = {'standard': StandardScaler, 'minmax': MinMaxScaler, 'robust': RobustScaler}[scaler]
+    return make_pipeline(scaler_cls(), KNeighborsClassifier(n_neighbors=k, weights=weights))
+
+
+# ==============================================================================
+# 1. CACHE FITUR (SEKALI PER VARIAN RUMUS)
+# ==============================================================================
+def cached_features(data_path, formulas, cache_dir, refresh=False):
+    """Hitung/ambil matriks fitur per rumus + label. Mengembalikan dict rumus -> path .npy, path label."""
+    # Versi kode fitur ikut di kunci: perubahan clean_numeric/physics_features tidak memakai cache lama
+    key = f"{file_fingerprint(data_path)[:16]}_v{FEATURES_VERSION}"
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = {f: os.path.join(cache_dir, f"fitur_{key}_{f}.npy") for f in formulas}
+    y_path = os.path.join(cache_dir, f"target_{key}.npy")
+
+    if not refresh and all(os.path.exists(p) for p in [*paths.values(), y_path]):
+        return paths, y_path
+
+    df = pd.read_csv(data_path)
+    # Kolom mentah dibersihkan sekali, dipakai semua rumus
+    lst, ndvi, rain = (clean_numeric(df[col]) for col in ('LST_Max_2024_C', 'NDVI_Max_2024', 'Rain_Max_2024_mm'))
+    y = pd.to_numeric(df['TARGET'], errors='coerce').fillna(0).astype(int).to_numpy()
+    np.save(y_path, y)
+    for formula, path in paths.items():
+        np.save(path, physics_features(lst, ndvi, rain, formula))
+    return paths, y_path
+
+
+# ==============================================================================
+# 2. WORKER (SATU KONFIGURASI x SATU FOLD)
+# ==============================================================================
+_worker = {}
+
+
+def _init_worker(feature_paths, y_path, splits):
+    # Memory-map: semua fold & konfigurasi di worker ini berbagi halaman yang sama
+    _worker['X'] = {f: np.load(p, mmap_mode='r') for f, p in feature_paths.items()}
+    _worker['y'] = np.load(y_path, mmap_mode='r')
+    _worker['splits'] = splits
+
+
+def _run_fold(config, fold):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    X, y = _worker['X'][config['formula']], _worker['y']
+    train_idx, test_idx = _worker['splits'][fold]
+    model = make_pipeline_for(config['k'], config['weights'], config['scaler'])
+
+    t0 = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    y_pred = model.predict(X[test_idx])
+    predict_seconds = time.perf_counter() - t0
+
+    y_test = y[test_idx]
+    return {
+        **config, 'fold': fold,
+        'f1': f1_score(y_test, y_pred, zero_division=0),
+        'recall': recall_score(y_test, y_pred, zero_division=0),
+        'precision': precision_score(y_test, y_pred, zero_division=0),
+        'accuracy': accuracy_score(y_test, y_pred),
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+    }
+
+
+# ==============================================================================
+# 3. SWEEP & LEADERBOARD
+# ==============================================================================
+def run_sweep(feature_paths, y_path, ks, weights, scalers, folds=5, workers=None,
+              metric='f1', seed=42, progress=None):
+    """Jalankan grid x fold di process pool. Mengembalikan (leaderboard, hasil per fold, detik)."""
+    from sklearn.model_selection import StratifiedKFold
+
+    t_start = time.perf_counter()
+    formulas = list(feature_paths)
+    y = np.load(y_path)
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(np.zeros(len(y)), y))
+
+    configs = [{'k': k, 'weights': w, 'scaler': s, 'formula': f}
+               for f, s, w, k in itertools.product(formulas, scalers, weights, ks)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(feature_paths, y_path, splits)) as pool:
+        futures = [pool.submit(_run_fold, config, fold) for config in configs for fold in range(folds)]
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows.append(future.result())
+            if progress:
+                progress(done, len(futures))
+
+    per_fold = pd.DataFrame(rows)
+    keys = ['formula', 'scaler', 'weights', 'k']
+    board = per_fold.groupby(keys).agg(
+        **{f"{m}_mean": (m, 'mean') for m in METRICS},
+        **{f"{metric}_std": (metric, 'std')},
+        fit_seconds=('fit_seconds', 'sum'),
+        predict_seconds=('predict_seconds', 'sum'),
+    ).reset_index()
+    board = board.sort_values([f"{metric}_mean", f"{metric}_std"], ascending=[False, True]).reset_index(drop=True)
+    board.insert(0, 'rank', np.arange(1, len(board) + 1))
+    return board, per_fold, time.perf_counter() - t_start
+
+
+def save_winner(board, feature_paths, y_path, data_path, out_dir, metric):
+    """Latih ulang konfigurasi terbaik dengan semua data lalu simpan ke models/."""
+    import joblib
+
+    best = board.iloc[0]
+    model = make_pipeline_for(int(best['k']), best['weights'], best['scaler'])
+    X = pd.DataFrame(np.load(feature_paths[best['formula']]), columns=FEATURES)
+    model.fit(X, np.load(y_path))
+    # Dibaca risk_engine.model_score: inferensi dashboard memakai rumus fitur yang sama dengan data latih
+    model.feature_formula = best['formula']
+
+    model_path = os.path.join(out_dir, "tuned_model.pkl")
+    joblib.dump(model, model_path)
+    meta = {
+        'k': int(best['k']), 'weights': best['weights'], 'scaler': best['scaler'],
+        'formula': best['formula'], 'metric': metric,
+        'score': float(best[f"{metric}_mean"]), 'data': os.path.basename(data_path),
+    }
+    with open(os.path.join(out_dir, "tuned_model.json"), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return model_path, meta
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Sweep hyperparameter KNN + StratifiedKFold paralel")
+    parser.add_argument('--data', default=os.path.join(script_dir, 'data', 'DATA_SMOTE_ENN_PRESERVATIF.csv'))
+    parser.add_argument('--out', default=os.path.join(script_dir, 'models'))
+    parser.add_argument('--k', type=int, nargs='+', default=[3, 5, 7, 9, 11, 15, 21])
+    parser.add_argument('--weights', nargs='+', default=list(WEIGHTS), choices=WEIGHTS)
+    parser.add_argument('--scaler', nargs='+', default=list(SCALERS), choices=SCALERS)
+    parser.add_argument('--formula', nargs='+', default=list(FORMULAS), choices=FORMULAS)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="default: jumlah CPU")
+    parser.add_argument('--metric', default='f1', choices=METRICS)
+    parser.add_argument('--refresh-cache', action='store_true', help="Hitung ulang cache fitur .npy")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.data):
+        print(f"❌ Dataset tidak ditemukan: {args.data}")
+        exit(1)
+
+    n_configs = len(args.k) * len(args.weights) * len(args.scaler) * len(args.formula)
+    print(f"🚀 SWEEP KNN: {n_configs} konfigurasi x {args.folds} fold")
+
+    def progress(done, total):
+        if done % max(1, total // 10) == 0 or done == total:
+            print(f"   ⏳ {done}/{total} fold selesai")
+
+    t0 = time.perf_counter()
+    feature_paths, y_path = cached_features(args.data, args.formula, os.path.join(DEFAULT_CACHE_DIR, "sweep"),
+                                            refresh=args.refresh_cache)
+    print(f"   📦 Fitur {', '.join(args.formula)} siap ({time.perf_counter() - t0:.2f} detik, cache .npy)")
+
+    board, per_fold, seconds = run_sweep(feature_paths, y_path, args.k, args.weights, args.scaler,
+                                         folds=args.folds, workers=args.workers, metric=args.metric,
+                                         progress=progress)
+
+    os.makedirs(args.out, exist_ok=True)
+    board.to_csv(os.path.join(args.out, "sweep_leaderboard.csv"), index=False)
+    with open(os.path.join(args.out, "sweep_leaderboard.json"), 'w') as f:
+        json.dump({'metric': args.metric, 'folds': args.folds, 'wall_seconds': seconds,
+                   'leaderboard': board.to_dict(orient='records')}, f, indent=2)
+
+    print(f"\n🏆 LEADERBOARD (top 10, {args.metric}, {seconds:.1f} detik total)")
+    print(board.head(10).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    model_path, meta = save_winner(board, feature_paths, y_path, args.data, args.out, args.metric)
+    print(f"\n✅ Pemenang {meta} disimpan ke {model_path}")
+
+
+if __name__ == "__main__":
+    main()
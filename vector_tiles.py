@@ -0,0 +1,324 @@
+"""
+VECTOR TILE (MVT) LAYER DESA
+Mode opsional untuk deployment multi-provinsi: poligon desa dipra-render sekali
+menjadi Mapbox Vector Tile di file MBTiles (SQLite), lalu disajikan oleh
+endpoint tile lokal. Browser hanya mengunduh tile yang terlihat.
+
+Tile MBTiles hanya berisi geometri + ID desa (indeks layer desa). Atribut
+risiko (level / prob / warna) digabungkan berdasarkan ID saat tile disajikan,
+sehingga tile tidak perlu dibangun ulang setiap data satelit berubah.
+
+Butuh paket opsional `mapbox-vector-tile` (pip install mapbox-vector-tile).
+
+Alamat endpoint (app.py membaca environment atau st.secrets):
+    RFCC_TILE_HOST - alamat bind server tile (default 127.0.0.1)
+    RFCC_TILE_URL  - URL dasar tile yang dijangkau BROWSER (default kosong:
+                     http://127.0.0.1:<port>, hanya berlaku jika browser di
+                     mesin yang sama; mode MVT dimatikan untuk browser lain)
+
+Server bersama / Streamlit via https: browser memblokir tile http (mixed
+content) dan port 8765 biasanya tidak dibuka, jadi sajikan tile lewat reverse
+proxy di origin yang sama dengan dashboard, mis. nginx:
+
+    location /rfcc-tiles/ {
+        proxy_pass http://127.0.0.1:8765/;
+    }
+
+lalu set RFCC_TILE_URL="https://dashboard.contoh.go.id/rfcc-tiles". Untuk
+Codespaces / port forwarding, teruskan port tile juga dan isi RFCC_TILE_URL
+dengan URL publik port tersebut.
+"""
+import gzip
+import math
+import sqlite3
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import shapely
+import shapely.geometry
+
+from risk_engine import level_colors
+
+try:
+    import mapbox_vector_tile
+except ImportError:  # dependensi opsional
+    mapbox_vector_tile = None
+
+LAYER_NAME = "desa"
+EXTENT = 4096
+ORIGIN = 20037508.342789244   # Setengah keliling bumi di Web Mercator (meter)
+
+
+def mvt_available():
+    return mapbox_vector_tile is not None
+
+
+def require_mvt():
+    if mapbox_vector_tile is None:
+        raise ImportError("Mode vector tile butuh paket 'mapbox-vector-tile' (pip install mapbox-vector-tile)")
+
+
+# ==============================================================================
+# 1. MATEMATIKA TILE (WEB MERCATOR / XYZ)
+# ==============================================================================
+def lonlat_to_mercator(coords):
+    lon = np.clip(coords[:, 0], -180.0, 180.0)
+    lat = np.clip(coords[:, 1], -85.0511, 85.0511)
+    x = np.radians(lon) * (ORIGIN / math.pi)
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * (ORIGIN / math.pi)
+    return np.column_stack([x, y])
+
+
+def tile_size(z):
+    return 2 * ORIGIN / (2 ** z)
+
+
+def tile_bounds(z, x, y):
+    """Bounds tile XYZ dalam meter Mercator (minx, miny, maxx, maxy)."""
+    size = tile_size(z)
+    minx = -ORIGIN + x * size
+    maxy = ORIGIN - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tile_range(bounds, z):
+    """Rentang (x0, y0, x1, y1) tile XYZ yang menutupi bounds Mercator."""
+    size = tile_size(z)
+    n = 2 ** z - 1
+    x0 = int(max(0, (bounds[0] + ORIGIN) // size))
+    x1 = int(min(n, (bounds[2] + ORIGIN) // size))
+    y0 = int(max(0, (ORIGIN - bounds[3]) // size))
+    y1 = int(min(n, (ORIGIN - bounds[1]) // size))
+    return x0, y0, x1, y1
+
+
+# ==============================================================================
+# 2. BUILD MBTILES (GEOMETRI + ID SAJA)
+# ==============================================================================
+def build_mbtiles(geometries, ids, path, minzoom=6, maxzoom=12, buffer_px=64, progress=None):
+    """Pra-render poligon desa (lon/lat) ke MBTiles. Mengembalikan jumlah tile."""
+    require_mvt()
+    merc = shapely.transform(geometries, lonlat_to_mercator)
+    tree = shapely.STRtree(merc)
+    ids = np.asarray(ids)
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        DROP TABLE IF EXISTS metadata;
+        DROP TABLE IF EXISTS tiles;
+        CREATE TABLE metadata (name TEXT, value TEXT);
+        CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+        CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+    """)
+
+    lon_lat = shapely.bounds(geometries)
+    total = 0
+    for z in range(minzoom, maxzoom + 1):
+        size = tile_size(z)
+        # Simplifikasi 1 piksel tile per zoom (setara tier LOD peta GeoJSON)
+        simplified = shapely.simplify(merc, size / EXTENT, preserve_topology=True)
+        x0, y0, x1, y1 = tile_range(shapely.total_bounds(merc), z)
+        rows = []
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bounds = tile_bounds(z, x, y)
+                pad = size * buffer_px / EXTENT
+                clip_box = (bounds[0] - pad, bounds[1] - pad, bounds[2] + pad, bounds[3] + pad)
+                hits = tree.query(shapely.box(*clip_box), predicate='intersects')
+                if len(hits) == 0:
+                    continue
+                clipped = shapely.clip_by_rect(simplified[hits], *clip_box)
+                keep = ~shapely.is_empty(clipped)
+                features = [
+                    {"geometry": geom, "properties": {}, "id": int(vid)}
+                    for geom, vid in zip(clipped[keep], ids[hits][keep])
+                ]
+                if not features:
+                    continue
+                data = mapbox_vector_tile.encode(
+                    [{"name": LAYER_NAME, "features": features}],
+                    default_options={"quantize_bounds": bounds, "extents": EXTENT}
+                )
+                # MBTiles memakai skema TMS (baris dihitung dari bawah)
+                rows.append((z, x, (2 ** z - 1) - y, gzip.compress(data)))
+        con.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", rows)
+        total += len(rows)
+        if progress:
+            progress(z, len(rows))
+
+    metadata = {
+        "name": "desa", "format": "pbf", "type": "overlay",
+        "minzoom": str(minzoom), "maxzoom": str(maxzoom),
+        "bounds": ",".join(f"{v:.6f}" for v in (lon_lat[:, 0].min(), lon_lat[:, 1].min(),
+                                                  lon_lat[:, 2].max(), lon_lat[:, 3].max())),
+        "json": '{"vector_layers": [{"id": "desa", "fields": {}}]}',
+    }
+    con.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+    con.commit()
+    con.close()
+    return total
+
+
+# ==============================================================================
+# 3. ENDPOINT TILE LOKAL DENGAN JOIN ATRIBUT RISIKO
+# ==============================================================================
+class TileServer:
+    """
+    Server HTTP kecil: GET /tiles/{z}/{x}/{y}.pbf
+
+    `public_url` = URL dasar yang dipakai browser (mis. lewat reverse proxy);
+    tanpa itu url_template menunjuk langsung ke host:port server.
+
+    Tile diambil dari MBTiles, lalu atribut risiko versi terbaru ditempel
+    berdasarkan ID desa. Hasil per (versi, tile) disimpan di LRU. Satu server
+    per port; jika file MBTiles dibangun ulang, reload(fingerprint) membuka
+    ulang koneksi SQLite tanpa bind port baru.
+    """
+
+    def __init__(self, mbtiles_path, host="127.0.0.1", port=8765, cache_size=1024, fingerprint=None,
+                 public_url=None):
+        require_mvt()
+        self.mbtiles_path = mbtiles_path
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.fingerprint = fingerprint
+        self.version = None
+        self._generation = 0
+        self._attributes = {}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._httpd = None
+
+    @property
+    def url_template(self):
+        if self.public_url:
+            base = self.public_url.rstrip("/")
+        else:
+            # Bind ke semua interface -> browser lokal tetap memakai loopback
+            host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+            base = f"http://{host}:{self.port}"
+        return f"{base}/tiles/{{z}}/{{x}}/{{y}}.pbf"
+
+    def publish(self, version, attributes):
+        """Ganti atribut risiko aktif: dict ID desa -> dict properti."""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._attributes = attributes
+            self._cache.clear()
+
+    def reload(self, fingerprint):
+        """MBTiles dibangun ulang: kosongkan LRU, koneksi tiap thread dibuka ulang pada tile berikutnya."""
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return False
+            self.fingerprint = fingerprint
+            self._generation += 1
+            self._cache.clear()
+        return True
+
+    def _connection(self, generation):
+        con = getattr(self._local, "con", None)
+        if con is not None and self._local.generation != generation:
+            con.close()
+            con = None
+        if con is None:
+            con = sqlite3.connect(f"file:{self.mbtiles_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.con = con
+            self._local.generation = generation
+        return con
+
+    def tile(self, z, x, y):
+        with self._lock:
+            version, attributes, generation = self.version, self._attributes, self._generation
+            key = (version, z, x, y)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        row = self._connection(generation).execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, (2 ** z - 1) - y)
+        ).fetchone()
+        data = None
+        if row is not None:
+            decoded = mapbox_vector_tile.decode(gzip.decompress(row[0]))
+            features = [
+                {"geometry": shapely.geometry.shape(f["geometry"]), "id": f["id"],
+                 "properties": attributes.get(f["id"], {})}
+                for f in decoded.get(LAYER_NAME, {}).get("features", [])
+            ]
+            data = gzip.compress(mapbox_vector_tile.encode(
+                [{"name": LAYER_NAME, "features": features}],
+                default_options={"extents": EXTENT}
+            ), compresslevel=5)
+
+        with self._lock:
+            if version == self.version and generation == self._generation:
+                self._cache[key] = data
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return data
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                try:
+                    if len(parts) != 4 or parts[0] != "tiles" or not parts[3].endswith(".pbf"):
+                        raise ValueError
+                    z, x, y = int(parts[1]), int(parts[2]), int(parts[3][:-4])
+                except ValueError:
+                    self.send_error(404)
+                    return
+                data = server.tile(z, x, y)
+                if data is None:
+                    self.send_response(204)
+                    self.send_header("Access-Control-Allow-Origin", "*")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-protobuf")
+                self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="rfcc-tiles", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+def risk_attributes(df):
+    """Frame risiko -> dict ID desa -> properti tile (warna dipecah r/g/b untuk MVT)."""
+    colors = level_colors(df['level']).tolist()
+    return {
+        int(label): {
+            "nama": nama, "kab": kab, "level": level, "prob": round(float(prob), 1), "kering": kering,
+            "r": c[0], "g": c[1], "b": c[2],
+        }
+        for label, nama, kab, level, prob, kering, c in zip(
+            df.index, df['nama_desa'], df['kabupaten'], df['level'],
+            df['prob_pct'], df['status_kekeringan'], colors
+        )
+    }
@@ -0,0 +1,150 @@
+"""
+LAYER DESA
+Preprocessing layer poligon desa: standarisasi kolom, parsing WKT dan centroid.
+
+Semua operasi geometri memakai fungsi array shapely 2.x (satu pass di C atas
+array geometri), bukan `.apply` per baris. Hasilnya disimpan sekali sebagai
+store biner GeoParquet (WKB + centroid + bbox) sehingga startup dashboard
+tidak perlu parsing teks WKT lagi.
+
+Frame yang dikembalikan ringkas: teks WKT dibuang setelah parsing dan kolom
+teks (nama desa, kabupaten, dst.) disimpan sebagai Categorical.
+"""
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Standarisasi nama kolom dari berbagai sumber shapefile (BIG / BPS)
+COLUMN_MAP = {
+    'WADMKD': 'nama_desa',
+    'NAMOBJ': 'nama_desa',
+    'DESA': 'nama_desa',
+    'WADMKK': 'kabupaten',
+    'KABUPATEN': 'kabupaten'
+}
+
+
+def normalize_columns(df):
+    df.columns = [c.strip().upper() for c in df.columns]
+    df = df.rename(columns=COLUMN_MAP)
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    # Pastikan kolom nama_desa ada
+    if 'nama_desa' not in df.columns:
+        df['nama_desa'] = "Desa Tanpa Nama"
+    return df
+
+
+def parse_geometry(wkt):
+    """Array WKT (boleh berisi NaN) -> array geometri shapely (None untuk yang kosong)."""
+    values = pd.Series(wkt, copy=False)
+    text = np.where(values.notna(), values.astype(str), None)
+    return shapely.from_wkt(text)
+
+
+def prepare_village_frame(df):
+    """DataFrame mentah (kolom WKT) -> frame desa dengan geometry, lat & lon."""
+    df = normalize_columns(df)
+
+    # Konversi WKT ke geometry (vektor)
+    geoms = parse_geometry(df['WKT'])
+    valid = ~shapely.is_missing(geoms)
+    df = df.loc[valid].drop(columns=['WKT']).reset_index(drop=True)
+    geoms = geoms[valid]
+    df['geometry'] = geoms
+
+    # Hitung centroid sekali untuk seluruh array
+    centroids = shapely.centroid(geoms)
+    df['lat'] = shapely.get_y(centroids)
+    df['lon'] = shapely.get_x(centroids)
+    return df
+
+
+def compact_village_frame(df):
+    """Kolom teks -> Categorical dengan kategori urut leksikografis; sisa teks WKT dibuang."""
+    df = df.drop(columns=['WKT'], errors='ignore')
+    for col in df.columns:
+        if col == 'geometry':
+            continue
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Kamus Parquet berurutan kemunculan; urutkan agar sort tabel tetap alfabetis
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+        elif df[col].dtype == object:
+            df[col] = df[col].astype('category')
+    return df
+
+
+# ==============================================================================
+# STORE BINER (GeoParquet: geometri WKB + centroid + bbox)
+# ==============================================================================
+_GEOPARQUET_TYPES = {
+    shapely.GeometryType.POINT: "Point",
+    shapely.GeometryType.LINESTRING: "LineString",
+    shapely.GeometryType.POLYGON: "Polygon",
+    shapely.GeometryType.MULTIPOINT: "MultiPoint",
+    shapely.GeometryType.MULTILINESTRING: "MultiLineString",
+    shapely.GeometryType.MULTIPOLYGON: "MultiPolygon",
+    shapely.GeometryType.GEOMETRYCOLLECTION: "GeometryCollection",
+}
+
+
+def build_village_store(src_csv, out_path):
+    """Konversi CSV WKT mentah -> GeoParquet siap pakai. Mengembalikan frame hasil."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = prepare_village_frame(pd.read_csv(src_csv))
+    geoms = df.pop('geometry').to_numpy()
+
+    bounds = shapely.bounds(geoms)
+    df['xmin'], df['ymin'], df['xmax'], df['ymax'] = bounds.T
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.append_column('geometry', pa.array(shapely.to_wkb(geoms), type=pa.binary()))
+    geo_meta = {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": sorted(_GEOPARQUET_TYPES[t] for t in np.unique(shapely.get_type_id(geoms))),
+                "bbox": [float(bounds[:, 0].min()), float(bounds[:, 1].min()),
+                         float(bounds[:, 2].max()), float(bounds[:, 3].max())],
+            }
+        },
+    }
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           b"geo": json.dumps(geo_meta).encode()})
+
+    # Tulis atomik agar dashboard yang sedang berjalan tidak membaca file setengah jadi
+    tmp = f"{out_path}.{uuid.uuid4().hex}.tmp"
+    # Geometri tanpa kompresi/kamus/statistik: halaman WKB bisa langsung di-memory-map
+    other = [c for c in table.column_names if c != 'geometry']
+    pq.write_table(table, tmp,
+                   compression={**{c: 'zstd' for c in other}, 'geometry': 'none'},
+                   use_dictionary=other,
+                   write_statistics=other)
+    os.replace(tmp, out_path)
+
+    df['geometry'] = geoms
+    return compact_village_frame(df)
+
+
+def read_village_store(path):
+    """GeoParquet -> frame desa ringkas (geometry shapely, lat/lon & bbox sudah dihitung)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Kolom teks dibaca langsung sebagai kamus -> Categorical tanpa membuat string Python per baris
+    schema = pq.read_schema(path)
+    text = [f.name for f in schema
+            if f.name != 'geometry' and (pa.types.is_string(f.type) or pa.types.is_large_string(f.type))]
+    table = pq.read_table(path, memory_map=True, read_dictionary=text)
+    wkb = table.column('geometry').to_numpy(zero_copy_only=False)
+    df = table.drop(['geometry']).to_pandas()
+    df['geometry'] = shapely.from_wkb(wkb)
+    return compact_village_frame(df)